@@ -38,6 +38,18 @@ def _chat_repl() -> int:
         return 1
 
 
+def _refresh_index() -> int:
+    from .recommend.concept_index import refresh_index
+
+    try:
+        idx = refresh_index()
+        print(json.dumps({"built_on": idx.built_on, "concepts": len(idx.concepts), "industry_codes": len(idx.industries)}, ensure_ascii=True))
+        return 0
+    except Exception as e:  # noqa: BLE001
+        print(f"error: {e}")
+        return 1
+
+
 def main(argv: list[str] | None = None) -> int:
     parser = argparse.ArgumentParser(prog="gp-assistant")
     sub = parser.add_subparsers(dest="cmd", required=True)
@@ -46,6 +58,8 @@ def main(argv: list[str] | None = None) -> int:
     p_chat.add_argument("--once", metavar="TEXT", help="单次对话，输出 JSON")
     p_chat.add_argument("--session", help="会话ID（可选）")
 
+    sub.add_parser("refresh-index", help="重建本地行业/概念成分索引（建议每日盘前运行一次）")
+
     args = parser.parse_args(argv)
 
     if args.cmd == "chat":  # type: ignore[attr-defined]
@@ -53,6 +67,9 @@ def main(argv: list[str] | None = None) -> int:
             return _chat_once(args.once, getattr(args, "session", None))
         return _chat_repl()
 
+    if args.cmd == "refresh-index":  # type: ignore[attr-defined]
+        return _refresh_index()
+
     parser.print_help()
     return 1
 
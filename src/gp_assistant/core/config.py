@@ -40,12 +40,34 @@ class AppConfig:
     price_min: float = float(os.getenv("GP_PRICE_MIN", "2"))
     price_max: float = float(os.getenv("GP_PRICE_MAX", "500"))
     dynamic_pool_size: int = int(os.getenv("GP_DYNAMIC_POOL_SIZE", "200"))
+    # Candidate pre-gate: last-bar opening gap above this is vetoed before features
+    max_gap_pct: float = float(os.getenv("GP_MAX_GAP_PCT", "0.095"))
     # Mainline restriction
     restrict_to_mainline: bool = os.getenv("GP_RESTRICT_MAINLINE", "1").lower() in {"1", "true", "yes"}
     mainline_top_n: int = int(os.getenv("GP_MAINLINE_TOP_N", "2"))
     mainline_mode: str = os.getenv("GP_MAINLINE_MODE", "auto")  # industry|concept|auto
     # Diversification
     max_per_industry: int = int(os.getenv("GP_MAX_PER_INDUSTRY", "2"))
+    # Bulk daily fetch: max in-flight requests per provider
+    fetch_concurrency: int = int(os.getenv("GP_FETCH_CONCURRENCY", "8"))
+    fetch_rate_per_sec: float = float(os.getenv("GP_FETCH_RATE_PER_SEC", "8"))
+    fetch_retries: int = int(os.getenv("GP_FETCH_RETRIES", "2"))
+    # Candidate generation: worker processes for the per-symbol chip/noise stage (<=1: inline)
+    candidate_workers: int = int(os.getenv("GP_CANDIDATE_WORKERS", "0"))
+    # Recommend run profiling: ""/0 off, 1/cprofile or pyinstrument (dump under store/recommend)
+    profile: str = os.getenv("GP_PROFILE", "")
+    # Normalized daily bar cache: TTL applies to latest/current-day entries only
+    bar_cache_enabled: bool = os.getenv("GP_BAR_CACHE", "1").lower() in {"1", "true", "yes"}
+    bar_cache_ttl_sec: float = float(os.getenv("GP_BAR_CACHE_TTL_SEC", "600"))
+    bar_cache_max_mb: float = float(os.getenv("GP_BAR_CACHE_MAX_MB", "512"))
+    # Background spot snapshot refresher (opt-in); interval in session / outside session
+    snapshot_service_enabled: bool = os.getenv("GP_SNAPSHOT_SERVICE", "0").lower() in {"1", "true", "yes"}
+    snapshot_refresh_sec: float = float(os.getenv("GP_SNAPSHOT_REFRESH_SEC", "30"))
+    snapshot_idle_refresh_sec: float = float(os.getenv("GP_SNAPSHOT_IDLE_REFRESH_SEC", "1800"))
+    # Shared HTTP client: cached host pools, sockets per host, opt-in HTTP/2 (needs h2)
+    http_pool_connections: int = int(os.getenv("GP_HTTP_POOL_CONNECTIONS", "16"))
+    http_pool_maxsize: int = int(os.getenv("GP_HTTP_POOL_MAXSIZE", "16"))
+    http2: bool = os.getenv("GP_HTTP2", "0").lower() in {"1", "true", "yes"}
     # Tradeable thresholds (hard conditions for live validation)
     tradeable_min_universe: int = int(os.getenv("GP_TRADEABLE_MIN_UNIVERSE", "50"))
     tradeable_min_candidates: int = int(os.getenv("GP_TRADEABLE_MIN_CANDIDATES", "20"))
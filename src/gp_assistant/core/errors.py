@@ -31,6 +31,14 @@ class DataProviderError(Exception):
         self.symbol = symbol
 
 
+class CircuitOpenError(DataProviderError):
+    """Raised when a provider route's circuit breaker is open (fail fast)."""
+
+    def __init__(self, route: str, *, symbol: Optional[str] = None):
+        super().__init__(f"circuit_open:{route}", symbol=symbol)
+        self.route = route
+
+
 class MissingCredentialsError(GPAssistantError):
     def __init__(self, provider: str, hint: Optional[str] = None):
         msg = f"缺少凭证: {provider}"
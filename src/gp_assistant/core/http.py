@@ -0,0 +1,150 @@
+# 简介：进程级 HTTP 客户端。统一 keep-alive 连接池（按 host 分池、池大小可配），
+# 可选 HTTP/2（httpx+h2 可用且 GP_HTTP2=1 时），并统计连接复用情况，
+# 供数据源、公告、资讯与 LLM 客户端共用，避免每次调用重复 TCP/TLS 握手。
+from __future__ import annotations
+
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .config import load_config
+
+
+DEFAULT_UA = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/120 Safari/537.36"
+
+
+def _h2_available() -> bool:
+    try:
+        import httpx  # noqa: F401
+        import h2  # noqa: F401
+    except Exception:  # noqa: BLE001
+        return False
+    return True
+
+
+class HttpClient:
+    """Shared keep-alive client.
+
+    - ``session``: a pooled ``requests.Session`` (one urllib3 pool per host,
+      ``pool_connections`` hosts cached, ``pool_maxsize`` sockets per host)
+    - ``request/get/post``: go through httpx with HTTP/2 when enabled and
+      available, otherwise through ``session``
+    - ``stats()``: per-host requests vs. connections opened
+    """
+
+    def __init__(self, pool_connections: int = 16, pool_maxsize: int = 32, http2: bool = False):
+        self.pool_connections = max(1, int(pool_connections))
+        self.pool_maxsize = max(1, int(pool_maxsize))
+        self.session = requests.Session()
+        self._adapter = HTTPAdapter(pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize)
+        self.session.mount("https://", self._adapter)
+        self.session.mount("http://", self._adapter)
+        self.session.headers.update({"User-Agent": DEFAULT_UA})
+        self._h2 = None
+        if http2 and _h2_available():
+            import httpx
+
+            limits = httpx.Limits(max_connections=self.pool_connections * self.pool_maxsize, max_keepalive_connections=self.pool_maxsize)
+            self._h2 = httpx.Client(http2=True, limits=limits, headers={"User-Agent": DEFAULT_UA}, follow_redirects=True)
+        self._lock = threading.Lock()
+        # httpx does not expose pool counters; count its requests per host
+        self._h2_requests: Dict[str, int] = {}
+
+    @property
+    def http2(self) -> bool:
+        return self._h2 is not None
+
+    @property
+    def adapter(self) -> HTTPAdapter:
+        """The pooled transport behind ``session`` (thread-safe, shareable across sessions)."""
+        return self._adapter
+
+    def new_session(self) -> requests.Session:
+        """A separate session (own cookies/headers) on this client's connection pool.
+
+        ``requests.Session`` state is not thread-safe; give each thread its
+        own session while still reusing the shared keep-alive sockets.
+        """
+        sess = requests.Session()
+        sess.mount("https://", self._adapter)
+        sess.mount("http://", self._adapter)
+        sess.headers.update({"User-Agent": DEFAULT_UA})
+        return sess
+
+    def request(self, method: str, url: str, **kwargs: Any):  # noqa: ANN201
+        if self._h2 is not None:
+            host = urlsplit(url).hostname or url
+            with self._lock:
+                self._h2_requests[host] = self._h2_requests.get(host, 0) + 1
+            data = kwargs.pop("data", None)
+            if isinstance(data, (bytes, bytearray, str)):
+                kwargs["content"] = data
+            elif data is not None:
+                kwargs["data"] = data
+            return self._h2.request(method, url, **kwargs)
+        return self.session.request(method, url, **kwargs)
+
+    def get(self, url: str, **kwargs: Any):  # noqa: ANN201
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any):  # noqa: ANN201
+        return self.request("POST", url, **kwargs)
+
+    def stats(self) -> Dict[str, Any]:
+        """Connection reuse per host from the urllib3 pool counters.
+
+        ``reused = requests - connections``; a host whose pool was evicted
+        (more than ``pool_connections`` hosts in use) starts counting afresh.
+        """
+        hosts: Dict[str, Dict[str, Any]] = {}
+        pools = self._adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            try:
+                pool = pools[key]
+            except KeyError:
+                continue
+            h = hosts.setdefault(str(pool.host), {"requests": 0, "connections": 0})
+            h["requests"] += int(getattr(pool, "num_requests", 0))
+            h["connections"] += int(getattr(pool, "num_connections", 0))
+        for h in hosts.values():
+            h["reused"] = max(0, h["requests"] - h["connections"])
+        with self._lock:
+            for host, n in self._h2_requests.items():
+                hosts.setdefault(host, {"requests": 0, "connections": None, "reused": None})["requests"] += n
+        return {
+            "http2": self.http2,
+            "pool_connections": self.pool_connections,
+            "pool_maxsize": self.pool_maxsize,
+            "hosts": dict(sorted(hosts.items())),
+        }
+
+    def close(self) -> None:
+        self.session.close()
+        if self._h2 is not None:
+            self._h2.close()
+
+
+_CLIENT: Optional[HttpClient] = None
+_CLIENT_LOCK = threading.Lock()
+
+
+def get_client() -> HttpClient:
+    """Process-wide client, created lazily from config."""
+    global _CLIENT
+    with _CLIENT_LOCK:
+        if _CLIENT is None:
+            cfg = load_config()
+            maxsize = max(int(cfg.http_pool_maxsize), 2 * int(cfg.fetch_concurrency))
+            _CLIENT = HttpClient(cfg.http_pool_connections, maxsize, http2=cfg.http2)
+        return _CLIENT
+
+
+def http_stats() -> Dict[str, Any]:
+    with _CLIENT_LOCK:
+        client = _CLIENT
+    if client is None:
+        return {"http2": False, "hosts": {}}
+    return client.stats()
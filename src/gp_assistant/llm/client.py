@@ -5,9 +5,9 @@ from __future__ import annotations
 import json
 import os
 from typing import Any, Dict, List, Optional, Tuple
-import requests
 
 from ..core.config import load_config
+from ..core.http import get_client
 
 
 class LLMClient:
@@ -54,6 +54,6 @@ class LLMClient:
             "Accept": "application/json",
         }
         data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
-        resp = requests.post(url, headers=headers, data=data, timeout=self.timeout)
+        resp = get_client().post(url, headers=headers, data=data, timeout=self.timeout)
         resp.raise_for_status()
         return resp.json()
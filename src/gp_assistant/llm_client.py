@@ -7,10 +7,11 @@ import os
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional
 
-import requests
 import re
 import yaml
 
+from .core.http import get_client
+
 
 @dataclass
 class LLMConfig:
@@ -111,7 +112,7 @@ class SimpleLLMClient:
         last_exc: Optional[Exception] = None
         for i in range(self.cfg.retries + 1):
             try:
-                resp = requests.post(url, headers=headers, data=data, timeout=self.cfg.timeout_sec)
+                resp = get_client().post(url, headers=headers, data=data, timeout=self.cfg.timeout_sec)
                 resp.raise_for_status()
                 return resp.json()
             except Exception as e:
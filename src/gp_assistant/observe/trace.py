@@ -0,0 +1,145 @@
+# 简介：轻量级运行追踪。上下文管理器 span 以单调时钟记录各阶段耗时（嵌套路径如
+# candidates/fetch_bars，同名多次累计），并汇总逐标的耗时直方图与最慢标的，写入
+# debug.timing；另提供可选 cProfile/pyinstrument 剖析落盘（GP_PROFILE）。
+from __future__ import annotations
+
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+import threading
+import time
+
+import numpy as np
+
+
+# per-symbol histogram bucket upper edges (ms); the last bucket is open-ended
+_EDGES_MS = (1.0, 5.0, 10.0, 50.0, 100.0, 500.0, 1000.0)
+
+
+def _bucket_labels() -> List[str]:
+    labels = [f"<{_EDGES_MS[0]:g}ms"]
+    labels += [f"{a:g}-{b:g}ms" for a, b in zip(_EDGES_MS, _EDGES_MS[1:])]
+    labels.append(f">={_EDGES_MS[-1]:g}ms")
+    return labels
+
+
+class Tracer:
+    """Stage spans plus per-symbol durations for one run (thread-safe)."""
+
+    def __init__(self) -> None:
+        self._t0 = time.perf_counter()
+        self._spans: Dict[str, Dict[str, float]] = {}
+        self._symbols: Dict[str, Dict[str, float]] = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _stack(self) -> List[str]:
+        st = getattr(self._local, "stack", None)
+        if st is None:
+            st = self._local.stack = []
+        return st
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        stack = self._stack()
+        stack.append(name)
+        path = "/".join(stack)
+        t = time.perf_counter()
+        try:
+            yield
+        finally:
+            stack.pop()
+            self.add(path, (time.perf_counter() - t) * 1000.0)
+
+    def add(self, path: str, ms: float) -> None:
+        """Record an externally measured duration under ``path``."""
+        with self._lock:
+            s = self._spans.setdefault(path, {"ms": 0.0, "count": 0})
+            s["ms"] += ms
+            s["count"] += 1
+
+    def record_symbol(self, stage: str, symbol: str, ms: float) -> None:
+        with self._lock:
+            per = self._symbols.setdefault(stage, {})
+            per[symbol] = per.get(symbol, 0.0) + ms
+
+    def summary(self, top_n: int = 10) -> Dict[str, Any]:
+        with self._lock:
+            spans = {k: {"ms": round(v["ms"], 3), "count": int(v["count"])} for k, v in self._spans.items()}
+            symbols = {k: dict(v) for k, v in self._symbols.items()}
+        out: Dict[str, Any] = {"total_ms": round((time.perf_counter() - self._t0) * 1000.0, 3), "stages": spans}
+        per_stage: Dict[str, Any] = {}
+        for stage, per in symbols.items():
+            ms = np.fromiter(per.values(), dtype="float64", count=len(per))
+            counts = np.bincount(np.searchsorted(_EDGES_MS, ms, side="right"), minlength=len(_EDGES_MS) + 1)
+            slow = sorted(per.items(), key=lambda kv: -kv[1])[:top_n]
+            per_stage[stage] = {
+                "count": int(len(ms)),
+                "total_ms": round(float(ms.sum()), 3),
+                "p50_ms": round(float(np.percentile(ms, 50)), 3),
+                "p95_ms": round(float(np.percentile(ms, 95)), 3),
+                "max_ms": round(float(ms.max()), 3),
+                "histogram": dict(zip(_bucket_labels(), counts.tolist())),
+                "slowest": [{"symbol": s, "ms": round(v, 3)} for s, v in slow],
+            }
+        if per_stage:
+            out["symbols"] = per_stage
+        return out
+
+
+class Profile:
+    """Optional whole-run profiler: ``cprofile`` or ``pyinstrument`` (falls back to cProfile)."""
+
+    def __init__(self, mode: str) -> None:
+        self.mode = mode
+        self.active = True
+        self._prof: Any = None
+        if mode == "pyinstrument":
+            try:
+                from pyinstrument import Profiler  # type: ignore
+
+                self._prof = Profiler()
+                self._prof.start()
+                return
+            except Exception:  # noqa: BLE001
+                self.mode = "cprofile"
+        import cProfile
+
+        self._prof = cProfile.Profile()
+        self._prof.enable()
+
+    def stop(self) -> None:
+        """Stop collecting (idempotent); the profiler must never outlive its run."""
+        if not self.active:
+            return
+        self.active = False
+        if self.mode == "pyinstrument":
+            self._prof.stop()
+        else:
+            self._prof.disable()
+
+    def dump(self, base: Path) -> List[str]:
+        """Stop and write ``<base>.html`` (pyinstrument) or ``<base>.prof`` + ``<base>.txt``."""
+        self.stop()
+        base.parent.mkdir(parents=True, exist_ok=True)
+        if self.mode == "pyinstrument":
+            path = base.with_suffix(".html")
+            path.write_text(self._prof.output_html(), encoding="utf-8")
+            return [str(path)]
+        import io
+        import pstats
+
+        prof_path, txt_path = base.with_suffix(".prof"), base.with_suffix(".txt")
+        self._prof.dump_stats(str(prof_path))
+        buf = io.StringIO()
+        pstats.Stats(self._prof, stream=buf).sort_stats("cumulative").print_stats(40)
+        txt_path.write_text(buf.getvalue(), encoding="utf-8")
+        return [str(prof_path), str(txt_path)]
+
+
+def start_profile(setting: Optional[str]) -> Optional[Profile]:
+    """``GP_PROFILE``: empty/0 off, 1/cprofile, or pyinstrument."""
+    mode = (setting or "").strip().lower()
+    if mode in {"", "0", "false", "no", "off"}:
+        return None
+    return Profile("pyinstrument" if mode == "pyinstrument" else "cprofile")
@@ -8,24 +8,154 @@ degradation logs (agent is the single authority to report degradation).
 
 from __future__ import annotations
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, Optional
+import math
+import threading
 import time
-import json
+
+import numpy as np
 import pandas as pd
+from requests.adapters import BaseAdapter, HTTPAdapter
 
-from ..core.errors import DataProviderError
+from ..core.config import load_config
+from ..core.http import DEFAULT_UA, get_client
+from ..core.errors import CircuitOpenError, DataProviderError
 from .base import MarketDataProvider
-from ..core.paths import store_dir
+from .fetch_pool import FetchPool
+from .snapshot_store import SnapshotTable, SnapshotVersion, get_snapshot_table
+
+
+_CB_LOCK = threading.Lock()
+
+# EM clist field -> snapshot column; the first five keep the historical layout
+_EM_SPOT_FIELDS = [
+    ("f12", "代码", "str"), ("f14", "名称", "str"), ("f2", "最新价", "num"), ("f3", "涨跌幅", "num"),
+    ("f6", "成交额", "num"), ("f4", "涨跌额", "num"), ("f5", "成交量", "num"), ("f7", "振幅", "num"),
+    ("f8", "换手率", "num"), ("f9", "市盈率-动态", "num"), ("f10", "量比", "num"), ("f11", "5分钟涨跌", "num"),
+    ("f13", "市场", "num"), ("f15", "最高", "num"), ("f16", "最低", "num"), ("f17", "今开", "num"),
+    ("f18", "昨收", "num"), ("f20", "总市值", "num"), ("f21", "流通市值", "num"), ("f22", "涨速", "num"),
+    ("f23", "市净率", "num"), ("f24", "60日涨跌幅", "num"), ("f25", "年初至今涨跌幅", "num"),
+    ("f62", "主力净流入", "num"), ("f115", "市盈率-TTM", "num"),
+]
+
+
+def _decode_em_rows(rows: list) -> pd.DataFrame:
+    """Decode EM ``diff`` rows field by field into typed columns."""
+    cols: Dict[str, Any] = {}
+    for field, name, kind in _EM_SPOT_FIELDS:
+        vals = [r.get(field) for r in rows]
+        if kind == "str":
+            cols[name] = np.array(["" if v is None else str(v) for v in vals], dtype=object)
+        else:
+            # "-" marks suspended/absent quotes
+            cols[name] = np.array([v if isinstance(v, (int, float)) else np.nan for v in vals], dtype="float64")
+    return pd.DataFrame(cols)
+
+_REQ_LOCAL = threading.local()
+_REQ_HOOK_LOCK = threading.Lock()
+_REQ_ORIGINAL = None
+
+
+def _pooled_adapter():  # noqa: ANN202
+    """Keep-alive transport shared with the rest of the process."""
+    return get_client().adapter
+
+
+def _pooled_session():  # noqa: ANN202
+    """Per-thread session on the pooled transport (sessions are not thread-safe)."""
+    sess = getattr(_REQ_LOCAL, "session", None)
+    if sess is None:
+        sess = _REQ_LOCAL.session = get_client().new_session()
+    return sess
+
+
+class _SharedAdapter(BaseAdapter):
+    """Delegates to the pooled adapter; ``close`` is a no-op so a throwaway
+    session closing itself does not tear down the process-wide pool."""
+
+    def __init__(self, inner: BaseAdapter) -> None:
+        super().__init__()
+        self.inner = inner
+
+    def send(self, request, **kwargs):  # noqa: ANN001, ANN201
+        return self.inner.send(request, **kwargs)
+
+    def close(self) -> None:
+        pass
+
+
+def _default_transport(session) -> bool:  # noqa: ANN001
+    """True for sessions nobody configured: stock adapters, no proxies/auth/verify/cert overrides."""
+    adapters = getattr(session, "adapters", {})
+    return (
+        set(adapters) == {"https://", "http://"}
+        and all(type(a) is HTTPAdapter for a in adapters.values())
+        and not session.proxies
+        and session.auth is None
+        and session.verify is True
+        and session.cert is None
+    )
+
+
+def _install_request_hook() -> None:
+    """Install (once) a Session.request hook driven by a thread-local context.
+
+    Outside ``_with_requests_timeout`` the hook is a pass-through. Inside it,
+    the call gets the provider timeout and polite headers. Sessions left at
+    their default configuration (e.g. the throwaway ones behind
+    ``requests.get`` inside akshare) get the pooled keep-alive adapter
+    mounted; each request still runs on the caller's own session, so
+    sessions with their own proxies, auth, TLS settings or adapters keep
+    their transport untouched.
+    """
+    global _REQ_ORIGINAL
+    with _REQ_HOOK_LOCK:
+        if _REQ_ORIGINAL is not None:
+            return
+        import requests  # type: ignore
+
+        original = requests.sessions.Session.request
+
+        def hooked(session, method, url, **kwargs):  # noqa: ANN001
+            ctx = getattr(_REQ_LOCAL, "ctx", None)
+            if ctx is None:
+                return original(session, method, url, **kwargs)
+            timeout = ctx.get("timeout")
+            to = kwargs.get("timeout", None)
+            if to is None or (isinstance(to, (int, float)) and to < timeout):
+                kwargs["timeout"] = timeout
+            try:
+                pooled = ctx.get("adapter")
+                if pooled is not None and _default_transport(session):
+                    shared = _SharedAdapter(pooled)
+                    session.mount("https://", shared)
+                    session.mount("http://", shared)
+                hdrs = dict(kwargs.get("headers") or {})
+                hdrs.setdefault("User-Agent", DEFAULT_UA)
+                if isinstance(url, str):
+                    if "eastmoney.com" in url:
+                        hdrs.setdefault("Referer", "https://quote.eastmoney.com/")
+                    elif "sina.com" in url or "sinajs.cn" in url:
+                        hdrs.setdefault("Referer", "https://finance.sina.com.cn/")
+                kwargs["headers"] = hdrs
+            except Exception:
+                pass
+            return original(session, method, url, **kwargs)
+
+        requests.sessions.Session.request = hooked  # type: ignore
+        _REQ_ORIGINAL = original
 
 
 class AkShareProvider(MarketDataProvider):
     name = "akshare"
+    _HIST_ROUTE = "akshare:hist"
+    # Circuit breaker: open after N consecutive failures, probe again after cooldown
+    _CB_THRESHOLD = 3
+    _CB_COOLDOWN_SEC = 60.0
 
     def __init__(self, timeout_sec: int = 60):
         self.timeout_sec = timeout_sec
         self._last_snapshot_meta: Dict[str, Any] = {}
-        self._snapshot_cache_df: Optional[pd.DataFrame] = None
-        self._snapshot_cache_ts: Optional[float] = None
         if not hasattr(AkShareProvider, "_circuit"):
             AkShareProvider._circuit = {}
 
@@ -38,15 +168,13 @@ class AkShareProvider(MarketDataProvider):
         return ak
 
     # ---- Daily bars ---------------------------------------------------------
-    def get_daily(self, symbol: str, start: str | None, end: str | None) -> pd.DataFrame:  # noqa: D401
-        """Fetch daily kline using AkShare stock_zh_a_hist (no logic changes)."""
-        ak = self._import()
+    def _fetch_hist(self, ak, symbol: str, start: str | None, end: str | None) -> pd.DataFrame:  # noqa: ANN001
         s = start.replace("-", "") if start else None
         e = end.replace("-", "") if end else None
-        try:
-            df = ak.stock_zh_a_hist(symbol=symbol, start_date=s, end_date=e, period="daily", adjust="")
-        except Exception as ex:  # noqa: BLE001
-            raise DataProviderError("AkShare get_daily failed", symbol=symbol) from ex
+        return self._with_requests_timeout(lambda: ak.stock_zh_a_hist(symbol=symbol, start_date=s, end_date=e, period="daily", adjust=""))
+
+    @staticmethod
+    def _normalize_hist(df: Optional[pd.DataFrame], symbol: str) -> pd.DataFrame:
         if df is None or len(df) == 0:
             raise DataProviderError("AkShare daily empty", symbol=symbol)
         # Light normalization (do not alter downstream expectations)
@@ -63,6 +191,51 @@ class AkShareProvider(MarketDataProvider):
             raise DataProviderError(f"AkShare daily missing columns: {missing}", symbol=symbol)
         return df
 
+    def get_daily(self, symbol: str, start: str | None, end: str | None) -> pd.DataFrame:  # noqa: D401
+        """Fetch daily kline using AkShare stock_zh_a_hist (no logic changes)."""
+        ak = self._import()
+        if self._cb_should_skip(self._HIST_ROUTE):
+            raise CircuitOpenError(self._HIST_ROUTE, symbol=symbol)
+        try:
+            df = self._fetch_hist(ak, symbol, start, end)
+        except Exception as ex:  # noqa: BLE001
+            self._cb_report_failure(self._HIST_ROUTE, ex)
+            raise DataProviderError("AkShare get_daily failed", symbol=symbol) from ex
+        self._cb_report_success(self._HIST_ROUTE)
+        return self._normalize_hist(df, symbol)
+
+    def get_daily_many(self, symbols: Iterable[str], start: str | None, end: str | None) -> Dict[str, pd.DataFrame]:
+        """Concurrent, rate-limited get_daily; failed symbols are left out.
+
+        Upstream (transport/throttle) errors feed the ``akshare:hist`` circuit
+        breaker; empty or malformed frames are per-symbol and do not.
+        """
+        ak = self._import()
+        cfg = load_config()
+        pool = FetchPool(
+            max_workers=cfg.fetch_concurrency,
+            rate_per_sec=cfg.fetch_rate_per_sec,
+            retries=cfg.fetch_retries,
+            retry=self._call_with_retry,
+            should_skip=self._cb_should_skip,
+            on_success=self._cb_report_success,
+            on_failure=self._cb_report_failure,
+        )
+        res = pool.run(symbols, lambda sym: self._fetch_hist(ak, sym, start, end), route=self._HIST_ROUTE, host="push2his.eastmoney.com")
+        out: Dict[str, pd.DataFrame] = {}
+        errors = dict(res.errors)
+        for sym, df in res.results.items():
+            try:
+                out[sym] = self._normalize_hist(df, sym)
+            except DataProviderError as e:
+                errors[sym] = str(e)
+        self._last_fetch_stats = {"latency": res.latency, "errors": errors, "ok": len(out)}
+        return out
+
+    def last_fetch_stats(self) -> Dict[str, Any]:
+        """Per-route latency and per-symbol errors of the last get_daily_many."""
+        return dict(getattr(self, "_last_fetch_stats", {}) or {})
+
     def healthcheck(self) -> Dict[str, Any]:
         try:
             self._import()
@@ -81,27 +254,54 @@ class AkShareProvider(MarketDataProvider):
             raise DataProviderError(f"AkShare basic failed: {e}")
 
     # ---- Spot snapshot (single-call policy) --------------------------------
-    def get_spot_snapshot(self):  # noqa: ANN001
+    def get_spot_snapshot(self, *, max_cache_age_sec: float = 120.0):  # noqa: ANN001
         ak = self._import()
+        table = get_snapshot_table()
+        # Memory TTL cache (<=120s by default), shared by all provider instances
+        cur = table.current()
+        if cur is not None and cur.age_sec() <= max_cache_age_sec:
+            self._last_snapshot_meta = {
+                "source": "memory_cache",
+                "cache": "memory",
+                "fallback": False,
+                "stale": cur.source == "disk_cache",
+                "missing": False,
+                "elapsed_sec": 0.0,
+                "skipped_routes": [],
+                "snapshot_version": cur.version,
+            }
+            return self._publish(cur)
+        # Live routes; concurrent callers coalesce onto one in-flight fetch
+        (df, meta), coalesced = table.refresh(lambda: self._fetch_spot_live(ak))
+        if df is not None:
+            self._last_snapshot_meta = {**meta, "coalesced": coalesced}
+            return df
+        # Disk cache (<=24h)
+        err = meta.get("error")
+        disk = self._load_snapshot_disk(max_age_sec=24 * 3600)
+        if disk is not None:
+            age = float(disk[1])
+            # keep the disk copy's fetch time so the memory TTL does not make it look live
+            snap = table.apply(disk[0], source="disk_cache", ts=time.time() - age)
+            self._last_snapshot_meta = {
+                "source": "disk_cache",
+                "cache": "disk",
+                "fallback": True,
+                "fallback_reason": f"live_failed: {err}",
+                "stale": True,
+                "missing": False,
+                "cache_age_sec": age,
+                "skipped_routes": meta.get("skipped_routes", []),
+                "snapshot_version": snap.version,
+            }
+            return self._publish(snap)
+        raise DataProviderError(f"AkShare snapshot failed: {err}")
+
+    def _fetch_spot_live(self, ak):  # noqa: ANN001, ANN202
+        """Try EM direct -> AkShare EM -> Sina once; returns (df | None, meta)."""
         t0 = time.time()
         em_err: Exception | None = None
         skipped: list[str] = []
-        # Memory TTL cache (<=120s)
-        try:
-            if self._snapshot_cache_df is not None and self._snapshot_cache_ts is not None:
-                if (time.time() - self._snapshot_cache_ts) <= 120:
-                    self._last_snapshot_meta = {
-                        "source": "memory_cache",
-                        "cache": "memory",
-                        "fallback": False,
-                        "stale": False,
-                        "missing": False,
-                        "elapsed_sec": 0.0,
-                        "skipped_routes": [],
-                    }
-                    return self._snapshot_cache_df
-        except Exception:
-            pass
         # Direct EM route (large page size, polite headers)
         try:
             if self._cb_should_skip("em:direct"):
@@ -109,18 +309,8 @@ class AkShareProvider(MarketDataProvider):
                 raise RuntimeError("circuit_open_em_direct")
             df_direct = self._em_spot_direct()
             if df_direct is not None and len(df_direct) > 0:
-                self._last_snapshot_meta = {
-                    "source": "em:direct",
-                    "fallback": False,
-                    "stale": False,
-                    "missing": False,
-                    "elapsed_sec": round(time.time() - t0, 2),
-                    "skipped_routes": skipped,
-                }
-                self._update_snapshot_cache(df_direct)
-                self._save_snapshot_disk(df_direct)
                 self._cb_report_success("em:direct")
-                return df_direct
+                return self._live_result(df_direct, "em:direct", t0, skipped)
         except Exception as e:  # noqa: BLE001
             em_err = e
             if "circuit_open" not in str(e):
@@ -133,18 +323,8 @@ class AkShareProvider(MarketDataProvider):
             df = self._call_with_retry(lambda: self._with_requests_timeout(lambda: ak.stock_zh_a_spot_em()), retries=1)
             if df is None or len(df) == 0:
                 raise DataProviderError("AkShare EM snapshot empty")
-            self._last_snapshot_meta = {
-                "source": "akshare:em",
-                "fallback": False,
-                "stale": False,
-                "missing": False,
-                "elapsed_sec": round(time.time() - t0, 2),
-                "skipped_routes": skipped,
-            }
-            self._update_snapshot_cache(df)
-            self._save_snapshot_disk(df)
             self._cb_report_success("akshare:em")
-            return df
+            return self._live_result(df, "akshare:em", t0, skipped)
         except Exception as e:  # noqa: BLE001
             em_err = e
             if "circuit_open" not in str(e):
@@ -157,38 +337,46 @@ class AkShareProvider(MarketDataProvider):
             df = self._call_with_retry(lambda: self._with_requests_timeout(lambda: ak.stock_zh_a_spot()))
             if df is None or len(df) == 0:
                 raise DataProviderError("AkShare Sina snapshot empty")
-            self._last_snapshot_meta = {
-                "source": "akshare:sina",
-                "fallback": True,
-                "fallback_reason": f"em_failed: {em_err}",
-                "stale": False,
-                "missing": False,
-                "elapsed_sec": round(time.time() - t0, 2),
-                "skipped_routes": skipped,
-            }
-            self._update_snapshot_cache(df)
-            self._save_snapshot_disk(df)
             self._cb_report_success("akshare:sina")
-            return df
+            extra = {"fallback": True, "fallback_reason": f"em_failed: {em_err}"}
+            return self._live_result(df, "akshare:sina", t0, skipped, extra)
         except Exception as e2:  # noqa: BLE001
-            # Disk cache (<=24h)
-            disk = self._load_snapshot_disk(max_age_sec=24 * 3600)
-            if disk is not None:
-                age = float(disk[1])
-                df_disk = disk[0]
-                self._last_snapshot_meta = {
-                    "source": "disk_cache",
-                    "cache": "disk",
-                    "fallback": True,
-                    "fallback_reason": f"live_failed: {em_err or e2}",
-                    "stale": True,
-                    "missing": False,
-                    "cache_age_sec": age,
-                    "skipped_routes": skipped,
-                }
-                self._update_snapshot_cache(df_disk)
-                return df_disk
-            raise DataProviderError(f"AkShare snapshot failed: {em_err or e2}")
+            return None, {"error": str(em_err or e2), "skipped_routes": skipped}
+
+    def _live_result(self, df: pd.DataFrame, source: str, t0: float, skipped: list, extra: Optional[Dict[str, Any]] = None):  # noqa: ANN202
+        snap = self._update_snapshot_cache(df, source)
+        self._save_snapshot_disk()
+        meta = {
+            "source": source,
+            "fallback": False,
+            "stale": False,
+            "missing": False,
+            "elapsed_sec": round(time.time() - t0, 2),
+            "skipped_routes": skipped,
+            "snapshot_version": snap.version,
+            "delta": {"changed": snap.changed, "added": snap.added, "removed": snap.removed, "rows": len(snap.df)},
+        }
+        meta.update(extra or {})
+        return self._publish(snap), meta
+
+    @staticmethod
+    def _publish(snap: SnapshotVersion) -> pd.DataFrame:
+        # shallow copy (copy-on-write): callers never touch the shared version
+        out = snap.df.copy(deep=False)
+        out.attrs["snapshot_version"] = snap.version
+        return out
+
+    def _update_snapshot_cache(self, df: pd.DataFrame, source: Optional[str] = None) -> SnapshotVersion:
+        return get_snapshot_table().apply(df, source=source)
+
+    def _save_snapshot_disk(self) -> None:
+        try:
+            get_snapshot_table().save_disk()
+        except Exception:  # noqa: BLE001
+            pass
+
+    def _load_snapshot_disk(self, max_age_sec: float):  # noqa: ANN202
+        return SnapshotTable.load_disk(max_age_sec)
 
     def last_snapshot_meta(self) -> Dict[str, Any]:
         # Always include keys useful for structured decisions
@@ -208,33 +396,21 @@ class AkShareProvider(MarketDataProvider):
             base["skipped_routes"] = []
         return base
 
-    # ---- Internals: request patch + retry ----------------------------------
+    # ---- Internals: request injection + retry --------------------------------
     def _with_requests_timeout(self, fn):  # noqa: ANN001
-        import requests  # type: ignore
-        original = requests.sessions.Session.request
-
-        def wrapped(session, method, url, **kwargs):  # noqa: ANN001
-            to = kwargs.get("timeout", None)
-            if to is None or (isinstance(to, (int, float)) and to < self.timeout_sec):
-                kwargs["timeout"] = self.timeout_sec
-            try:
-                hdrs = dict(kwargs.get("headers") or {})
-                hdrs.setdefault("User-Agent", "Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/120 Safari/537.36")
-                if isinstance(url, str):
-                    if "eastmoney.com" in url:
-                        hdrs.setdefault("Referer", "https://quote.eastmoney.com/")
-                    elif "sina.com" in url or "sinajs.cn" in url:
-                        hdrs.setdefault("Referer", "https://finance.sina.com.cn/")
-                kwargs["headers"] = hdrs
-            except Exception:
-                pass
-            return original(session, method, url, **kwargs)
+        """Run fn with this provider's timeout/headers and the pooled transport.
 
+        Settings are carried in a thread-local context read by a request hook
+        installed once per process, so concurrent callers never swap
+        ``Session.request`` under each other.
+        """
+        _install_request_hook()
+        prev = getattr(_REQ_LOCAL, "ctx", None)
+        _REQ_LOCAL.ctx = {"timeout": self.timeout_sec, "adapter": _pooled_adapter()}
         try:
-            requests.sessions.Session.request = wrapped  # type: ignore
             return fn()
         finally:
-            requests.sessions.Session.request = original  # type: ignore
+            _REQ_LOCAL.ctx = prev
 
     def _call_with_retry(self, fn, retries: int = 3):  # noqa: ANN001
         import random
@@ -242,52 +418,74 @@ class AkShareProvider(MarketDataProvider):
             try:
                 return fn()
             except Exception as e:  # noqa: BLE001
-                if i == retries - 1:
+                # an open circuit means "stop now", not "try again later"
+                if i == retries - 1 or isinstance(e, CircuitOpenError):
                     raise e
                 time.sleep((2 ** i) + random.random() * 0.5)
 
+    # ---- Internals: circuit breaker ------------------------------------------
+    def _cb_should_skip(self, route: str) -> bool:
+        with _CB_LOCK:
+            st = AkShareProvider._circuit.get(route)
+            if not st or st.get("opened_at") is None:
+                return False
+            if time.time() - float(st["opened_at"]) >= self._CB_COOLDOWN_SEC:
+                # half-open: let the next call probe; one more failure re-opens
+                st["opened_at"] = None
+                st["failures"] = self._CB_THRESHOLD - 1
+                return False
+            return True
+
+    def _cb_report_failure(self, route: str, err: Exception) -> None:
+        with _CB_LOCK:
+            st = AkShareProvider._circuit.setdefault(route, {"failures": 0, "opened_at": None})
+            st["failures"] = int(st.get("failures", 0)) + 1
+            st["last_error"] = str(err)[:200]
+            if st["failures"] >= self._CB_THRESHOLD and st.get("opened_at") is None:
+                st["opened_at"] = time.time()
+
+    def _cb_report_success(self, route: str) -> None:
+        with _CB_LOCK:
+            AkShareProvider._circuit[route] = {"failures": 0, "opened_at": None}
+
     # ---- Direct EM snapshot -------------------------------------------------
     def _em_spot_direct(self):  # noqa: ANN001
-        import requests
-
+        """Direct EM clist route: first page sizes the fetch, the rest go in parallel."""
         url = "https://push2.eastmoney.com/api/qt/clist/get"
         headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/120 Safari/537.36",
             "Referer": "https://quote.eastmoney.com/",
             "Accept": "application/json",
             "Accept-Language": "zh-CN,zh;q=0.9",
         }
-        page = 1
         page_size = 5000
-        out = []
-        total = None
-        for _ in range(5):
+        fields = ",".join(f for f, _c, _k in _EM_SPOT_FIELDS)
+
+        def fetch_page(pn: int) -> list:
             params = {
-                "pn": str(page), "pz": str(page_size), "po": "1", "np": "1",
+                "pn": str(pn), "pz": str(page_size), "po": "1", "np": "1",
                 "ut": "bd1d9ddb04089700cf9c27f6f7426281", "fltt": "2", "invt": "2",
                 "fid": "f12",
                 "fs": "m:0 t:6,m:0 t:80,m:1 t:2,m:1 t:23,m:0 t:81 s:2048",
-                "fields": "f1,f2,f3,f4,f5,f6,f7,f8,f9,f10,f12,f13,f14,f15,f16,f17,f18,f20,f21,f23,f24,f25,f22,f11,f62,f128,f136,f115,f152",
+                "fields": fields,
             }
-            def _do():
-                s = requests.Session()
-                return s.get(url, params=params, headers=headers, timeout=self.timeout_sec)
-            resp = self._with_requests_timeout(_do)
-            data = resp.json()
-            diff = data.get("data", {}).get("diff", [])
-            if not diff:
-                break
-            out.extend(diff)
-            total = data.get("data", {}).get("total", None)
-            if total is None or len(out) >= int(total):
-                break
-            page += 1
-        if not out:
-            return None
-        df = pd.DataFrame(out)
-        rename = {"f12": "代码", "f14": "名称", "f2": "最新价", "f3": "涨跌幅", "f6": "成交额"}
-        df = df.rename(columns=rename)
-        keep = [c for c in ["代码", "名称", "最新价", "涨跌幅", "成交额"] if c in df.columns]
-        df = df[keep]
-        return df
+            # per-thread session on the shared keep-alive pool
+            resp = _pooled_session().get(url, params=params, headers=headers, timeout=self.timeout_sec)
+            data = resp.json().get("data") or {}
+            return [data.get("total")] + list(data.get("diff") or [])
 
+        first = fetch_page(1)
+        total, rows = first[0], first[1:]
+        if not rows:
+            return None
+        # the server may cap pz below what was asked; size pages by what came back
+        pages = int(math.ceil(int(total or 0) / len(rows))) if total else 1
+        chunks = [rows]
+        if pages > 1:
+            cfg = load_config()
+            pool = FetchPool(max_workers=cfg.fetch_concurrency, rate_per_sec=max(cfg.fetch_rate_per_sec, 1.0), retries=cfg.fetch_retries, retry=self._call_with_retry)
+            keys = [str(pn) for pn in range(2, pages + 1)]
+            res = pool.run(keys, lambda k: fetch_page(int(k))[1:], route="em:direct:page", host="push2.eastmoney.com")
+            if res.errors:
+                raise DataProviderError(f"EM spot pages failed: {sorted(res.errors, key=int)[:5]}")
+            chunks.extend(res.results[k] for k in keys)
+        return _decode_em_rows([r for chunk in chunks for r in chunk])
@@ -0,0 +1,190 @@
+# 简介：本地日线列式存储。按 ts_code/year 分区写 Parquet（行组约一个月，带日期 min/max
+# 统计），支持只追加新交易日；读取时下推 start/end 谓词并仅加载所需列。
+from __future__ import annotations
+
+from datetime import date
+from pathlib import Path
+from typing import Iterable, List, Optional
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from ..core.paths import data_dir
+from ..core.errors import DataProviderError
+
+
+def infer_ts_code(symbol: str) -> str:
+    s = symbol.strip().upper()
+    if "." in s:
+        return s
+    # Heuristic: 6xxxxx -> SH, others -> SZ
+    if s.startswith("6"):
+        return f"{s}.SH"
+    return f"{s}.SZ"
+
+
+def _to_date(x: str | date | pd.Timestamp | None) -> Optional[date]:
+    if x is None or x == "":
+        return None
+    return pd.Timestamp(x).date()
+
+
+class BarStore:
+    """Partitioned daily bar store.
+
+    Layout: ``<root>/ts_code=<TS_CODE>/year=<YYYY>/part-0.parquet``. Each year
+    file is sorted by ``date`` and written with small row groups so parquet
+    min/max statistics let range reads skip most of the file.
+    """
+
+    def __init__(self, root: Path | None = None, row_group_size: int = 21):
+        self.root = root or (data_dir() / "bars" / "daily_store")
+        self.row_group_size = int(row_group_size)
+
+    # ---- Layout -------------------------------------------------------------
+    def _symbol_dir(self, symbol: str) -> Path:
+        return self.root / f"ts_code={infer_ts_code(symbol)}"
+
+    def _year_file(self, symbol: str, year: int) -> Path:
+        return self._symbol_dir(symbol) / f"year={int(year)}" / "part-0.parquet"
+
+    def _year_files(self, symbol: str) -> List[Path]:
+        d = self._symbol_dir(symbol)
+        if not d.exists():
+            return []
+        return sorted(d.glob("year=*/part-0.parquet"), key=lambda p: int(p.parent.name.split("=", 1)[1]))
+
+    def has(self, symbol: str) -> bool:
+        return bool(self._year_files(symbol))
+
+    def symbols(self) -> List[str]:
+        if not self.root.exists():
+            return []
+        return sorted(p.name.split("=", 1)[1] for p in self.root.glob("ts_code=*") if p.is_dir())
+
+    def last_date(self, symbol: str) -> Optional[pd.Timestamp]:
+        """Latest stored date, read from row-group statistics only."""
+        files = self._year_files(symbol)
+        if not files:
+            return None
+        md = pq.ParquetFile(files[-1]).metadata
+        col = md.schema.names.index("date")
+        best: Optional[date] = None
+        for i in range(md.num_row_groups):
+            st = md.row_group(i).column(col).statistics
+            if st is not None and st.has_min_max:
+                best = st.max if best is None else max(best, st.max)
+        return pd.Timestamp(best) if best is not None else None
+
+    # ---- Read ---------------------------------------------------------------
+    @staticmethod
+    def _predicate(start: Optional[date], end: Optional[date]):  # noqa: ANN205
+        expr = None
+        if start is not None:
+            expr = (ds.field("date") >= start) & (ds.field("year") >= start.year)
+        if end is not None:
+            cond = (ds.field("date") <= end) & (ds.field("year") <= end.year)
+            expr = cond if expr is None else (expr & cond)
+        return expr
+
+    @staticmethod
+    def _columns(columns: Optional[Iterable[str]], available: List[str]) -> List[str]:
+        if columns is None:
+            return [c for c in available if c not in ("year", "ts_code")]
+        want = ["date"] + [c for c in columns if c != "date"]
+        return [c for c in dict.fromkeys(want) if c in available]
+
+    def read(self, symbol: str, start: str | None = None, end: str | None = None, columns: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        d = self._symbol_dir(symbol)
+        if not self.has(symbol):
+            raise DataProviderError(f"本地列式存储不存在: {d}", symbol=symbol)
+        try:
+            dataset = ds.dataset(str(d), format="parquet", partitioning="hive")
+            cols = self._columns(columns, dataset.schema.names)
+            table = dataset.to_table(columns=cols, filter=self._predicate(_to_date(start), _to_date(end)))
+        except Exception as ex:  # noqa: BLE001
+            raise DataProviderError(f"读取本地列式存储失败: {d}", symbol=symbol) from ex
+        df = table.to_pandas()
+        df["date"] = pd.to_datetime(df["date"])
+        df = df.sort_values("date").reset_index(drop=True)
+        df.attrs["symbol"] = infer_ts_code(symbol)
+        return df
+
+    def read_many(self, symbols: Iterable[str], start: str | None = None, end: str | None = None, columns: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """Single dataset scan over many symbols; long format with a ts_code column.
+
+        Partition pruning on ts_code/year plus row-group statistics on date mean
+        only the requested symbols' relevant row groups are read.
+        """
+        codes = sorted({infer_ts_code(s) for s in symbols})
+        if not codes or not self.root.exists():
+            return pd.DataFrame(columns=["ts_code", "date"])
+        try:
+            dataset = ds.dataset(str(self.root), format="parquet", partitioning="hive")
+            cols = ["ts_code"] + self._columns(columns, dataset.schema.names)
+            expr = ds.field("ts_code").isin(codes)
+            rng = self._predicate(_to_date(start), _to_date(end))
+            if rng is not None:
+                expr = expr & rng
+            table = dataset.to_table(columns=cols, filter=expr)
+        except Exception as ex:  # noqa: BLE001
+            raise DataProviderError(f"批量读取本地列式存储失败: {self.root}") from ex
+        df = table.to_pandas()
+        df["ts_code"] = df["ts_code"].astype(str)
+        df["date"] = pd.to_datetime(df["date"])
+        return df.sort_values(["ts_code", "date"]).reset_index(drop=True)
+
+    # ---- Write --------------------------------------------------------------
+    @staticmethod
+    def _prepare(df: pd.DataFrame) -> pd.DataFrame:
+        x = df.copy()
+        if "date" not in x.columns and "trade_date" in x.columns:
+            x["date"] = x["trade_date"]
+        if "date" not in x.columns:
+            raise DataProviderError("写入本地列式存储缺少日期列")
+        x["date"] = pd.to_datetime(x["date"].astype(str), errors="coerce")
+        x = x.dropna(subset=["date"])
+        # ts_code/symbol live in the partition path
+        x = x.drop(columns=[c for c in ("ts_code", "symbol", "trade_date") if c in x.columns])
+        return x.drop_duplicates(subset=["date"], keep="last").sort_values("date").reset_index(drop=True)
+
+    def _write_year(self, symbol: str, year: int, part: pd.DataFrame) -> None:
+        fp = self._year_file(symbol, year)
+        fp.parent.mkdir(parents=True, exist_ok=True)
+        out = part.copy()
+        out["date"] = out["date"].dt.date
+        table = pa.Table.from_pandas(out, preserve_index=False)
+        # dot-prefixed temp file is ignored by dataset discovery during the swap
+        tmp = fp.parent / f".{fp.name}.tmp"
+        pq.write_table(table, tmp, row_group_size=self.row_group_size, write_statistics=True)
+        os.replace(tmp, fp)
+
+    def append(self, symbol: str, df: pd.DataFrame) -> int:
+        """Append bars newer than the last stored date; returns rows written.
+
+        Only the year partitions touched by the new rows are rewritten, so a
+        daily post-close update costs one small file per symbol.
+        """
+        new = self._prepare(df)
+        last = self.last_date(symbol)
+        if last is not None:
+            new = new[new["date"] > last]
+        if new.empty:
+            return 0
+        for year, part in new.groupby(new["date"].dt.year):
+            fp = self._year_file(symbol, int(year))
+            if fp.exists():
+                old = pq.read_table(fp).to_pandas()
+                old["date"] = pd.to_datetime(old["date"])
+                part = pd.concat([old, part], ignore_index=True)
+                part = part.drop_duplicates(subset=["date"], keep="last").sort_values("date")
+            self._write_year(symbol, int(year), part.reset_index(drop=True))
+        return int(len(new))
+
+    def import_file(self, fp: Path) -> int:
+        """Import a legacy ``ts_code=XXXXXX.SZ.parquet`` file into the store."""
+        ts_code = fp.stem.split("=", 1)[1] if "=" in fp.stem else fp.stem
+        return self.append(ts_code, pd.read_parquet(fp))
@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, Iterable
 import pandas as pd
 from ..core.errors import DataProviderError
 
@@ -17,6 +17,21 @@ class MarketDataProvider(ABC):
         Columns should include at least: date, open, high, low, close, volume.
         """
 
+    def get_daily_many(self, symbols: Iterable[str], start: str | None, end: str | None) -> Dict[str, pd.DataFrame]:
+        """Return {symbol: daily bars} for many symbols in one call.
+
+        Default is a sequential loop over get_daily so every provider works;
+        symbols that fail are left out of the result (callers treat a missing
+        key as "no bars"). Providers override this with a bulk path.
+        """
+        out: Dict[str, pd.DataFrame] = {}
+        for sym in dict.fromkeys(symbols):
+            try:
+                out[sym] = self.get_daily(sym, start, end)
+            except Exception:  # noqa: BLE001
+                continue
+        return out
+
     def get_intraday(self, symbol: str, date: str) -> pd.DataFrame:
         raise DataProviderError("intraday not supported", symbol=symbol)
 
@@ -34,8 +49,8 @@ class MarketDataProvider(ABC):
         return _pd.DataFrame(columns=["ts_code", "name"])  # type: ignore[name-defined]
 
     # Optional: real-time/spot snapshot for the whole market
-    def get_spot_snapshot(self):  # noqa: ANN001
-        import pandas as _pd
+    def get_spot_snapshot(self, *, max_cache_age_sec: float = 120.0):  # noqa: ANN001
+        """max_cache_age_sec: accept an in-process copy up to this age (0 forces a fetch)."""
         raise DataProviderError("spot snapshot not supported")
 
     @abstractmethod
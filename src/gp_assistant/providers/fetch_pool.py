@@ -0,0 +1,166 @@
+# 简介：并发限速抓取池。线程池 + 按 host 令牌桶限速 + 抖动重试 + 单标的失败隔离，
+# 与 provider 熔断器协作（熔断打开后剩余任务快速失败而非阻塞），并统计各路由时延。
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional
+import threading
+import time
+
+from ..core.errors import CircuitOpenError
+
+
+class TokenBucket:
+    """Thread-safe token bucket: ``rate`` tokens/sec, up to ``burst`` stored."""
+
+    def __init__(self, rate: float, burst: int | None = None):
+        self.rate = max(1e-6, float(rate))
+        self.burst = max(1, int(burst if burst is not None else round(self.rate)))
+        self._tokens = float(self.burst)
+        self._stamp = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Block until a token is available; returns seconds waited."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._stamp) * self.rate)
+                self._stamp = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return waited
+                need = (1.0 - self._tokens) / self.rate
+            time.sleep(need)
+            waited += need
+
+
+_BUCKETS: Dict[str, TokenBucket] = {}
+_BUCKETS_LOCK = threading.Lock()
+
+
+def bucket_for(host: str, rate: float, burst: int | None = None) -> TokenBucket:
+    """Process-wide bucket per host so parallel pools share one budget."""
+    with _BUCKETS_LOCK:
+        b = _BUCKETS.get(host)
+        if b is None or b.rate != max(1e-6, float(rate)):
+            b = TokenBucket(rate, burst)
+            _BUCKETS[host] = b
+        return b
+
+
+@dataclass
+class RouteLatency:
+    count: int = 0
+    ok: int = 0
+    failed: int = 0
+    skipped: int = 0
+    samples_ms: List[float] = field(default_factory=list)
+
+    def add(self, ms: float, ok: bool) -> None:
+        self.count += 1
+        if ok:
+            self.ok += 1
+        else:
+            self.failed += 1
+        self.samples_ms.append(ms)
+
+    def summary(self) -> Dict[str, Any]:
+        xs = sorted(self.samples_ms)
+
+        def pct(p: float) -> Optional[float]:
+            if not xs:
+                return None
+            return round(xs[min(len(xs) - 1, int(p * (len(xs) - 1) + 0.5))], 1)
+
+        return {
+            "count": self.count,
+            "ok": self.ok,
+            "failed": self.failed,
+            "skipped": self.skipped,
+            "p50_ms": pct(0.5),
+            "p95_ms": pct(0.95),
+            "max_ms": round(xs[-1], 1) if xs else None,
+        }
+
+
+@dataclass
+class FetchResult:
+    results: Dict[str, Any]
+    errors: Dict[str, str]
+    latency: Dict[str, Any]
+
+
+class FetchPool:
+    """Bounded, rate-limited fan-out of per-key fetches.
+
+    - ``retry(fn, retries=n)`` supplies the backoff (providers pass their own
+      ``_call_with_retry`` so jitter semantics stay in one place)
+    - ``should_skip/on_success/on_failure`` hook into the provider circuit
+      breaker; once the route trips, queued keys fail fast with
+      CircuitOpenError instead of waiting on a throttled upstream
+    - one key failing never affects the others
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 8,
+        rate_per_sec: float = 8.0,
+        retries: int = 2,
+        retry: Optional[Callable[..., Any]] = None,
+        should_skip: Optional[Callable[[str], bool]] = None,
+        on_success: Optional[Callable[[str], None]] = None,
+        on_failure: Optional[Callable[[str, Exception], None]] = None,
+    ):
+        self.max_workers = max(1, int(max_workers))
+        self.rate_per_sec = float(rate_per_sec)
+        self.retries = max(1, int(retries))
+        self._retry = retry
+        self._should_skip = should_skip or (lambda route: False)
+        self._on_success = on_success or (lambda route: None)
+        self._on_failure = on_failure or (lambda route, err: None)
+
+    def run(self, keys: Iterable[str], fetch: Callable[[str], Any], *, route: str, host: str) -> FetchResult:
+        keys = list(dict.fromkeys(keys))
+        bucket = bucket_for(host, self.rate_per_sec)
+        lat = RouteLatency()
+        lat_lock = threading.Lock()
+        results: Dict[str, Any] = {}
+        errors: Dict[str, str] = {}
+
+        def attempt(key: str) -> Any:
+            if self._should_skip(route):
+                raise CircuitOpenError(route)
+            bucket.acquire()
+            t0 = time.perf_counter()
+            try:
+                out = fetch(key)
+            except Exception as e:  # noqa: BLE001
+                with lat_lock:
+                    lat.add((time.perf_counter() - t0) * 1000.0, ok=False)
+                self._on_failure(route, e)
+                raise
+            with lat_lock:
+                lat.add((time.perf_counter() - t0) * 1000.0, ok=True)
+            self._on_success(route)
+            return out
+
+        def one(key: str) -> None:
+            try:
+                if self._retry is not None:
+                    results[key] = self._retry(lambda: attempt(key), retries=self.retries)
+                else:
+                    results[key] = attempt(key)
+            except CircuitOpenError as e:
+                with lat_lock:
+                    lat.skipped += 1
+                errors[key] = str(e)
+            except Exception as e:  # noqa: BLE001
+                errors[key] = str(e) or type(e).__name__
+
+        workers = min(self.max_workers, max(1, len(keys)))
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            list(ex.map(one, keys))
+        return FetchResult(results=results, errors=errors, latency={route: lat.summary()})
@@ -1,37 +1,38 @@
-# 简介：本地 Parquet 日线数据提供者。按约定路径读取并做最小规范化，
-# 失败时抛出 DataProviderError，健康检查仅检查文件存在性。
+# 简介：本地 Parquet 日线数据提供者。优先读取分区列式存储（谓词/列下推），
+# 回退到单文件 parquet 并做最小规范化；失败时抛出 DataProviderError，
+# 健康检查仅检查文件存在性。
 from __future__ import annotations
 
-from typing import Dict, Any
+from typing import Dict, Any, Iterable, Optional
 from pathlib import Path
 import pandas as pd
 
 from ..core.paths import data_dir
 from ..core.errors import DataProviderError
 from .base import MarketDataProvider
-
-
-def _infer_ts_code(symbol: str) -> str:
-    s = symbol.strip().upper()
-    if "." in s:
-        return s
-    # Heuristic: 6xxxxx -> SH, others -> SZ
-    if s.startswith("6"):
-        return f"{s}.SH"
-    return f"{s}.SZ"
+from .bar_store import BarStore, infer_ts_code as _infer_ts_code
 
 
 class LocalParquetProvider(MarketDataProvider):
     name = "local"
 
     def __init__(self, root: Path | None = None):
-        self.root = (root or data_dir()) / "bars" / "daily"
+        base = root or data_dir()
+        self.root = base / "bars" / "daily"
+        self.store = BarStore(base / "bars" / "daily_store")
 
     def _file_for(self, symbol: str) -> Path:
         ts_code = _infer_ts_code(symbol)
         return self.root / f"ts_code={ts_code}.parquet"
 
-    def get_daily(self, symbol: str, start: str | None, end: str | None) -> pd.DataFrame:  # noqa: D401
+    def append_daily(self, symbol: str, df: pd.DataFrame) -> int:
+        """Append new trading days for symbol into the columnar store."""
+        return self.store.append(symbol, df)
+
+    def get_daily(self, symbol: str, start: str | None, end: str | None, *, columns: Optional[Iterable[str]] = None) -> pd.DataFrame:  # noqa: D401
+        if self.store.has(symbol):
+            # start/end and columns are pushed down into the parquet scan
+            return self._soft_normalize(self.store.read(symbol, start, end, columns=columns), symbol)
         fp = self._file_for(symbol)
         if not fp.exists():
             raise DataProviderError(f"本地数据不存在: {fp}", symbol=symbol)
@@ -39,7 +40,45 @@ class LocalParquetProvider(MarketDataProvider):
             df = pd.read_parquet(fp)
         except Exception as ex:  # noqa: BLE001
             raise DataProviderError(f"读取本地 parquet 失败: {fp}", symbol=symbol) from ex
+        df = self._soft_normalize(df, symbol)
+
+        # Filter by start/end if provided
+        try:
+            dts = pd.to_datetime(df["date"])  # type: ignore[assignment]
+        except Exception:  # noqa: BLE001
+            dts = pd.to_datetime(df["date"].astype(str), errors="coerce")
+        mask = pd.Series(True, index=df.index)
+        if start:
+            mask &= dts >= pd.to_datetime(start)
+        if end:
+            mask &= dts <= pd.to_datetime(end)
+        df = df.loc[mask].copy()
+        return df
+
+    def get_daily_many(self, symbols: Iterable[str], start: str | None, end: str | None, *, columns: Optional[Iterable[str]] = None) -> Dict[str, pd.DataFrame]:
+        """Bulk load: one dataset scan for stored symbols, legacy files for the rest."""
+        syms = list(dict.fromkeys(symbols))
+        stored = [s for s in syms if self.store.has(s)]
+        out: Dict[str, pd.DataFrame] = {}
+        if stored:
+            long = self.store.read_many(stored, start, end, columns=columns)
+            groups = {code: g for code, g in long.groupby("ts_code", sort=False)}
+            for sym in stored:
+                g = groups.get(_infer_ts_code(sym))
+                if g is None or g.empty:
+                    continue
+                df = g.drop(columns=["ts_code"]).reset_index(drop=True)
+                out[sym] = self._soft_normalize(df, sym)
+        for sym in syms:
+            if sym in out or sym in stored:
+                continue
+            try:
+                out[sym] = self.get_daily(sym, start, end, columns=columns)
+            except DataProviderError:
+                continue
+        return out
 
+    def _soft_normalize(self, df: pd.DataFrame, symbol: str) -> pd.DataFrame:
         # Soft-normalize common column names; full normalization is done later
         rename_map = {
             "trade_date": "date",
@@ -65,22 +104,12 @@ class LocalParquetProvider(MarketDataProvider):
             df.attrs["symbol"] = ts_code
         except Exception:
             pass
-
-        # Filter by start/end if provided
-        try:
-            dts = pd.to_datetime(df["date"])  # type: ignore[assignment]
-        except Exception:  # noqa: BLE001
-            dts = pd.to_datetime(df["date"].astype(str), errors="coerce")
-        mask = pd.Series(True, index=df.index)
-        if start:
-            mask &= dts >= pd.to_datetime(start)
-        if end:
-            mask &= dts <= pd.to_datetime(end)
-        df = df.loc[mask].copy()
         return df
 
     def healthcheck(self) -> Dict[str, Any]:
         try:
+            if self.store.root.exists() and next(self.store.root.glob("ts_code=*"), None) is not None:
+                return {"name": self.name, "ok": True, "reason": None}
             if self.root.exists():
                 any_file = next(self.root.glob("ts_code=*.parquet"), None)
                 ok = any_file is not None
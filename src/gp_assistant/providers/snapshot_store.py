@@ -0,0 +1,204 @@
+# 简介：全市场快照的进程级版本化表。刷新时按代码合并增量（价格/涨跌幅/成交额等，本次
+# 未返回的代码如停牌/退市即移除），并发刷新合并为单次在途请求（single-flight）；
+# 磁盘副本为带类型列的 Parquet。
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Optional, Tuple
+import json
+import os
+import threading
+import time
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from ..core.paths import store_dir
+
+
+_CODE_COLS = ("代码", "code")
+_TEXT_COLS = {"代码", "code", "名称", "name", "行业", "概念", "时间戳", "上市时间", "上市日期", "list_date"}
+_META_KEY = b"gp_snapshot"
+_BLANKS = {"-", "--", "", "None", "nan"}
+
+
+def code_column(df: pd.DataFrame) -> Optional[str]:
+    for c in _CODE_COLS:
+        if c in df.columns:
+            return c
+    return None
+
+
+def coerce_types(df: pd.DataFrame) -> pd.DataFrame:
+    """Typed columns: codes/names as str, numeric-looking columns as float64."""
+    out = df.copy()
+    for c in out.columns:
+        if c in _TEXT_COLS:
+            out[c] = out[c].astype(str)
+            continue
+        if pd.api.types.is_numeric_dtype(out[c]):
+            out[c] = out[c].astype("float64")
+            continue
+        # EM uses "-" for suspended quotes; keep genuinely textual columns as text
+        raw = out[c].where(~out[c].astype(str).str.strip().isin(_BLANKS))
+        num = pd.to_numeric(raw, errors="coerce")
+        if num.notna().sum() >= 0.9 * raw.notna().sum():
+            out[c] = num.astype("float64")
+        else:
+            out[c] = out[c].astype(str)
+    return out
+
+
+@dataclass(frozen=True)
+class SnapshotVersion:
+    df: pd.DataFrame
+    version: int
+    ts: float
+    source: Optional[str]
+    changed: int = 0
+    added: int = 0
+    removed: int = 0
+
+    def age_sec(self) -> float:
+        return max(0.0, time.time() - self.ts)
+
+
+class _Flight:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SnapshotTable:
+    """Versioned in-memory spot table keyed by code.
+
+    ``apply`` merges a fresh fetch into the current table: rows whose values
+    changed are updated, new codes appended, codes missing from the fetch
+    (suspended/delisted) dropped so stale quotes never feed market stats.
+    A changed column layout (e.g. EM -> Sina fallback) replaces the table.
+    Every apply yields a new ``SnapshotVersion``; published frames are never
+    mutated afterwards.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._current: Optional[SnapshotVersion] = None
+        self._flight: Optional[_Flight] = None
+
+    def current(self) -> Optional[SnapshotVersion]:
+        with self._lock:
+            return self._current
+
+    def apply(self, df: pd.DataFrame, source: Optional[str] = None, ts: Optional[float] = None) -> SnapshotVersion:
+        """Merge a fetch; ``ts`` is the data's fetch time (defaults to now, e.g. disk copies keep theirs)."""
+        ts = time.time() if ts is None else float(ts)
+        code = code_column(df)
+        new = coerce_types(df)
+        if code is not None:
+            new = new.drop_duplicates(subset=[code], keep="last")
+        with self._lock:
+            cur = self._current
+            version = (cur.version + 1) if cur is not None else 1
+            if cur is None or code is None or list(cur.df.columns) != list(new.columns):
+                snap = SnapshotVersion(new.reset_index(drop=True), version, ts, source, changed=len(new), added=len(new))
+            else:
+                snap = self._merge(cur, new, code, version, source, ts)
+            self._current = snap
+            return snap
+
+    @staticmethod
+    def _merge(cur: SnapshotVersion, new: pd.DataFrame, code: str, version: int, source: Optional[str], ts: float) -> SnapshotVersion:
+        base = cur.df.set_index(code)
+        inc = new.set_index(code)
+        common = inc.index.intersection(base.index)
+        cols = list(inc.columns)
+        old_vals = base.loc[common, cols]
+        new_vals = inc.loc[common, cols]
+        diff = ~((old_vals == new_vals) | (old_vals.isna() & new_vals.isna()))
+        changed = common[diff.any(axis=1).to_numpy()]
+        added = inc.index.difference(base.index)
+        keep = base.index.isin(inc.index)
+        merged = base[keep].copy()
+        if len(changed):
+            merged.loc[changed, cols] = new_vals.loc[changed, cols]
+        if len(added):
+            merged = pd.concat([merged, inc.loc[added]])
+        merged = merged.reset_index()
+        return SnapshotVersion(merged, version, ts, source, changed=int(len(changed)), added=int(len(added)), removed=int((~keep).sum()))
+
+    def refresh(self, fetch: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Single-flight: concurrent callers share one in-flight ``fetch()``.
+
+        Returns (fetch result, coalesced) where ``coalesced`` is True for
+        callers that waited on another thread's fetch; errors propagate to all.
+        """
+        with self._lock:
+            flight = self._flight
+            leader = flight is None
+            if leader:
+                flight = _Flight()
+                self._flight = flight
+        assert flight is not None
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result, True
+        try:
+            flight.result = fetch()
+        except BaseException as e:  # noqa: BLE001
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flight = None
+            flight.done.set()
+        return flight.result, False
+
+    # ---- Disk copy ------------------------------------------------------------
+    @staticmethod
+    def disk_path() -> Path:
+        return store_dir() / "snapshots" / "spot_latest.parquet"
+
+    def save_disk(self, path: Optional[Path] = None) -> None:
+        snap = self.current()
+        if snap is None:
+            return
+        fp = path or self.disk_path()
+        fp.parent.mkdir(parents=True, exist_ok=True)
+        table = pa.Table.from_pandas(snap.df, preserve_index=False)
+        md = dict(table.schema.metadata or {})
+        md[_META_KEY] = json.dumps({"version": snap.version, "ts": snap.ts, "source": snap.source}).encode("utf-8")
+        table = table.replace_schema_metadata(md)
+        tmp = fp.parent / f".{fp.name}.tmp"
+        pq.write_table(table, tmp)
+        os.replace(tmp, fp)
+
+    @classmethod
+    def load_disk(cls, max_age_sec: float, path: Optional[Path] = None) -> Optional[Tuple[pd.DataFrame, float]]:
+        """Return (df, age_sec) of the disk copy if younger than max_age_sec."""
+        fp = path or cls.disk_path()
+        try:
+            table = pq.read_table(fp)
+        except Exception:  # noqa: BLE001
+            return None
+        raw = (table.schema.metadata or {}).get(_META_KEY)
+        try:
+            ts = float(json.loads(raw.decode("utf-8"))["ts"]) if raw else fp.stat().st_mtime
+        except Exception:  # noqa: BLE001
+            ts = fp.stat().st_mtime
+        age = max(0.0, time.time() - ts)
+        if age > max_age_sec:
+            return None
+        return table.to_pandas(), age
+
+
+_TABLE = SnapshotTable()
+
+
+def get_snapshot_table() -> SnapshotTable:
+    """Process-wide table shared by all provider instances."""
+    return _TABLE
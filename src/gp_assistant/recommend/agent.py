@@ -11,27 +11,31 @@ This module orchestrates the end-to-end recommendation flow:
 from __future__ import annotations
 
 import json
-from typing import Any, Dict, List, Optional
+import time
+from typing import Any, Dict, List, Optional, Tuple
 
 import pandas as pd
 
-from ..core.config import load_config
+from ..core.config import AppConfig, load_config
 from ..core.logging import logger
 from ..observe.degrade import record as degrade_record
 from ..observe.degrade import warn_once
+from ..observe.trace import Profile, Tracer, start_profile
 from ..core.paths import store_dir
 from .calendar import calendar_summary
 from .datahub import MarketDataHub
 from .market_env import score_regime
 from .theme_pool import build_themes
 from .candidate_gen import generate_candidates
+from .concept_index import get_concept_index
+from .feature_context import FeatureContext
+from .snapshot_service import running_snapshot
 from ..providers.factory import get_provider
 
 # Strategy evaluation imports (full integration)
 from ..strategy import library as strat_lib  # type: ignore
 from ..strategy.ts_cv import purged_walk_forward  # type: ignore
 from ..strategy.champion import choose_champion  # type: ignore
-from ..strategy.indicators import compute_indicators  # type: ignore
 
 
 def _write_outputs(as_of: str, payload: Dict[str, Any]) -> None:
@@ -42,26 +46,70 @@ def _write_outputs(as_of: str, payload: Dict[str, Any]) -> None:
     (out_dir / f"{as_of}_sources.json").write_text(json.dumps(payload.get("debug", {}).get("sources", []), ensure_ascii=False, indent=2), encoding="utf-8")
 
 
+def _diversify(picks: List[Dict[str, Any]], k: int, max_per_industry: int) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """First k picks with at most max_per_industry per known industry (<=0: no cap).
+
+    Returns the kept picks and the symbols skipped because of the cap.
+    """
+    kept: List[Dict[str, Any]] = []
+    capped: List[str] = []
+    per: Dict[str, int] = {}
+    for it in picks:
+        if len(kept) >= k:
+            break
+        ind = it.get("industry")
+        if ind and max_per_industry > 0:
+            if per.get(ind, 0) >= max_per_industry:
+                capped.append(str(it.get("symbol")))
+                continue
+            per[ind] = per.get(ind, 0) + 1
+        kept.append(it)
+    return kept, capped
+
+
 def run(date: Optional[str] = None, topk: int = 3, universe: str = "auto", symbols: Optional[List[str]] = None, risk_profile: str = "normal") -> Dict[str, Any]:  # noqa: D401
     cfg = load_config()
+    # GP_PROFILE: whole-run profile; always stopped, and dumped even when the run fails
+    prof = start_profile(cfg.profile)
+    try:
+        return _run(cfg, prof, date, topk, universe, symbols, risk_profile)
+    finally:
+        if prof is not None and prof.active:
+            try:
+                prof.dump(store_dir() / "recommend" / f"{date or calendar_summary()['as_of']}_profile_failed")
+            except Exception:  # noqa: BLE001
+                prof.stop()
+
+
+def _run(cfg: AppConfig, prof: Optional[Profile], date: Optional[str], topk: int, universe: str, symbols: Optional[List[str]], risk_profile: str) -> Dict[str, Any]:
+    # stage spans end up in debug.timing
+    tracer = Tracer()
     cal = calendar_summary()
     as_of = date or cal["as_of"]
     hub = MarketDataHub()
 
-    # Fetch snapshot once and share within this run (degrade to None if unavailable)
-    provider = get_provider()
+    # Fetch snapshot once and share within this run (degrade to None if unavailable).
+    # With the background refresher running, read its published version instead.
     snapshot_df: Optional[pd.DataFrame]
     snap_meta: Dict[str, Any]
-    try:
-        snapshot_df = provider.get_spot_snapshot()
-        snap_meta = getattr(provider, "last_snapshot_meta", lambda: {})() or {}
-    except Exception as e:  # noqa: BLE001
-        snapshot_df = None
-        snap_meta = {"missing": True, "degrade": "no_snapshot_universe_mode", "error": str(e)}
+    with tracer.span("snapshot"):
+        published = running_snapshot()
+        if published is not None:
+            snapshot_df, snap_meta = published
+        else:
+            provider = get_provider()
+            try:
+                snapshot_df = provider.get_spot_snapshot()
+                snap_meta = getattr(provider, "last_snapshot_meta", lambda: {})() or {}
+            except Exception as e:  # noqa: BLE001
+                snapshot_df = None
+                snap_meta = {"missing": True, "degrade": "no_snapshot_universe_mode", "error": str(e)}
 
     # Environ + themes
-    env = score_regime(hub, snapshot=snapshot_df)
-    themes = build_themes(hub, snapshot=snapshot_df)
+    with tracer.span("score_regime"):
+        env = score_regime(hub, snapshot=snapshot_df)
+    with tracer.span("build_themes"):
+        themes = build_themes(hub, snapshot=snapshot_df)
 
     # Base selection
     if universe == "symbols" and symbols:
@@ -73,8 +121,10 @@ def run(date: Optional[str] = None, topk: int = 3, universe: str = "auto", symbo
         universe_syms = None
         universe_meta = None
 
-    # Candidates with stats
-    pool, veto, cand_stats = generate_candidates(base, env.get("grade", "C"), topk=topk, snapshot=snapshot_df)
+    # Candidates with stats; ctx carries bars/indicators to the strategy stage
+    ctx = FeatureContext(hub=hub)
+    with tracer.span("candidates"):
+        pool, veto, cand_stats = generate_candidates(base, env.get("grade", "C"), topk=topk, snapshot=snapshot_df, ctx=ctx, tracer=tracer)
 
     # Strategy evaluation helpers
     def _eval_strategies_for_symbol(sym: str, df_feat: pd.DataFrame, q_grade: Optional[str]) -> Dict[str, Any]:
@@ -89,34 +139,22 @@ def run(date: Optional[str] = None, topk: int = 3, universe: str = "auto", symbo
             cv_dict = getattr(cv, "__dict__", {})
         except Exception:
             cv_dict = {"k": 0, "win_rate_5d_mean": 0.0, "win_rate_5d_std": 0.0, "mean_return_5d_mean": 0.0, "mean_return_5d_std": 0.0, "drawdown_proxy_mean": 0.0}
-        # Iterate all registered strategies
-        for sid, mod in (strat_lib.REGISTRY or {}).items():
-            # detect setups (best effort)
-            try:
-                detect = getattr(mod, "detect_setups", None)
-                setups = detect(df_feat) if callable(detect) else []
-            except Exception:
-                setups = []
-            # event study (best effort)
-            ev_dict: Dict[str, Any] = {}
-            try:
-                ev = getattr(mod, "event_study", None)
-                if callable(ev):
-                    ev_stats = ev(df_feat, setups)
-                    ev_dict = getattr(ev_stats, "__dict__", {})
-            except Exception:
-                ev_dict = {}
+        # All strategies in one pass: shared masks, one multi-mask event study
+        batch = ctx.strategy_batch(sym)
+        for sid in (strat_lib.REGISTRY or {}):
+            ev = batch.events.get(str(sid))
+            ev_dict: Dict[str, Any] = getattr(ev, "__dict__", {}) if ev is not None else {}
             out[str(sid)] = {"cv": cv_dict, "event": ev_dict}
         return out
 
-    def _trade_plan_from_strategy(mod: Any, df_feat: pd.DataFrame, pick: Dict[str, Any], q_grade: Optional[str]) -> Dict[str, Any]:
+    def _trade_plan_from_strategy(sid: str, mod: Any, df_feat: pd.DataFrame, pick: Dict[str, Any], q_grade: Optional[str]) -> Dict[str, Any]:
         bands: Dict[str, float] = {}
         actions: Dict[str, str] = {}
         invalid: List[str] = []
-        # latest setup if available
+        # latest setup if available (memoized from the evaluation pass)
         try:
             detect = getattr(mod, "detect_setups", None)
-            setups = detect(df_feat) if callable(detect) else []
+            setups = ctx.setups_for(sid, str(pick.get("symbol")), detect) if callable(detect) else []
             setup = setups[-1] if setups else None
         except Exception:
             setup = None
@@ -162,41 +200,46 @@ def run(date: Optional[str] = None, topk: int = 3, universe: str = "auto", symbo
     feats_by_symbol: Dict[str, pd.DataFrame] = {}
     strategies_by_symbol: Dict[str, Any] = {}
     strategy_eval_failures: List[Dict[str, Any]] = []
-    for cand in pool:
-        sym = str(cand.get("symbol"))
-        try:
-            df, _meta = hub.daily_ohlcv(sym, None, min_len=250)
-            feat = compute_indicators(df)
-            feats_by_symbol[sym] = feat
-            strategies_by_symbol[sym] = _eval_strategies_for_symbol(sym, feat, q_grade=(cand.get("q_grade") or cand.get("indicators", {}).get("q_grade")))
-        except Exception as e:  # noqa: BLE001
-            strategy_eval_failures.append({"symbol": sym, "error": str(e)})
-            strategies_by_symbol[sym] = {}
+    with tracer.span("strategies"):
+        for cand in pool:
+            sym = str(cand.get("symbol"))
+            t0 = time.perf_counter()
+            try:
+                feat = ctx.features_for(sym)
+                feats_by_symbol[sym] = feat
+                strategies_by_symbol[sym] = _eval_strategies_for_symbol(sym, feat, q_grade=(cand.get("q_grade") or cand.get("indicators", {}).get("q_grade")))
+            except Exception as e:  # noqa: BLE001
+                strategy_eval_failures.append({"symbol": sym, "error": str(e)})
+                strategies_by_symbol[sym] = {}
+            tracer.record_symbol("strategies", sym, (time.perf_counter() - t0) * 1000.0)
     # attach strategies for champion selection
     for cand in pool:
         cand["strategies"] = strategies_by_symbol.get(str(cand.get("symbol")), {})
-    champions = choose_champion(pool)
+    with tracer.span("champion"):
+        champions = choose_champion(pool)
 
     # Build picks with champion and trade_plan
     picks: List[Dict[str, Any]] = []
-    for cand in pool:
-        sym = str(cand.get("symbol"))
-        it: Dict[str, Any] = {
-            "symbol": sym,
-            "theme": themes[0]["name"] if themes else "行业轮动",
-            "flags": cand.get("flags", {}),
-            "chip": cand.get("chip", {}),
-            "indicators": cand.get("indicators", {}),
-        }
-        champ = champions.get(sym) if isinstance(champions, dict) else None
-        if champ:
-            it["champion"] = champ
-            mod = (strat_lib.REGISTRY or {}).get(str(champ.get("strategy")))
-            feat = feats_by_symbol.get(sym)
-            if mod is not None and feat is not None:
-                it["trade_plan"] = _trade_plan_from_strategy(mod, feat, cand, q_grade=(cand.get("q_grade") or cand.get("indicators", {}).get("q_grade")))
-        picks.append(it)
-    picks = picks[: topk or 3]
+    with tracer.span("trade_plans"):
+        for cand in pool:
+            sym = str(cand.get("symbol"))
+            it: Dict[str, Any] = {
+                "symbol": sym,
+                "industry": cand.get("industry"),
+                "theme": themes[0]["name"] if themes else "行业轮动",
+                "flags": cand.get("flags", {}),
+                "chip": cand.get("chip", {}),
+                "indicators": cand.get("indicators", {}),
+            }
+            champ = champions.get(sym) if isinstance(champions, dict) else None
+            if champ:
+                it["champion"] = champ
+                mod = (strat_lib.REGISTRY or {}).get(str(champ.get("strategy")))
+                feat = feats_by_symbol.get(sym)
+                if mod is not None and feat is not None:
+                    it["trade_plan"] = _trade_plan_from_strategy(str(champ.get("strategy")), mod, feat, cand, q_grade=(cand.get("q_grade") or cand.get("indicators", {}).get("q_grade")))
+            picks.append(it)
+    picks, industry_capped = _diversify(picks, topk or 3, cfg.max_per_industry)
     # Champion availability advisory (soft warning, not affecting tradeable)
     champion_missing_syms: List[str] = []
     if picks:
@@ -237,8 +280,17 @@ def run(date: Optional[str] = None, topk: int = 3, universe: str = "auto", symbo
     # Degradation recording and tradeable decision
     dbg = payload.setdefault("debug", {})
     dbg["candidate_stats"] = cand_stats
+    dbg["feature_context"] = ctx.summary()
+    if industry_capped:
+        dbg.setdefault("advisories", []).append({"code": "MAX_PER_INDUSTRY", "symbols": industry_capped, "limit": cfg.max_per_industry})
     if champion_missing_syms:
         dbg.setdefault("advisories", []).append({"code": "CHAMPION_UNAVAILABLE", "symbols": champion_missing_syms})
+    # offline concept/industry index feeding industry fill, themes and mainline membership
+    cidx = get_concept_index()
+    if cidx is None:
+        dbg.setdefault("advisories", []).append({"code": "CONCEPT_INDEX_MISSING", "hint": "python -m gp_assistant refresh-index"})
+    elif not cidx.fresh(as_of):
+        dbg.setdefault("advisories", []).append({"code": "CONCEPT_INDEX_STALE", "built_on": cidx.built_on, "as_of": as_of})
     # record strategy evaluation failures if any
     try:
         for f in locals().get("strategy_eval_failures", []) or []:
@@ -324,5 +376,12 @@ def run(date: Optional[str] = None, topk: int = 3, universe: str = "auto", symbo
                     parts.append(f"{k}={detail[k]}")
             logger.warning(f"[DEGRADED] {code} {' '.join(parts)}".strip())
 
+    timing = tracer.summary()
+    if prof is not None:
+        timing["profile"] = {"mode": prof.mode, "files": prof.dump(store_dir() / "recommend" / f"{as_of}_profile")}
+    dbg["timing"] = timing
+    t0 = time.perf_counter()
     _write_outputs(as_of, payload)
+    # the written debug file cannot contain its own write time; the returned payload does
+    timing["stages"]["write_outputs"] = {"ms": round((time.perf_counter() - t0) * 1000.0, 3), "count": 1}
     return payload
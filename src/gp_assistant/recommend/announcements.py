@@ -5,10 +5,9 @@ import json
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional
 
-import requests
-
 from ..core.paths import store_dir
 from ..core.config import load_config
+from ..core.http import get_client
 
 
 def _cache_path(symbol: str) -> str:
@@ -41,11 +40,11 @@ def fetch_announcements(symbol: str) -> Dict[str, Any]:
     start = (datetime.now() - timedelta(days=30)).strftime("%Y-%m-%d")
     result = {"list": [], "risk_level": None, "evidence": [], "catalyst": [], "_reason": None}
     try:
-        # CNINFO requires complex params; use a placeholder endpoint that's public. If fails, degrade.
+        # CNINFO requires complex params; use the public query endpoint. If it fails, degrade.
         # For compliance we attempt and record failure without crashing.
         url = "https://www.cninfo.com.cn/new/hisAnnouncement/query"
         params = {"plate": "sz;sh", "seDate": f"{start}~{end}", "searchkey": symbol, "pageNum": 1, "pageSize": 30}
-        r = requests.post(url, data=params, timeout=10)
+        r = get_client().post(url, data=params, timeout=10)
         r.raise_for_status()
         js = r.json()
         items = js.get("announcements", []) if isinstance(js, dict) else []
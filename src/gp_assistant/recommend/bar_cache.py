@@ -0,0 +1,153 @@
+# 简介：规范化日线的磁盘缓存。按 (symbol, provider, adjust, as_of) 内容寻址存 Parquet；
+# 历史 as_of 视为不可变，当日/最新数据受 TTL 约束；按总大小做 LRU 淘汰。
+from __future__ import annotations
+
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+import hashlib
+import json
+import os
+import threading
+import time
+import zoneinfo
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from ..core.config import load_config
+from ..core.paths import store_dir
+
+
+_META_KEY = b"gp_meta"
+# derived from min_len at read time, never cached
+_VOLATILE_META = ("len", "insufficient_history")
+
+
+def cache_key(symbol: str, provider: str, adjust: str, as_of: Optional[str]) -> str:
+    raw = "|".join([symbol.strip().upper(), provider, adjust or "none", as_of or "latest"])
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+class BarCache:
+    """Content-addressed Parquet cache for normalized daily bars.
+
+    - file mtime = write time (TTL for current-day entries)
+    - file atime = last hit, set explicitly (LRU order, independent of mount options)
+    - total size kept under ``max_bytes`` by evicting least recently used files
+    """
+
+    def __init__(self, root: Path | None = None, ttl_sec: float = 600.0, max_bytes: int = 512 * 1024 * 1024, tz: str = "Asia/Shanghai"):
+        self.root = root or (store_dir() / "cache" / "bars")
+        self.ttl_sec = float(ttl_sec)
+        self.max_bytes = int(max_bytes)
+        self.tz = tz
+        self._lock = threading.Lock()
+        self._size: Optional[int] = None
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.parquet"
+
+    def _immutable(self, as_of: Optional[str]) -> bool:
+        if not as_of:
+            return False
+        try:
+            day = pd.Timestamp(as_of).date()
+        except Exception:  # noqa: BLE001
+            return False
+        return day < datetime.now(zoneinfo.ZoneInfo(self.tz)).date()
+
+    def get(self, symbol: str, provider: str, adjust: str, as_of: Optional[str]) -> Optional[Tuple[pd.DataFrame, Dict[str, Any]]]:
+        fp = self._path(cache_key(symbol, provider, adjust, as_of))
+        try:
+            st = fp.stat()
+        except OSError:
+            return None
+        now = time.time()
+        if not self._immutable(as_of) and now - st.st_mtime > self.ttl_sec:
+            return None
+        try:
+            table = pq.read_table(fp)
+        except Exception:  # noqa: BLE001
+            return None
+        raw_meta = (table.schema.metadata or {}).get(_META_KEY)
+        meta = json.loads(raw_meta.decode("utf-8")) if raw_meta else {}
+        df = table.to_pandas()
+        df.attrs.clear()
+        try:
+            os.utime(fp, (now, st.st_mtime))
+        except OSError:
+            pass
+        return df, meta
+
+    def put(self, symbol: str, provider: str, adjust: str, as_of: Optional[str], df: pd.DataFrame, meta: Dict[str, Any]) -> None:
+        fp = self._path(cache_key(symbol, provider, adjust, as_of))
+        keep = {k: v for k, v in meta.items() if k not in _VOLATILE_META}
+        try:
+            fp.parent.mkdir(parents=True, exist_ok=True)
+            table = pa.Table.from_pandas(df.reset_index(drop=True), preserve_index=False)
+            md = dict(table.schema.metadata or {})
+            md.pop(b"pandas", None)
+            md[_META_KEY] = json.dumps(keep, ensure_ascii=False, default=str).encode("utf-8")
+            table = table.replace_schema_metadata(md)
+            tmp = fp.parent / f".{fp.name}.{threading.get_ident()}.tmp"
+            pq.write_table(table, tmp)
+            os.replace(tmp, fp)
+            written = fp.stat().st_size
+        except Exception:  # noqa: BLE001
+            return
+        self._account(written)
+
+    def _files(self):  # noqa: ANN202
+        if not self.root.exists():
+            return []
+        return list(self.root.glob("*/*.parquet"))
+
+    def _account(self, written: int) -> None:
+        with self._lock:
+            if self._size is None:
+                self._size = sum(p.stat().st_size for p in self._files())
+            else:
+                self._size += written
+            if self._size <= self.max_bytes:
+                return
+            self._size = self._evict()
+
+    def _evict(self) -> int:
+        """Drop least recently used files down to 80% of the budget."""
+        entries = []
+        for p in self._files():
+            try:
+                st = p.stat()
+            except OSError:
+                continue
+            entries.append((st.st_atime, st.st_size, p))
+        entries.sort(key=lambda e: e[0])
+        total = sum(e[1] for e in entries)
+        target = int(self.max_bytes * 0.8)
+        for _atime, size, p in entries:
+            if total <= target:
+                break
+            try:
+                p.unlink()
+                total -= size
+            except OSError:
+                continue
+        return total
+
+
+_CACHE: Optional[BarCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_bar_cache() -> Optional[BarCache]:
+    """Process-wide cache from config; None when GP_BAR_CACHE=0."""
+    global _CACHE
+    cfg = load_config()
+    if not cfg.bar_cache_enabled:
+        return None
+    with _CACHE_LOCK:
+        if _CACHE is None:
+            _CACHE = BarCache(ttl_sec=cfg.bar_cache_ttl_sec, max_bytes=int(cfg.bar_cache_max_mb * 1024 * 1024), tz=cfg.timezone)
+        return _CACHE
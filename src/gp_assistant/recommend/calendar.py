@@ -28,6 +28,7 @@ class TradingWindowState:
     in_A: bool
     in_B: bool
     label: str  # "A"/"B"/"NONE"
+    in_session: bool = False  # continuous auction on a trading day (09:30-11:30, 13:00-15:00)
 
 
 def trading_window_now(now: datetime | None = None) -> TradingWindowState:
@@ -40,7 +41,29 @@ def trading_window_now(now: datetime | None = None) -> TradingWindowState:
     in_A = (tt >= A_start) and (tt <= A_end)
     in_B = (tt >= B_start) and (tt <= B_end)
     label = "A" if in_A else ("B" if in_B else "NONE")
-    return TradingWindowState(in_A=in_A, in_B=in_B, label=label)
+    in_session = is_trading_day(tnow) and ((time(9, 30) <= tt <= time(11, 30)) or (time(13, 0) <= tt <= time(15, 0)))
+    return TradingWindowState(in_A=in_A, in_B=in_B, label=label, in_session=in_session)
+
+
+_SESSION_OPENS = (time(9, 30), time(13, 0))
+
+
+def seconds_to_session_open(now: datetime | None = None) -> float:
+    """Seconds until the next continuous-auction open (09:30/13:00 on a trading day); 0 in session."""
+    cfg = load_config()
+    tz = zoneinfo.ZoneInfo(cfg.timezone)
+    tnow = (now or datetime.now(tz=tz)).astimezone(tz)
+    if trading_window_now(tnow).in_session:
+        return 0.0
+    day = tnow.replace(hour=0, minute=0, second=0, microsecond=0)
+    for _ in range(8):
+        if is_trading_day(day):
+            for t in _SESSION_OPENS:
+                start = day.replace(hour=t.hour, minute=t.minute)
+                if start > tnow:
+                    return (start - tnow).total_seconds()
+        day += timedelta(days=1)
+    return float("inf")
 
 
 def calendar_summary() -> Dict[str, str]:
@@ -7,15 +7,25 @@ and adds a minimal diagnostics stats dict returned alongside results.
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Tuple, Optional
+import dataclasses
+import multiprocessing as mp
+import threading
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Tuple, Optional
 
+import numpy as np
 import pandas as pd
 
-from .datahub import MarketDataHub
-from ..strategy.indicators import compute_indicators
+from .concept_index import get_concept_index
+from .feature_context import FeatureContext
+from .universe_engine import excluded_name, universe_frame
+from ..strategy import kernels as K
 from ..strategy.chip_model import compute_chip
+from ..strategy.indicators import ensure_amount
 from ..risk.noise_q import grade_noise
 from ..core.config import load_config
+from ..observe.trace import Tracer
 from ..providers.factory import get_provider
 
 
@@ -27,104 +37,40 @@ def _build_dynamic_universe_symbols(snapshot: Optional[pd.DataFrame] = None) ->
     - Price in [price_min, price_max]
     - Exclude newly listed within new_stock_days (if list_date available)
     - Select top N by amount (dynamic_pool_size)
+
+    Column parsing and exclusion masks are cached per snapshot version
+    (``universe_engine``); industry/concept membership comes from the local
+    index built by the offline refresh job (no network calls here).
     """
     if snapshot is None:
         raise RuntimeError("_build_dynamic_universe_symbols requires snapshot")
     cfg = load_config()
-    snap = snapshot
-    # Resolve column names (support Chinese/English variants)
-    code_col = "代码" if "代码" in snap.columns else ("code" if "code" in snap.columns else None)
-    name_col = "名称" if "名称" in snap.columns else ("name" if "name" in snap.columns else None)
-    price_col = None
-    for c in ("最新价", "现价", "最新", "close", "收盘"):
-        if c in snap.columns:
-            price_col = c
-            break
-    amount_col = "成交额" if "成交额" in snap.columns else ("amount" if "amount" in snap.columns else None)
-    list_date_col = None
-    for c in ("上市时间", "上市日期", "list_date"):
-        if c in snap.columns:
-            list_date_col = c
-            break
-    if not code_col or not price_col or not amount_col:
-        raise RuntimeError("snapshot missing required columns: code/price/amount")
-
-    df = snap.copy()
-    keep_cols = [code_col, name_col, price_col, amount_col] + ([list_date_col] if list_date_col else [])
-    if "行业" in snap.columns and "行业" not in keep_cols:
-        keep_cols.append("行业")
-    if "概念" in snap.columns and "概念" not in keep_cols:
-        keep_cols.append("概念")
-    df = df[keep_cols].rename(columns={code_col: "code", name_col or "N": "name", price_col: "price", amount_col: "amount", **({list_date_col: "list_date"} if list_date_col else {})})
-    # Basic filters
-    if "name" in df.columns:
-        mask_ok = ~df["name"].astype(str).str.upper().str.contains("ST|\*ST|退")
-        df = df[mask_ok]
-    df = df[(df["price"] >= cfg.price_min) & (df["price"] <= cfg.price_max)]
-    if "list_date" in df.columns:
-        try:
-            d = pd.to_datetime(df["list_date"], errors="coerce")
-            days = (pd.Timestamp.today().normalize() - d).dt.days
-            df = df[days >= cfg.new_stock_days]
-        except Exception:
-            pass
-    df = df.sort_values("amount", ascending=False).head(cfg.dynamic_pool_size)
+    uf = universe_frame(snapshot)
+    rows = uf.top_by_amount(uf.eligible(cfg.price_min, cfg.price_max, cfg.new_stock_days), cfg.dynamic_pool_size)
+
+    # industries from the local membership index when the snapshot has none
+    idx = get_concept_index()
+    if uf.industry is None and idx is not None and idx.industries:
+        uf = dataclasses.replace(uf, industry=idx.industries_for(uf.codes))
 
     # Mainline restriction (industry preferred)
     if cfg.restrict_to_mainline:
-        if "行业" in df.columns and df["行业"].notna().any():
-            tmp = df.copy()
-            g = tmp.groupby("行业").agg(sum_amt=("amount", "sum"), count=("code", "count")).reset_index()
-            g = g.sort_values("sum_amt", ascending=False).head(max(1, cfg.mainline_top_n))
-            top_groups = set(g["行业"].astype(str).tolist())
-            df = df[df["行业"].astype(str).isin(top_groups)]
-        else:
-            # concept route best-effort (leave as-is if unavailable)
-            try:
-                import akshare as ak  # type: ignore
-                cons_name = ak.stock_board_concept_name_ths()  # type: ignore[attr-defined]
-                if cons_name is not None and len(cons_name) > 0:
-                    rank_col = None
-                    for c in ("涨跌幅", "涨跌幅(%)", "涨跌", "changePct"):
-                        if c in cons_name.columns:
-                            rank_col = c
-                            break
-                    if rank_col is not None:
-                        cn = cons_name.copy()
-                        try:
-                            cn["_r"] = pd.to_numeric(cn[rank_col].astype(str).str.rstrip("% "), errors="coerce")
-                        except Exception:
-                            cn["_r"] = pd.to_numeric(cn[rank_col], errors="coerce")
-                        cn = cn.sort_values("_r", ascending=False).head(max(1, cfg.mainline_top_n))
-                        name_col = "板块名称" if "板块名称" in cn.columns else cn.columns[0]
-                        top_concepts = [str(x) for x in cn[name_col].tolist()]
-                        keep_codes: set[str] = set()
-                        for name in top_concepts:
-                            try:
-                                dfc = ak.stock_board_concept_cons_em(symbol=name)  # type: ignore[attr-defined]
-                                code_c = None
-                                for c in ("代码", "股票代码", "code"):
-                                    if c in dfc.columns:
-                                        code_c = c
-                                        break
-                                if code_c:
-                                    keep_codes.update(dfc[code_c].astype(str).tolist())
-                            except Exception:
-                                continue
-                        if keep_codes:
-                            df = df[df["code"].astype(str).isin(keep_codes)]
-            except Exception:
-                pass
-    # Return entries with optional labels
-    out: List[Dict[str, Any]] = []
-    for _, r in df.iterrows():
-        out.append({
-            "code": str(r["code"]),
-            "industry": (str(r["行业"]) if "行业" in df.columns and pd.notna(r.get("行业")) else None),
-            "amount": float(r.get("amount", 0.0)),
-            "name": str(r.get("name")) if "name" in df.columns else None,
-        })
-    return out
+        by_industry = uf.restrict_industries(rows, cfg.mainline_top_n)
+        if by_industry is not None:
+            rows = by_industry
+        elif idx is not None:
+            # concept route: strongest concepts by members' snapshot change, else by board rank at refresh
+            n = max(1, cfg.mainline_top_n)
+            if uf.change is not None:
+                top = idx.concept_strength(uf.codes, uf.change).index[:n].tolist()
+            else:
+                top = idx.top_concepts(n)
+            keep_codes: set[str] = set()
+            for name in top:
+                keep_codes.update(idx.codes(name))
+            if keep_codes:
+                rows = rows[np.isin(uf.codes[rows].astype(str), list(keep_codes))]
+    return uf.entries(rows)
 
 
 def _liquidity_grade(avg5_amount: float) -> str:
@@ -135,9 +81,124 @@ def _liquidity_grade(avg5_amount: float) -> str:
     return "C"
 
 
-def generate_candidates(symbols: List[str] | None, env_grade: str, topk: int = 3, *, snapshot: Optional[pd.DataFrame] = None) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], Dict[str, Any]]:
+def _avg5_amount(df: pd.DataFrame) -> float:
+    """Last-bar ``amount_5d_avg`` from raw bars, bit-identical to the feature value."""
+    x, _ = ensure_amount(df)
+    v = K.rolling_mean(K.as_2d(x["amount"].to_numpy(dtype="float64")), 5)[-1, 0] if len(x) else float("nan")
+    return 0.0 if pd.isna(v) else float(v)
+
+
+def _last_gap(df: pd.DataFrame) -> float:
+    """Last-bar ``gap_pct`` (open vs previous close) from raw bars, as the feature computes it."""
+    if len(df) < 2:
+        return 0.0
+    prev = float(df["close"].iloc[-2])
+    v = (float(df["open"].iloc[-1]) - prev) / (prev if prev != 0 else K.GUARD_EPS)
+    return 0.0 if pd.isna(v) else float(v)
+
+
+def _snapshot_rows(snapshot: Optional[pd.DataFrame], codes: List[str]) -> Dict[str, Tuple[bool, float]]:
+    """(ST/delisting name, latest price) per code found in the snapshot."""
+    if snapshot is None or not codes:
+        return {}
+    try:
+        uf = universe_frame(snapshot)
+    except Exception:  # noqa: BLE001
+        return {}
+    pos = uf.positions(codes)
+    return {c: (bool(uf.excluded[i]), float(uf.price[i])) for c, i in zip(codes, pos.tolist()) if i >= 0}
+
+
+# symbols per I/O batch; the next batch is fetched while the previous one computes
+_CHUNK = 64
+
+
+def _symbol_facts(sym: str, feat: pd.DataFrame, env_grade: str) -> Dict[str, Any]:
+    """CPU stage for one symbol: last-bar facts, chip model and noise grade.
+
+    Module-level and plain-data in/out so it can run in a worker process; the
+    elapsed time is measured where the work runs.
+    """
+    t0 = time.perf_counter()
+    last = feat.iloc[-1]
+    avg5_amount = float(feat["amount_5d_avg"].iloc[-1]) if "amount_5d_avg" in feat.columns and not pd.isna(feat["amount_5d_avg"].iloc[-1]) else 0.0
+    atrp = float(last.get("atr_pct", 0.0)) if not pd.isna(last.get("atr_pct", 0.0)) else 0.0
+    gap = float(last.get("gap_pct", 0.0)) if not pd.isna(last.get("gap_pct", 0.0)) else 0.0
+    close = float(last.get("close", 0.0)) if not pd.isna(last.get("close", 0.0)) else 0.0
+    ma20 = float(last.get("ma20", 0.0)) if not pd.isna(last.get("ma20", 0.0)) else 0.0
+    chip, _chip_meta = compute_chip(feat)
+    return {
+        "avg5_amount": avg5_amount,
+        "atr_pct": atrp,
+        "gap_pct": gap,
+        "close": close,
+        "ma20": ma20,
+        "slope20": float(feat["slope20"].iloc[-1]) if "slope20" in feat.columns else 0.0,
+        "chip": chip.__dict__,
+        "q_grade": grade_noise(feat, env_grade),
+        "elapsed_ms": (time.perf_counter() - t0) * 1000.0,
+    }
+
+
+_CPU_POOL: Optional[ProcessPoolExecutor] = None
+_CPU_POOL_WORKERS = 0
+_CPU_POOL_LOCK = threading.Lock()
+
+
+def _pool_context() -> Any:
+    # never fork: the server process holds live HTTP/fetch-pool threads and locks
+    methods = mp.get_all_start_methods()
+    return mp.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def _cpu_executor(workers: int) -> Optional[Executor]:
+    """Process-wide worker pool, created on first use and kept across runs.
+
+    Rebuilt when the worker count changes or a worker died; stopped by
+    ``shutdown_cpu_pool`` (server lifespan) or at interpreter exit.
+    """
+    global _CPU_POOL, _CPU_POOL_WORKERS
+    if workers <= 1:
+        return None
+    with _CPU_POOL_LOCK:
+        pool = _CPU_POOL
+        if pool is not None and (_CPU_POOL_WORKERS != workers or getattr(pool, "_broken", False)):
+            pool.shutdown(wait=False)
+            pool = _CPU_POOL = None
+        if pool is None:
+            try:
+                pool = ProcessPoolExecutor(max_workers=workers, mp_context=_pool_context())
+            except Exception:  # noqa: BLE001
+                return None
+            _CPU_POOL, _CPU_POOL_WORKERS = pool, workers
+        return pool
+
+
+def shutdown_cpu_pool() -> None:
+    global _CPU_POOL
+    with _CPU_POOL_LOCK:
+        pool, _CPU_POOL = _CPU_POOL, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _submit(ex: Optional[Executor], fn: Callable[..., Dict[str, Any]], *args: Any) -> "Future[Dict[str, Any]]":
+    if ex is not None:
+        return ex.submit(fn, *args)
+    fut: "Future[Dict[str, Any]]" = Future()
+    try:
+        fut.set_result(fn(*args))
+    except Exception as e:  # noqa: BLE001
+        fut.set_exception(e)
+    return fut
+
+
+def generate_candidates(symbols: List[str] | None, env_grade: str, topk: int = 3, *, snapshot: Optional[pd.DataFrame] = None, ctx: Optional[FeatureContext] = None, tracer: Optional[Tracer] = None) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], Dict[str, Any]]:
     cfg = load_config()
-    hub = MarketDataHub()
+    # sub-stage spans nest under the caller's current span
+    tracer = tracer if tracer is not None else Tracer()
+    # bars/indicators computed here are reused by the caller via ctx
+    ctx = ctx if ctx is not None else FeatureContext()
     pool: List[Dict[str, Any]] = []
     veto_reasons: List[Dict[str, Any]] = []
     stats: Dict[str, Any] = {
@@ -150,103 +211,174 @@ def generate_candidates(symbols: List[str] | None, env_grade: str, topk: int = 3
         "candidates_out_count": 0,
     }
     # Build base symbols
-    if symbols:
-        base_entries = ([{"code": s} for s in symbols])
-    else:
-        if snapshot is not None:
-            base_entries = _build_dynamic_universe_symbols(snapshot)
+    with tracer.span("universe"):
+        if symbols:
+            base_entries = ([{"code": s} for s in symbols])
         else:
-            from ..providers.universe_provider import UniverseProvider
-            uni = UniverseProvider()
-            syms = uni.get_symbols()
-            base_entries = ([{"code": s} for s in syms])
-            # enrich stats with universe meta when available
-            try:
-                um = uni.last_meta()
-                stats["universe_raw_count"] = int(um.get("raw_count", 0))
-                stats["universe_cleaned_count"] = int(um.get("cleaned_count", len(syms)))
-                stats["universe_removed_counts"] = um.get("removed_counts", {})
-            except Exception:
-                pass
+            if snapshot is not None:
+                base_entries = _build_dynamic_universe_symbols(snapshot)
+            else:
+                from ..providers.universe_provider import UniverseProvider
+                uni = UniverseProvider()
+                syms = uni.get_symbols()
+                base_entries = ([{"code": s} for s in syms])
+                # enrich stats with universe meta when available
+                try:
+                    um = uni.last_meta()
+                    stats["universe_raw_count"] = int(um.get("raw_count", 0))
+                    stats["universe_cleaned_count"] = int(um.get("cleaned_count", len(syms)))
+                    stats["universe_removed_counts"] = um.get("removed_counts", {})
+                except Exception:
+                    pass
     stats["universe_in_count"] = len(base_entries)
     stats["universe_after_filter_count"] = len(base_entries)
 
-    for entry in base_entries:
-        sym = entry.get("code")
-        try:
-            df, meta = hub.daily_ohlcv(sym, None, min_len=250)
-        except Exception:
-            stats["bars_missing_count"] += 1
-            if len(stats["skipped_symbols_sample"]) < 10:
-                stats["skipped_symbols_sample"].append(sym)
-            continue
-        try:
-            if bool(meta.get("insufficient_history")):
-                stats["bars_too_short_count"] += 1
-        except Exception:
-            pass
-        try:
-            feat = compute_indicators(df)
-        except Exception:
-            stats["indicator_error_count"] += 1
-            try:
-                feat = compute_indicators(df)
-            except Exception:
-                if len(stats["skipped_symbols_sample"]) < 10:
-                    stats["skipped_symbols_sample"].append(sym)
-                continue
-        # facts
-        last = feat.iloc[-1]
-        avg5_amount = float(feat["amount_5d_avg"].iloc[-1]) if "amount_5d_avg" in feat.columns and not pd.isna(feat["amount_5d_avg"].iloc[-1]) else 0.0
-        atrp = float(last.get("atr_pct", 0.0)) if not pd.isna(last.get("atr_pct", 0.0)) else 0.0
-        gap = float(last.get("gap_pct", 0.0)) if not pd.isna(last.get("gap_pct", 0.0)) else 0.0
-        close = float(last.get("close", 0.0)) if not pd.isna(last.get("close", 0.0)) else 0.0
-        ma20 = float(last.get("ma20", 0.0)) if not pd.isna(last.get("ma20", 0.0)) else 0.0
-        pressure = {"near_ma20": bool(ma20 and abs((close - ma20) / ma20) <= 0.005)}
-        chip, chip_meta = compute_chip(feat)
-        q_grade = grade_noise(feat, env_grade)
-
-        cand = {
-            "symbol": sym,
-            "name": entry.get("name"),
-            "industry": entry.get("industry"),
-            "source_reason": "默认候选池",
-            "liquidity": {"avg5_amount": avg5_amount, "grade": _liquidity_grade(avg5_amount)},
-            "atr_pct": atrp,
-            "gap_pct": gap,
-            "pressure_flags": pressure,
-            "q_grade": q_grade,
-            "chip": chip.__dict__,
-            "indicators": {
-                "ma20": ma20,
-                "slope20": float(feat["slope20"].iloc[-1]) if "slope20" in feat.columns else 0.0,
-                "atr_pct": atrp,
-                "gap_pct": gap,
-            },
-            "close": close,
-        }
-        observe_only = False
-        reasons: List[str] = []
-        if avg5_amount < cfg.min_avg_amount:
-            veto_reasons.append({"symbol": sym, "reason": "LOW_LIQ_HARD", "amount_5d_avg": avg5_amount})
-            continue
-        if cand["liquidity"]["grade"] == "C":
-            observe_only = True
-            reasons.append("LIQ_C_OBSERVE")
-        if atrp > 0.08:
-            observe_only = True
-            reasons.append("ATR_HIGH_OBSERVE")
-        if gap > 0.02:
-            observe_only = True
-            reasons.append("GAP_HIGH_FORBID")
-        if getattr(chip, "dist_to_90_high_pct", 1.0) <= 0.02:
-            observe_only = True
-            reasons.append("NEAR_CHIP90_HIGH_FORBID")
-        cand["flags"] = {"must_observe_only": bool(observe_only), "reasons": reasons}
-        pool.append(cand)
+    # Pipeline: ST/delisting names are dropped before any fetch, then per chunk a
+    # bulk bar fetch (bounded by GP_FETCH_CONCURRENCY), cheap gates on the snapshot
+    # or the last raw bars (price band, opening gap, 5-day amount), then indicators
+    # and per-symbol chip/noise work for survivors only; the latter runs in the shared process pool
+    # (GP_CANDIDATE_WORKERS) while the next chunk downloads. Results are consumed
+    # in entry order. Indicators stay in this process: they are one vectorized panel
+    # pass per chunk and the frames must land in ``ctx`` for the later stages, so
+    # computing them in workers would ship every feature frame back.
+    members = get_concept_index()
+    ex = _cpu_executor(cfg.candidate_workers)
+    stats["candidate_workers"] = cfg.candidate_workers if ex is not None else 1
+    survivors = {"universe": len(base_entries), "st": 0, "bars": 0, "price_band": 0, "gap": 0, "liquidity": 0, "features": 0, "candidates": 0}
+    snap_rows = _snapshot_rows(snapshot, [str(e.get("code")) for e in base_entries])
+    jobs: List[Tuple[Dict[str, Any], "Future[Dict[str, Any]]"]] = []
+    try:
+        for start in range(0, len(base_entries), _CHUNK):
+            listed: List[Dict[str, Any]] = []
+            with tracer.span("st_gate"):
+                for entry in base_entries[start: start + _CHUNK]:
+                    sym = entry.get("code")
+                    row = snap_rows.get(str(sym))
+                    if (row[0] if row is not None else excluded_name(entry.get("name"))):
+                        veto_reasons.append({"symbol": sym, "reason": "ST_EXCLUDED"})
+                        continue
+                    survivors["st"] += 1
+                    listed.append(entry)
+            with tracer.span("fetch_bars"):
+                bars = ctx.load_bars([e.get("code") for e in listed])
+            liquid: List[Dict[str, Any]] = []
+            with tracer.span("bar_gates"):
+                for entry in listed:
+                    sym = entry.get("code")
+                    if sym not in bars:
+                        stats["bars_missing_count"] += 1
+                        if len(stats["skipped_symbols_sample"]) < 10:
+                            stats["skipped_symbols_sample"].append(sym)
+                        continue
+                    df, meta = bars[sym]
+                    survivors["bars"] += 1
+                    try:
+                        if bool(meta.get("insufficient_history")):
+                            stats["bars_too_short_count"] += 1
+                    except Exception:
+                        pass
+                    row = snap_rows.get(str(sym))
+                    price = row[1] if row is not None and np.isfinite(row[1]) else (float(df["close"].iloc[-1]) if len(df) else float("nan"))
+                    if not cfg.price_min <= price <= cfg.price_max:
+                        veto_reasons.append({"symbol": sym, "reason": "PRICE_OUT_OF_BAND", "price": price})
+                        continue
+                    survivors["price_band"] += 1
+                    gap = _last_gap(df)
+                    if gap > cfg.max_gap_pct:
+                        veto_reasons.append({"symbol": sym, "reason": "GAP_LIMIT_HARD", "gap_pct": gap})
+                        continue
+                    survivors["gap"] += 1
+                    avg5_amount = _avg5_amount(df)
+                    if avg5_amount < cfg.min_avg_amount:
+                        veto_reasons.append({"symbol": sym, "reason": "LOW_LIQ_HARD", "amount_5d_avg": avg5_amount})
+                        continue
+                    survivors["liquidity"] += 1
+                    liquid.append(entry)
+            ready: List[Tuple[Dict[str, Any], pd.DataFrame]] = []
+            with tracer.span("features"):
+                # indicators for the chunk's survivors in one vectorized panel pass
+                ctx.prime_features([e.get("code") for e in liquid])
+                for entry in liquid:
+                    sym = entry.get("code")
+                    try:
+                        feat = ctx.features_for(sym)
+                    except Exception:
+                        stats["indicator_error_count"] += 1
+                        try:
+                            feat = ctx.features_for(sym)
+                        except Exception:
+                            if len(stats["skipped_symbols_sample"]) < 10:
+                                stats["skipped_symbols_sample"].append(sym)
+                            continue
+                    survivors["features"] += 1
+                    ready.append((entry, feat))
+            with tracer.span("symbol_facts"):
+                for entry, feat in ready:
+                    jobs.append((entry, _submit(ex, _symbol_facts, entry.get("code"), feat, env_grade)))
+
+        with tracer.span("collect"):
+            for entry, job in jobs:
+                sym = entry.get("code")
+                try:
+                    facts = job.result()
+                except Exception:  # noqa: BLE001
+                    stats["indicator_error_count"] += 1
+                    if len(stats["skipped_symbols_sample"]) < 10:
+                        stats["skipped_symbols_sample"].append(sym)
+                    continue
+                tracer.record_symbol("symbol_facts", str(sym), facts["elapsed_ms"])
+                avg5_amount = facts["avg5_amount"]
+                atrp = facts["atr_pct"]
+                gap = facts["gap_pct"]
+                close = facts["close"]
+                ma20 = facts["ma20"]
+                pressure = {"near_ma20": bool(ma20 and abs((close - ma20) / ma20) <= 0.005)}
+                chip = facts["chip"]
+
+                cand = {
+                    "symbol": sym,
+                    "name": entry.get("name"),
+                    "industry": entry.get("industry") or (members.industry_of(str(sym)) if members is not None else None),
+                    "source_reason": "默认候选池",
+                    "liquidity": {"avg5_amount": avg5_amount, "grade": _liquidity_grade(avg5_amount)},
+                    "atr_pct": atrp,
+                    "gap_pct": gap,
+                    "pressure_flags": pressure,
+                    "q_grade": facts["q_grade"],
+                    "chip": chip,
+                    "indicators": {
+                        "ma20": ma20,
+                        "slope20": facts["slope20"],
+                        "atr_pct": atrp,
+                        "gap_pct": gap,
+                    },
+                    "close": close,
+                }
+                observe_only = False
+                reasons: List[str] = []
+                if cand["liquidity"]["grade"] == "C":
+                    observe_only = True
+                    reasons.append("LIQ_C_OBSERVE")
+                if atrp > 0.08:
+                    observe_only = True
+                    reasons.append("ATR_HIGH_OBSERVE")
+                if gap > 0.02:
+                    observe_only = True
+                    reasons.append("GAP_HIGH_FORBID")
+                if chip.get("dist_to_90_high_pct", 1.0) <= 0.02:
+                    observe_only = True
+                    reasons.append("NEAR_CHIP90_HIGH_FORBID")
+                cand["flags"] = {"must_observe_only": bool(observe_only), "reasons": reasons}
+                pool.append(cand)
+    finally:
+        # the pool outlives this run; drop work nobody will collect
+        for _entry, job in jobs:
+            job.cancel()
 
     pool.sort(key=lambda x: (-(x["indicators"].get("slope20") or 0.0), x["atr_pct"], x["liquidity"]["grade"]))
     stats["candidates_out_count"] = len(pool)
+    survivors["candidates"] = len(pool)
+    stats["stage_survivors"] = survivors
     return pool, veto_reasons, stats
 
 
@@ -0,0 +1,233 @@
+# 简介：本地行业/概念成分索引（概念→成分代码、代码→概念/行业）。由离线刷新任务
+# （`python -m gp_assistant refresh-index`）从 AkShare 重建并持久化到
+# store/index/concepts.json；荐股时主线过滤、主题与行业分散只查本地索引（O(1) 查找、
+# 与快照的向量化关联），不发起网络请求。
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+import datetime as dt
+import json
+import math
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from ..core.config import load_config
+from ..core.paths import store_dir
+from ..providers.fetch_pool import FetchPool
+
+
+@dataclass
+class ConceptIndex:
+    """Concept -> member codes (with each board's change % at build time) and code -> industry."""
+
+    built_on: str
+    concepts: Dict[str, List[str]] = field(default_factory=dict)
+    ranks: Dict[str, float] = field(default_factory=dict)
+    industries: Dict[str, str] = field(default_factory=dict)
+    _by_code: Optional[Dict[str, List[str]]] = field(default=None, repr=False, compare=False)
+    _members: Optional[Tuple[np.ndarray, np.ndarray]] = field(default=None, repr=False, compare=False)
+
+    def codes(self, concept: str) -> List[str]:
+        return self.concepts.get(concept, [])
+
+    def concepts_of(self, code: str) -> List[str]:
+        if self._by_code is None:
+            by_code: Dict[str, List[str]] = {}
+            for name, members in self.concepts.items():
+                for c in members:
+                    by_code.setdefault(c, []).append(name)
+            self._by_code = by_code
+        return self._by_code.get(code, [])
+
+    def industry_of(self, code: str) -> Optional[str]:
+        return self.industries.get(code)
+
+    def industries_for(self, codes: Sequence[str]) -> np.ndarray:
+        """Industry per code (None when unknown), as an object array aligned with codes."""
+        got = pd.Series(self.industries, dtype=object).reindex(pd.Index([str(c) for c in codes]))
+        return np.where(got.notna().to_numpy(), got.to_numpy(dtype=object), None)
+
+    def _member_table(self) -> Tuple[np.ndarray, np.ndarray]:
+        if self._members is None:
+            names = list(self.concepts)
+            sizes = [len(self.concepts[n]) for n in names]
+            codes = np.array([c for n in names for c in self.concepts[n]], dtype=object)
+            self._members = (codes, np.repeat(np.array(names, dtype=object), sizes))
+        return self._members
+
+    def concept_strength(self, codes: Sequence[str], values: Sequence[float]) -> pd.DataFrame:
+        """Mean/count of ``values`` (e.g. snapshot change %) over each concept's members.
+
+        One vectorized join of the member table against the snapshot; sorted
+        by mean descending (ties keep index order).
+        """
+        member_codes, member_concepts = self._member_table()
+        s = pd.Series(np.asarray(values, dtype="float64"), index=pd.Index([str(c) for c in codes]))
+        s = s[~s.index.duplicated()]
+        joined = pd.DataFrame({"concept": member_concepts, "v": s.reindex(member_codes).to_numpy()})
+        g = joined.dropna().groupby("concept", sort=False)["v"].agg(["mean", "count"])
+        return g.sort_values("mean", ascending=False, kind="stable")
+
+    def top_concepts(self, n: int) -> List[str]:
+        """Concepts by board change at build time, strongest first (unranked last)."""
+        def key(name: str) -> float:
+            r = self.ranks.get(name)
+            return -r if r is not None and not math.isnan(r) else math.inf
+
+        return sorted(self.concepts, key=key)[: max(0, n)]
+
+    def fresh(self, today: Optional[str] = None) -> bool:
+        return self.built_on == (today or dt.date.today().isoformat())
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"built_on": self.built_on, "concepts": self.concepts, "ranks": self.ranks, "industries": self.industries}
+
+    @classmethod
+    def from_dict(cls, d: Mapping[str, Any]) -> "ConceptIndex":
+        return cls(
+            built_on=str(d.get("built_on", "")),
+            concepts={str(k): [str(c) for c in v] for k, v in (d.get("concepts") or {}).items()},
+            ranks={str(k): float(v) for k, v in (d.get("ranks") or {}).items()},
+            industries={str(k): str(v) for k, v in (d.get("industries") or {}).items()},
+        )
+
+
+def index_path() -> Path:
+    return store_dir() / "index" / "concepts.json"
+
+
+def save_index(idx: ConceptIndex, path: Optional[Path] = None) -> None:
+    p = path or index_path()
+    p.parent.mkdir(parents=True, exist_ok=True)
+    tmp = p.with_suffix(".tmp")
+    tmp.write_text(json.dumps(idx.to_dict(), ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, p)
+
+
+def load_index(path: Optional[Path] = None) -> Optional[ConceptIndex]:
+    p = path or index_path()
+    try:
+        return ConceptIndex.from_dict(json.loads(p.read_text(encoding="utf-8")))
+    except (OSError, ValueError):
+        return None
+
+
+def _first_col(df: pd.DataFrame, names: tuple) -> Optional[str]:
+    for c in names:
+        if c in df.columns:
+            return c
+    return None
+
+
+def _ak_concept_names() -> pd.DataFrame:
+    import akshare as ak  # type: ignore
+    return ak.stock_board_concept_name_ths()  # type: ignore[attr-defined]
+
+
+def _ak_concept_members(name: str) -> pd.DataFrame:
+    import akshare as ak  # type: ignore
+    return ak.stock_board_concept_cons_em(symbol=name)  # type: ignore[attr-defined]
+
+
+def _ak_industry_names() -> pd.DataFrame:
+    import akshare as ak  # type: ignore
+    return ak.stock_board_industry_name_em()  # type: ignore[attr-defined]
+
+
+def _ak_industry_members(name: str) -> pd.DataFrame:
+    import akshare as ak  # type: ignore
+    return ak.stock_board_industry_cons_em(symbol=name)  # type: ignore[attr-defined]
+
+
+def _board_members(boards: List[str], fetch: Callable[[str], pd.DataFrame], route: str) -> Dict[str, List[str]]:
+    cfg = load_config()
+    pool = FetchPool(max_workers=cfg.fetch_concurrency, rate_per_sec=max(cfg.fetch_rate_per_sec, 1.0), retries=cfg.fetch_retries)
+    got = pool.run(boards, fetch, route=route, host="push2.eastmoney.com")
+    out: Dict[str, List[str]] = {}
+    for b in boards:
+        dfc = got.results.get(b)
+        code_c = _first_col(dfc, ("代码", "股票代码", "code")) if dfc is not None else None
+        if code_c:
+            out[b] = [str(c) for c in dfc[code_c].tolist()]
+    return out
+
+
+def build_index(
+    fetch_names: Callable[[], pd.DataFrame] = _ak_concept_names,
+    fetch_members: Callable[[str], pd.DataFrame] = _ak_concept_members,
+    today: Optional[str] = None,
+    fetch_industries: Optional[Callable[[], pd.DataFrame]] = _ak_industry_names,
+    fetch_industry_members: Callable[[str], pd.DataFrame] = _ak_industry_members,
+) -> ConceptIndex:
+    """Full rebuild: concept boards and their members, then industry boards (bounded concurrency).
+
+    A failing industry listing leaves ``industries`` empty rather than failing the build.
+    """
+    names = fetch_names()
+    if names is None or len(names) == 0:
+        raise RuntimeError("concept board list empty")
+    name_col = "板块名称" if "板块名称" in names.columns else names.columns[0]
+    rank_col = _first_col(names, ("涨跌幅", "涨跌幅(%)", "涨跌", "changePct"))
+    boards = [str(x) for x in names[name_col].tolist()]
+    ranks: Dict[str, float] = {}
+    if rank_col is not None:
+        r = pd.to_numeric(names[rank_col].astype(str).str.rstrip("% "), errors="coerce")
+        ranks = {b: float(v) for b, v in zip(boards, r.tolist()) if not pd.isna(v)}
+    concepts = _board_members(boards, fetch_members, "ak:concept_cons")
+    industries: Dict[str, str] = {}
+    if fetch_industries is not None:
+        try:
+            ind = fetch_industries()
+            ind_col = "板块名称" if "板块名称" in ind.columns else ind.columns[0]
+            for b, members in _board_members([str(x) for x in ind[ind_col].tolist()], fetch_industry_members, "ak:industry_cons").items():
+                for c in members:
+                    industries.setdefault(c, b)
+        except Exception:  # noqa: BLE001
+            industries = {}
+    return ConceptIndex(built_on=today or dt.date.today().isoformat(), concepts=concepts, ranks=ranks, industries=industries)
+
+
+_INDEX: Optional[ConceptIndex] = None
+_INDEX_STAMP: Optional[Tuple[str, int]] = None  # (path, mtime_ns) of the file behind _INDEX
+_INDEX_LOCK = threading.Lock()
+
+
+def _file_stamp(p: Path) -> Optional[Tuple[str, int]]:
+    try:
+        return str(p), p.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def get_concept_index() -> Optional[ConceptIndex]:
+    """Process-wide index loaded from disk (no network); None until a refresh has run.
+
+    The refresh job usually runs in another process, so the file's mtime is
+    checked on every call and a rewritten index is picked up by long-running
+    servers.
+    """
+    global _INDEX, _INDEX_STAMP
+    stamp = _file_stamp(index_path())
+    with _INDEX_LOCK:
+        if stamp is None:
+            _INDEX, _INDEX_STAMP = None, None
+        elif stamp != _INDEX_STAMP or _INDEX is None:
+            idx = load_index()
+            if idx is not None:
+                _INDEX, _INDEX_STAMP = idx, stamp
+        return _INDEX
+
+
+def refresh_index(**builders: Any) -> ConceptIndex:
+    """Offline refresh job: rebuild, persist and swap in the process-wide index."""
+    global _INDEX, _INDEX_STAMP
+    idx = build_index(**builders)
+    save_index(idx)
+    with _INDEX_LOCK:
+        _INDEX, _INDEX_STAMP = idx, _file_stamp(index_path())
+    return idx
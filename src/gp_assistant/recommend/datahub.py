@@ -4,38 +4,17 @@ from __future__ import annotations
 
 import json
 from dataclasses import dataclass
-from pathlib import Path
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, Iterable, Optional, Tuple
 
 import pandas as pd
-import requests
 
 from ..core.paths import store_dir
 from ..core.config import load_config
 from ..providers.factory import get_provider
+from .bar_cache import get_bar_cache
 from ..tools.market_data import normalize_daily_ohlcv
 
 
-def _cache_path(kind: str, key: str) -> Path:
-    p = store_dir() / "cache" / kind
-    p.mkdir(parents=True, exist_ok=True)
-    return p / f"{key}.json"
-
-
-def _save_json(path: Path, obj: Dict[str, Any]) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(obj, ensure_ascii=False), encoding="utf-8")
-
-
-def _load_json(path: Path) -> Optional[Dict[str, Any]]:
-    if not path.exists():
-        return None
-    try:
-        return json.loads(path.read_text(encoding="utf-8"))
-    except Exception:
-        return None
-
-
 @dataclass
 class MarketDataHub:
     """Multi-source market data with caching and unified schema."""
@@ -61,26 +40,91 @@ class MarketDataHub:
         return None
 
     def daily_ohlcv(self, symbol: str, as_of: Optional[str] = None, min_len: int = 250) -> Tuple[pd.DataFrame, Dict[str, Any]]:
-        # fixtures -> provider; no synthetic fallback
+        # fixtures -> bar cache -> provider; no synthetic fallback
         cfg = load_config()
         df: Optional[pd.DataFrame] = None if cfg.strict_real_data else self._from_fixtures(symbol)
-        meta: Dict[str, Any] = {"source": None}
         if df is not None:
-            meta["source"] = "fixtures"
-        else:
-            provider = get_provider()
-            raw = provider.get_daily(symbol, start=None, end=as_of)
-            df = raw
-            meta["source"] = f"provider:{provider.name}"
-        if df is None or len(df) == 0:
-            raise ValueError(f"daily_ohlcv: 无法获取真实数据 symbol={symbol}")
-        df_norm, m = normalize_daily_ohlcv(df)
-        meta.update(m)
+            return self._finalize(symbol, df, {"source": "fixtures"}, min_len)
+        provider = get_provider()
+        cache = get_bar_cache()
+        adjust = self._adjust(provider)
+        hit = cache.get(symbol, provider.name, adjust, as_of) if cache is not None else None
+        if hit is not None:
+            return self._annotate(hit[0], {**hit[1], "cache": "hit"}, min_len)
+        raw = provider.get_daily(symbol, start=None, end=as_of)
+        df_norm, meta = self._finalize(symbol, raw, {"source": f"provider:{provider.name}"}, min_len)
+        if cache is not None:
+            cache.put(symbol, provider.name, adjust, as_of, df_norm, meta)
+        return df_norm, meta
+
+    @staticmethod
+    def _adjust(provider: Any) -> str:
+        return str(getattr(provider, "adjust", "") or "none")
+
+    @staticmethod
+    def _annotate(df_norm: pd.DataFrame, meta: Dict[str, Any], min_len: int) -> Tuple[pd.DataFrame, Dict[str, Any]]:
         meta["len"] = len(df_norm)
         meta["insufficient_history"] = len(df_norm) < min_len
         df_norm.attrs.update(meta)
         return df_norm, meta
 
+    @classmethod
+    def _finalize(cls, symbol: str, df: Optional[pd.DataFrame], meta: Dict[str, Any], min_len: int) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+        if df is None or len(df) == 0:
+            raise ValueError(f"daily_ohlcv: 无法获取真实数据 symbol={symbol}")
+        df_norm, m = normalize_daily_ohlcv(df)
+        meta.update(m)
+        return cls._annotate(df_norm, meta, min_len)
+
+    def daily_ohlcv_many(self, symbols: Iterable[str], as_of: Optional[str] = None, min_len: int = 250) -> Tuple[Dict[str, Tuple[pd.DataFrame, Dict[str, Any]]], Dict[str, str]]:
+        """Bulk variant of daily_ohlcv via provider.get_daily_many.
+
+        Returns ({symbol: (df_norm, meta)}, {symbol: error}) so callers keep
+        per-symbol diagnostics while the provider fetches in one batch.
+        """
+        cfg = load_config()
+        syms = list(dict.fromkeys(symbols))
+        raw: Dict[str, Tuple[pd.DataFrame, str]] = {}
+        if not cfg.strict_real_data:
+            for sym in syms:
+                fx = self._from_fixtures(sym)
+                if fx is not None:
+                    raw[sym] = (fx, "fixtures")
+        out: Dict[str, Tuple[pd.DataFrame, Dict[str, Any]]] = {}
+        errors: Dict[str, str] = {}
+        rest = [s for s in syms if s not in raw]
+        cache = get_bar_cache() if rest else None
+        provider = get_provider() if rest else None
+        fetched: set = set()
+        if provider is not None:
+            adjust = self._adjust(provider)
+            if cache is not None:
+                for sym in rest:
+                    hit = cache.get(sym, provider.name, adjust, as_of)
+                    if hit is not None:
+                        out[sym] = self._annotate(hit[0], {**hit[1], "cache": "hit"}, min_len)
+                rest = [s for s in rest if s not in out]
+            if rest:
+                for sym, df in provider.get_daily_many(rest, None, as_of).items():
+                    raw[sym] = (df, f"provider:{provider.name}")
+                    fetched.add(sym)
+        for sym in syms:
+            if sym in out:
+                continue
+            if sym not in raw:
+                errors[sym] = "bars_missing"
+                continue
+            df, source = raw[sym]
+            try:
+                out[sym] = self._finalize(sym, df, {"source": source}, min_len)
+            except Exception as e:  # noqa: BLE001
+                errors[sym] = str(e)
+                continue
+            if cache is not None and sym in fetched:
+                cache.put(sym, provider.name, adjust, as_of, *out[sym])
+        # keep the caller's symbol order
+        return {s: out[s] for s in syms if s in out}, errors
+
     def index_daily(self, symbol: str) -> Tuple[pd.DataFrame, Dict[str, Any]]:
         """Fetch index daily bars via akshare real index API (no synthetic)."""
         try:
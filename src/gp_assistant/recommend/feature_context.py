@@ -0,0 +1,111 @@
+# 简介：单次荐股运行内的特征上下文。每个标的的规范化日线、指标帧与策略形态
+# 只计算一次，在候选生成、策略评估、冠军选择与交易计划之间共享。
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+from .datahub import MarketDataHub
+from ..strategy import library as strat_lib
+from ..strategy.batch import BatchResult, evaluate_strategies
+from ..strategy.indicators import INDICATOR_COLUMNS, compute_indicators
+from ..strategy.panel import compute_indicators_many
+
+
+def default_feature_names(strategy_ids: Optional[Iterable[str]] = None) -> List[str]:
+    """Indicator columns plus every feature declared by the strategies in use."""
+    return list(dict.fromkeys(INDICATOR_COLUMNS + strat_lib.required_features(strategy_ids)))
+
+
+@dataclass
+class FeatureContext:
+    """Run-scoped memo of bars/indicators/setups keyed by symbol.
+
+    Not thread-safe and not meant to outlive one ``agent.run`` call: bars are
+    loaded for ``as_of`` once and every later stage reads the same frames.
+    """
+
+    as_of: Optional[str] = None
+    min_len: int = 250
+    hub: MarketDataHub = field(default_factory=MarketDataHub)
+    feature_names: List[str] = field(default_factory=default_feature_names)
+    bars: Dict[str, Tuple[pd.DataFrame, Dict[str, Any]]] = field(default_factory=dict)
+    features: Dict[str, pd.DataFrame] = field(default_factory=dict)
+    bar_errors: Dict[str, str] = field(default_factory=dict)
+    _setups: Dict[Tuple[str, str], List[Any]] = field(default_factory=dict)
+    _batches: Dict[str, BatchResult] = field(default_factory=dict)
+    _counts: Dict[str, int] = field(default_factory=lambda: {
+        "bars_loaded": 0, "bars_reused": 0, "indicators_computed": 0, "indicators_reused": 0,
+    })
+
+    def load_bars(self, symbols: Iterable[str]) -> Dict[str, Tuple[pd.DataFrame, Dict[str, Any]]]:
+        """Bulk-load bars for symbols not seen yet; returns all requested hits."""
+        syms = [s for s in dict.fromkeys(symbols) if s]
+        todo = [s for s in syms if s not in self.bars and s not in self.bar_errors]
+        if todo:
+            got, errs = self.hub.daily_ohlcv_many(todo, self.as_of, min_len=self.min_len)
+            self.bars.update(got)
+            self.bar_errors.update(errs)
+            self._counts["bars_loaded"] += len(got)
+        self._counts["bars_reused"] += len([s for s in syms if s in self.bars and s not in todo])
+        return {s: self.bars[s] for s in syms if s in self.bars}
+
+    def bars_for(self, symbol: str) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+        hit = self.bars.get(symbol)
+        if hit is not None:
+            self._counts["bars_reused"] += 1
+            return hit
+        hit = self.hub.daily_ohlcv(symbol, self.as_of, min_len=self.min_len)
+        self.bars[symbol] = hit
+        self.bar_errors.pop(symbol, None)
+        self._counts["bars_loaded"] += 1
+        return hit
+
+    def prime_features(self, symbols: Iterable[str]) -> int:
+        """Compute indicators for all loaded symbols in one panel pass.
+
+        Falls back silently: symbols left out are computed per symbol on demand.
+        """
+        todo = {s: self.bars[s][0] for s in dict.fromkeys(symbols) if s in self.bars and s not in self.features}
+        if not todo:
+            return 0
+        try:
+            views = compute_indicators_many(todo, self.feature_names)
+        except Exception:  # noqa: BLE001
+            return 0
+        self.features.update(views)
+        self._counts["indicators_computed"] += len(views)
+        return len(views)
+
+    def features_for(self, symbol: str) -> pd.DataFrame:
+        """Indicator frame for symbol; failures are not cached so callers may retry."""
+        feat = self.features.get(symbol)
+        if feat is not None:
+            self._counts["indicators_reused"] += 1
+            return feat
+        df, _meta = self.bars_for(symbol)
+        feat = compute_indicators(df, self.feature_names)
+        self.features[symbol] = feat
+        self._counts["indicators_computed"] += 1
+        return feat
+
+    def setups_for(self, strategy_id: str, symbol: str, detect: Callable[[pd.DataFrame], List[Any]]) -> List[Any]:
+        key = (str(strategy_id), symbol)
+        if key not in self._setups:
+            self._setups[key] = list(detect(self.features_for(symbol)) or [])
+        return self._setups[key]
+
+    def strategy_batch(self, symbol: str) -> BatchResult:
+        """All registered strategies evaluated once on symbol's feature frame."""
+        hit = self._batches.get(symbol)
+        if hit is None:
+            hit = evaluate_strategies(self.features_for(symbol))
+            self._batches[symbol] = hit
+            for sid, setups in hit.setups.items():
+                self._setups[(sid, symbol)] = setups
+        return hit
+
+    def summary(self) -> Dict[str, Any]:
+        return {**self._counts, "symbols": len(self.bars), "bar_errors": len(self.bar_errors)}
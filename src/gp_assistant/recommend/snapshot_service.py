@@ -0,0 +1,171 @@
+# 简介：后台快照刷新服务（可选，GP_SNAPSHOT_SERVICE=1 启用）。交易时段内按周期拉取
+# 全市场快照并发布不可变版本，请求路径直接读取最新版本而不等待上游网络；
+# 提供订阅接口与兼容 last_snapshot_meta 的陈旧度元数据。
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import threading
+import time
+
+import pandas as pd
+
+from ..core.config import load_config
+from ..core.logging import logger
+from ..providers.factory import get_provider
+from .calendar import seconds_to_session_open, trading_window_now
+
+
+@dataclass(frozen=True)
+class SnapshotPublication:
+    df: pd.DataFrame
+    meta: Dict[str, Any]
+    version: int
+    published_at: float
+
+
+class SnapshotService:
+    """Polls the provider snapshot and publishes immutable versions.
+
+    - in session: refresh every ``interval_sec`` (provider memory cache bypassed)
+    - out of session: refresh every ``idle_interval_sec``, waking early at the
+      next session open (09:30/13:00) so the first in-session version is fresh
+    - readers call ``latest()``/``snapshot()``; they never wait on the network
+    """
+
+    def __init__(self, interval_sec: float = 30.0, idle_interval_sec: float = 1800.0, stale_after_sec: Optional[float] = None):
+        self.interval_sec = max(1.0, float(interval_sec))
+        self.idle_interval_sec = max(self.interval_sec, float(idle_interval_sec))
+        self.stale_after_sec = float(stale_after_sec) if stale_after_sec is not None else 3 * self.interval_sec
+        self._lock = threading.Lock()
+        self._current: Optional[SnapshotPublication] = None
+        self._subscribers: List[Callable[[SnapshotPublication], None]] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_error: Optional[str] = None
+
+    # ---- Lifecycle ------------------------------------------------------------
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="gp-snapshot-refresher", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        th = self._thread
+        if th is not None:
+            th.join(timeout)
+        self._thread = None
+
+    def running(self) -> bool:
+        th = self._thread
+        return th is not None and th.is_alive()
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            self.refresh_once()
+            self._stop.wait(self._next_wait())
+
+    def _next_wait(self, now: Optional[datetime] = None) -> float:
+        if self._current is None or trading_window_now(now).in_session:
+            return self.interval_sec
+        return max(1.0, min(self.idle_interval_sec, seconds_to_session_open(now)))
+
+    # ---- Refresh/publish --------------------------------------------------------
+    def refresh_once(self) -> Optional[SnapshotPublication]:
+        try:
+            provider = get_provider()
+            df = provider.get_spot_snapshot(max_cache_age_sec=0.0)
+            meta = getattr(provider, "last_snapshot_meta", lambda: {})() or {}
+        except Exception as e:  # noqa: BLE001
+            self._last_error = str(e)
+            logger.warning(f"snapshot refresh failed: {e}")
+            return None
+        self._last_error = None
+        return self.publish(df, meta)
+
+    def publish(self, df: pd.DataFrame, meta: Dict[str, Any]) -> SnapshotPublication:
+        with self._lock:
+            version = (self._current.version + 1) if self._current is not None else 1
+            pub = SnapshotPublication(df=df, meta=dict(meta), version=version, published_at=time.time())
+            self._current = pub
+            subs = list(self._subscribers)
+        for fn in subs:
+            try:
+                fn(pub)
+            except Exception:  # noqa: BLE001
+                continue
+        return pub
+
+    def subscribe(self, fn: Callable[[SnapshotPublication], None]) -> Callable[[], None]:
+        """Call fn on every new version; returns an unsubscribe callable."""
+        with self._lock:
+            self._subscribers.append(fn)
+
+        def _unsubscribe() -> None:
+            with self._lock:
+                if fn in self._subscribers:
+                    self._subscribers.remove(fn)
+
+        return _unsubscribe
+
+    # ---- Readers ----------------------------------------------------------------
+    def latest(self) -> Optional[SnapshotPublication]:
+        with self._lock:
+            return self._current
+
+    def meta(self, pub: Optional[SnapshotPublication] = None) -> Dict[str, Any]:
+        """Staleness metadata in the shape of ``last_snapshot_meta``."""
+        pub = pub or self.latest()
+        if pub is None:
+            return {"source": None, "missing": True, "degrade": "no_snapshot_universe_mode", "error": self._last_error, "skipped_routes": []}
+        age = round(time.time() - pub.published_at, 1)
+        out = dict(pub.meta)
+        out["service_version"] = pub.version
+        out["published_age_sec"] = age
+        if trading_window_now().in_session and age > self.stale_after_sec:
+            out["stale"] = True
+            out["stale_reason"] = f"refresher_lag:{age}s"
+            if self._last_error:
+                out["refresh_error"] = self._last_error
+        return out
+
+    def snapshot(self) -> Optional[Tuple[pd.DataFrame, Dict[str, Any]]]:
+        pub = self.latest()
+        if pub is None:
+            return None
+        return pub.df, self.meta(pub)
+
+
+_SERVICE: Optional[SnapshotService] = None
+_SERVICE_LOCK = threading.Lock()
+
+
+def get_snapshot_service() -> SnapshotService:
+    global _SERVICE
+    with _SERVICE_LOCK:
+        if _SERVICE is None:
+            cfg = load_config()
+            _SERVICE = SnapshotService(cfg.snapshot_refresh_sec, cfg.snapshot_idle_refresh_sec)
+        return _SERVICE
+
+
+def start_if_enabled() -> bool:
+    """Start the process-wide refresher when GP_SNAPSHOT_SERVICE=1."""
+    if not load_config().snapshot_service_enabled:
+        return False
+    get_snapshot_service().start()
+    return True
+
+
+def running_snapshot() -> Optional[Tuple[pd.DataFrame, Dict[str, Any]]]:
+    """Latest published snapshot if the refresher is running, else None."""
+    with _SERVICE_LOCK:
+        svc = _SERVICE
+    if svc is None or not svc.running():
+        return None
+    return svc.snapshot()
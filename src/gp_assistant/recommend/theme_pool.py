@@ -5,8 +5,8 @@ from typing import Any, Dict, List, Optional
 
 import pandas as pd
 
+from .concept_index import get_concept_index
 from .datahub import MarketDataHub
-from ..providers.factory import get_provider
 
 
 def build_themes(hub: MarketDataHub, snapshot: Optional[pd.DataFrame] = None) -> List[Dict[str, Any]]:
@@ -24,11 +24,16 @@ def build_themes(hub: MarketDataHub, snapshot: Optional[pd.DataFrame] = None) ->
     if not chg_col:
         return []
     # normalize change
-    import pandas as pd
     df = snap.copy()
     df["chg"] = pd.to_numeric(df[chg_col].astype(str).str.rstrip("% "), errors="coerce")
+    code_col = "代码" if "代码" in cols else ("code" if "code" in cols else None)
+    # 快照缺行业列时由本地成分索引补齐（离线刷新，无网络请求）
+    idx = get_concept_index()
+    if "行业" not in cols and code_col and idx is not None and idx.industries:
+        df["行业"] = idx.industries_for(df[code_col].astype(str).tolist())
+        cols = cols | {"行业"}
     # Industry-aggregated themes
-    if "行业" in cols:
+    if "行业" in cols and df["行业"].notna().any():
         # Aggregate by industry: mean change and sum of amount when available
         if "成交额" in cols:
             g = df.groupby("行业").agg(mean_chg=("chg", "mean"), sum_amt=("成交额", "sum"), count=("chg", "count")).reset_index()
@@ -43,43 +48,23 @@ def build_themes(hub: MarketDataHub, snapshot: Optional[pd.DataFrame] = None) ->
                 "evidence": [f"行业均值涨跌幅 {float(r['mean_chg']):.2f}%", f"样本数 {int(r['count'])}"],
             })
         return themes
-    # 尝试概念板块强度（akshare）
-    try:
-        import akshare as ak  # type: ignore
-        cons_name = ak.stock_board_concept_name_ths()  # type: ignore[attr-defined]
-        if cons_name is not None and len(cons_name) > 0:
-            rank_col = None
-            for c in ("涨跌幅", "涨跌幅(%)", "涨跌", "changePct"):
-                if c in cons_name.columns:
-                    rank_col = c
-                    break
-            import pandas as pd
-            cn = cons_name.copy()
-            if rank_col:
-                try:
-                    cn["_r"] = pd.to_numeric(cn[rank_col].astype(str).str.rstrip("% "), errors="coerce")
-                except Exception:
-                    cn["_r"] = pd.to_numeric(cn[rank_col], errors="coerce")
-                cn = cn.sort_values("_r", ascending=False).head(2)
-            else:
-                cn = cn.head(2)
-            name_col = "板块名称" if "板块名称" in cn.columns else cn.columns[0]
-            out: List[Dict[str, Any]] = []
-            for _, r in cn.iterrows():
-                out.append({
-                    "name": f"概念-{str(r[name_col])}",
-                    "strength": str(float(r.get("_r", 0.0))) if "_r" in r else "",
-                    "evidence": ["来源：概念板块排行"],
-                })
-            return out
-    except Exception:
-        pass
+    # 概念强度：本地概念成分与快照涨跌幅向量化关联
+    if code_col and idx is not None and idx.concepts:
+        strength = idx.concept_strength(df[code_col].astype(str).tolist(), df["chg"].to_numpy()).head(2)
+        if len(strength):
+            return [
+                {
+                    "name": f"概念-{name}",
+                    "strength": f"{float(r['mean']):.2f}%",
+                    "evidence": [f"概念成分均值涨跌幅 {float(r['mean']):.2f}%", f"样本数 {int(r['count'])}"],
+                }
+                for name, r in strength.iterrows()
+            ]
     # fallback: top movers by code (仍是快照真实数据)
-    code_col = "代码" if "代码" in cols else ("code" if "code" in cols else None)
     if not code_col:
         return []
     df2 = df[[code_col, "chg"]].rename(columns={code_col: "code"}).sort_values("chg", ascending=False).head(2)
-    themes: List[Dict[str, Any]] = []
+    themes = []
     for _, r in df2.iterrows():
         themes.append({
             "name": f"强势线索-{r['code']}",
@@ -0,0 +1,151 @@
+# 简介：基于快照的动态股票池引擎。每个快照版本只做一次列解析与 ST/退市、上市日期等
+# 布尔掩码预计算（按帧记忆化），之后的价格区间筛选、argpartition 取成交额前 N 与
+# 主线（行业/概念）限制均为数组运算，无整表拷贝与逐行字符串处理。
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import re
+import threading
+import weakref
+
+import numpy as np
+import pandas as pd
+
+
+# ST/*ST/退 (delisting) names are excluded from every candidate pool
+_EXCLUDED_NAME = "ST|退"
+
+
+def excluded_name(name: Optional[str]) -> bool:
+    """Scalar form of the snapshot ST/delisting name mask."""
+    return bool(name) and re.search(_EXCLUDED_NAME, str(name).upper()) is not None
+
+
+def _pick(cols: Iterable[str], names: Tuple[str, ...]) -> Optional[str]:
+    cols = set(cols)
+    for c in names:
+        if c in cols:
+            return c
+    return None
+
+
+@dataclass(frozen=True)
+class UniverseFrame:
+    """Column arrays of one snapshot plus precomputed exclusion masks."""
+
+    codes: np.ndarray
+    names: Optional[np.ndarray]
+    price: np.ndarray
+    amount: np.ndarray
+    industry: Optional[np.ndarray]
+    excluded: np.ndarray
+    list_date: Optional[np.ndarray]
+    change: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_snapshot(cls, snap: pd.DataFrame) -> "UniverseFrame":
+        code_col = _pick(snap.columns, ("代码", "code"))
+        name_col = _pick(snap.columns, ("名称", "name"))
+        price_col = _pick(snap.columns, ("最新价", "现价", "最新", "close", "收盘"))
+        amount_col = _pick(snap.columns, ("成交额", "amount"))
+        list_col = _pick(snap.columns, ("上市时间", "上市日期", "list_date"))
+        if not code_col or not price_col or not amount_col:
+            raise RuntimeError("snapshot missing required columns: code/price/amount")
+        names = snap[name_col].astype(str) if name_col else None
+        # ST/*ST/退 by name, evaluated once per snapshot
+        excluded = names.str.upper().str.contains(_EXCLUDED_NAME, regex=True).to_numpy(dtype=bool) if names is not None else np.zeros(len(snap), dtype=bool)
+        list_date = None
+        if list_col:
+            try:
+                list_date = pd.to_datetime(snap[list_col], errors="coerce").to_numpy(dtype="datetime64[ns]")
+            except Exception:  # noqa: BLE001
+                list_date = None
+        chg_col = _pick(snap.columns, ("涨跌幅", "涨跌幅(%)", "pct_chg", "涨跌", "changePct"))
+        change = pd.to_numeric(snap[chg_col].astype(str).str.rstrip("% "), errors="coerce").to_numpy(dtype="float64") if chg_col else None
+        industry = None
+        if "行业" in snap.columns:
+            ind = snap["行业"]
+            industry = np.where(ind.notna().to_numpy(), ind.astype(str).to_numpy(dtype=object), None)
+        return cls(
+            codes=snap[code_col].astype(str).to_numpy(dtype=object),
+            names=names.to_numpy(dtype=object) if names is not None else None,
+            price=pd.to_numeric(snap[price_col], errors="coerce").to_numpy(dtype="float64"),
+            amount=pd.to_numeric(snap[amount_col], errors="coerce").to_numpy(dtype="float64"),
+            industry=industry,
+            excluded=excluded,
+            list_date=list_date,
+            change=change,
+        )
+
+    def eligible(self, price_min: float, price_max: float, new_stock_days: int, today: Optional[pd.Timestamp] = None) -> np.ndarray:
+        """Not ST/delisting, price in band and (when dates are known) listed long enough."""
+        with np.errstate(invalid="ignore"):
+            mask = ~self.excluded & (self.price >= price_min) & (self.price <= price_max)
+        if self.list_date is not None:
+            now = np.datetime64((today or pd.Timestamp.today()).normalize().to_datetime64(), "ns")
+            days = (now - self.list_date) / np.timedelta64(1, "D")
+            with np.errstate(invalid="ignore"):
+                mask &= days >= new_stock_days  # unknown list dates are dropped
+        return mask
+
+    def positions(self, codes: Iterable[str]) -> np.ndarray:
+        """Row position of each code (-1 when absent from the snapshot)."""
+        return pd.Index(self.codes.astype(str)).get_indexer([str(c) for c in codes])
+
+    def top_by_amount(self, mask: np.ndarray, n: int) -> np.ndarray:
+        """Row positions of the n largest amounts within mask, descending (ties by position)."""
+        rows = np.flatnonzero(mask)
+        key = np.where(np.isnan(self.amount[rows]), -np.inf, self.amount[rows])
+        if 0 <= n < len(rows):
+            kth = np.partition(key, len(key) - n)[len(key) - n] if n else np.inf
+            above = key > kth
+            tied = np.flatnonzero(key == kth)[: n - int(above.sum())]
+            pick = np.sort(np.concatenate([np.flatnonzero(above), tied]))
+            rows, key = rows[pick], key[pick]
+        order = np.lexsort((rows, -key))
+        return rows[order]
+
+    def restrict_industries(self, rows: np.ndarray, top_n: int) -> Optional[np.ndarray]:
+        """Rows whose industry is among the top_n by summed amount (None without industries)."""
+        if self.industry is None:
+            return None
+        ind = self.industry[rows]
+        known = np.array([x is not None for x in ind], dtype=bool)
+        if not known.any():
+            return None
+        groups, inv = np.unique(ind[known].astype(str), return_inverse=True)
+        sums = np.bincount(inv, weights=np.nan_to_num(self.amount[rows][known]), minlength=len(groups))
+        top = groups[np.lexsort((np.arange(len(groups)), -sums))[: max(1, top_n)]]
+        return rows[known][np.isin(ind[known].astype(str), top)]
+
+    def entries(self, rows: np.ndarray) -> List[Dict[str, Any]]:
+        return [
+            {
+                "code": str(self.codes[i]),
+                "industry": self.industry[i] if self.industry is not None else None,
+                "amount": float(self.amount[i]),
+                "name": str(self.names[i]) if self.names is not None else None,
+            }
+            for i in rows.tolist()
+        ]
+
+
+_FRAMES: Dict[int, Tuple[int, UniverseFrame]] = {}
+_FRAMES_LOCK = threading.Lock()
+
+
+def universe_frame(snap: pd.DataFrame) -> UniverseFrame:
+    """UniverseFrame for a snapshot version, memoized until the frame is collected."""
+    key = id(snap)
+    with _FRAMES_LOCK:
+        hit = _FRAMES.get(key)
+        if hit is not None and hit[0] == len(snap):
+            return hit[1]
+    frame = UniverseFrame.from_snapshot(snap)
+    with _FRAMES_LOCK:
+        fresh = key not in _FRAMES
+        _FRAMES[key] = (len(snap), frame)
+    if fresh:
+        weakref.finalize(snap, _FRAMES.pop, key, None)
+    return frame
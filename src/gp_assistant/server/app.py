@@ -2,6 +2,8 @@
 # 的路由定义与错误处理，作为容器运行的主要 HTTP API 入口。
 from __future__ import annotations
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, HTTPException
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
@@ -10,11 +12,27 @@ from datetime import datetime
 
 from ..core.config import load_config
 from ..core.errors import APIError
+from ..core.http import http_stats
 from ..chat.orchestrator import handle_message
 from ..recommend import agent as rec_agent
+from ..recommend import candidate_gen
+from ..recommend import snapshot_service
+
+
+@asynccontextmanager
+async def _lifespan(_app: FastAPI):  # noqa: ANN202
+    # opt-in background snapshot refresher (GP_SNAPSHOT_SERVICE=1)
+    started = snapshot_service.start_if_enabled()
+    try:
+        yield
+    finally:
+        if started:
+            snapshot_service.get_snapshot_service().stop()
+        # candidate-generation worker processes (GP_CANDIDATE_WORKERS > 1)
+        candidate_gen.shutdown_cpu_pool()
 
 
-app = FastAPI(title="gp_assistant", version="1.0.0")
+app = FastAPI(title="gp_assistant", version="1.0.0", lifespan=_lifespan)
 
 
 class ChatReq(BaseModel):
@@ -58,4 +76,8 @@ def get_health() -> Dict[str, Any]:
     provider = get_provider()
     now = datetime.now().isoformat()
     llm_ready = bool(cfg.llm_base_url and cfg.llm_api_key)
-    return {"status": "ok", "llm_ready": llm_ready, "data_provider": provider.name, "time": now}
+    svc = snapshot_service.running_snapshot()
+    snap = {"running": svc is not None}
+    if svc is not None:
+        snap.update({k: svc[1].get(k) for k in ("service_version", "published_age_sec", "stale")})
+    return {"status": "ok", "llm_ready": llm_ready, "data_provider": provider.name, "http": http_stats(), "snapshot_service": snap, "time": now}
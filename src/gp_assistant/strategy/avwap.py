@@ -0,0 +1,100 @@
+# 简介：锚定 VWAP（AVWAP）引擎。为每根 K 线确定其当前锚点（N 日最低/最高、跳空日、
+# 事件日），再用累计 价格×成交量 / 成交量 之差按下标计算自锚点以来的 VWAP；
+# 全程数组运算，无逐窗口 Python 回调。数组接口与特征内核一样支持 (bar × 列)。
+from __future__ import annotations
+
+from typing import Any, Iterable, Optional
+import re
+
+import numpy as np
+import pandas as pd
+
+from . import kernels as K
+
+
+def rolling_arg_extreme(a: np.ndarray, w: int, sign: float = 1.0) -> np.ndarray:
+    """Absolute row of the first min (sign=1) / max (sign=-1) in the trailing w rows.
+
+    -1 until w rows are available or while the window holds NaN (as ``rolling_min``).
+    """
+    x = K.as_2d(a)
+    out = np.full(x.shape, -1, dtype=np.int64)
+    if x.shape[0] >= w:
+        win = np.lib.stride_tricks.sliding_window_view(sign * x, w, axis=0)
+        pos = np.argmin(np.where(np.isnan(win), np.inf, win), axis=-1)
+        rows = pos + np.arange(x.shape[0] - w + 1).reshape(-1, 1)
+        bad = np.isnan(win).any(axis=-1)
+        out[w - 1:] = np.where(bad, -1, rows)
+    return out.reshape(np.shape(a))
+
+
+def last_true_index(flags: np.ndarray) -> np.ndarray:
+    """Row of the most recent True at or before each row (-1 before the first)."""
+    f = np.asarray(flags, dtype=bool)
+    rows = np.arange(f.shape[0]).reshape((-1,) + (1,) * (f.ndim - 1))
+    return np.maximum.accumulate(np.where(f, rows, -1), axis=0)
+
+
+def vwap_since(price: np.ndarray, volume: np.ndarray, anchor: np.ndarray) -> np.ndarray:
+    """Volume-weighted mean of price over rows [anchor, t] for every row t.
+
+    Uses differences of zero-prefixed cumulative sums; NaN where the anchor is
+    -1 or no volume traded since it.
+    """
+    p, v = K.as_2d(price), K.as_2d(volume)
+    a = K.as_2d(anchor).astype(np.int64)
+    ok = ~(np.isnan(p) | np.isnan(v))
+    zero = np.zeros((1, p.shape[1]))
+    cpv = np.concatenate([zero, np.cumsum(np.where(ok, p * v, 0.0), axis=0)])
+    cv = np.concatenate([zero, np.cumsum(np.where(ok, v, 0.0), axis=0)])
+    start = np.maximum(a, 0)
+    num = cpv[1:] - np.take_along_axis(cpv, start, axis=0)
+    den = cv[1:] - np.take_along_axis(cv, start, axis=0)
+    out = np.where((a >= 0) & (den > 0), num / np.where(den > 0, den, 1.0), np.nan)
+    return out.reshape(np.shape(price))
+
+
+def typical_price(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    return (high + low + close) / 3.0
+
+
+# ---- Frame API --------------------------------------------------------------------
+_EXTREME = re.compile(r"(low|high)(\d+)$")
+
+
+def anchor_index(df: pd.DataFrame, anchor: str = "low20", *, gap_pct: float = 0.02, events: Optional[Any] = None) -> np.ndarray:
+    """Current anchor row for every bar.
+
+    ``anchor``: ``low<N>``/``high<N>`` (bar of the N-day extreme), ``gap``
+    (latest bar whose open gaps at least ``gap_pct`` from the prior close) or
+    ``event`` (latest of ``events``: a boolean mask or iterable of dates).
+    """
+    m = _EXTREME.match(anchor)
+    if m:
+        col, n = m.group(1), int(m.group(2))
+        return rolling_arg_extreme(df[col].to_numpy(dtype="float64"), n, 1.0 if col == "low" else -1.0)
+    if anchor == "gap":
+        o = df["open"].to_numpy(dtype="float64")
+        prev = K.shift(df["close"].to_numpy(dtype="float64"))
+        gap = np.abs(o - prev) / K.guard(prev)
+        return last_true_index(np.nan_to_num(gap, nan=0.0) >= gap_pct)
+    if anchor == "event":
+        return last_true_index(_event_flags(df, events))
+    raise ValueError(f"未知锚点: {anchor}")
+
+
+def _event_flags(df: pd.DataFrame, events: Optional[Any]) -> np.ndarray:
+    if events is None:
+        return np.zeros(len(df), dtype=bool)
+    if isinstance(events, (pd.Series, np.ndarray)) and np.asarray(events).dtype == bool:
+        return np.asarray(events, dtype=bool)
+    many = isinstance(events, Iterable) and not isinstance(events, str)
+    days = pd.to_datetime(pd.Index(list(events) if many else [events])).normalize()
+    return pd.to_datetime(df["date"]).dt.normalize().isin(days).to_numpy()
+
+
+def anchored_vwap(df: pd.DataFrame, anchor: str = "low20", *, gap_pct: float = 0.02, events: Optional[Any] = None) -> pd.Series:
+    """AVWAP of the typical price since each bar's current anchor (see ``anchor_index``)."""
+    price = typical_price(*(df[c].to_numpy(dtype="float64") for c in ("high", "low", "close")))
+    idx = anchor_index(df, anchor, gap_pct=gap_pct, events=events)
+    return pd.Series(vwap_since(price, df["volume"].to_numpy(dtype="float64"), idx), index=df.index, name=f"avwap_{anchor}")
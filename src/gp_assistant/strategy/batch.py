@@ -0,0 +1,65 @@
+# 简介：策略批量评估。对同一特征帧一次性计算所有策略的 signal_mask，形态由掩码派生，
+# 并把全部掩码送入一次多掩码事件研究，避免各策略重复计算同一信号。
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional
+
+import pandas as pd
+
+from .event_study import EventStats, event_study_many
+from .features import with_features
+from . import library as strat_lib
+
+
+@dataclass
+class BatchResult:
+    masks: Dict[str, pd.Series] = field(default_factory=dict)
+    setups: Dict[str, List[Any]] = field(default_factory=dict)
+    events: Dict[str, EventStats] = field(default_factory=dict)
+    errors: Dict[str, str] = field(default_factory=dict)
+
+
+def evaluate_strategies(df_feat: pd.DataFrame, registry: Optional[Mapping[str, Any]] = None) -> BatchResult:
+    """Masks, setups and event stats for every strategy over one feature frame.
+
+    Strategies without ``signal_mask`` fall back to their own
+    ``detect_setups``/``event_study``; failures are recorded per strategy.
+    """
+    reg = dict(registry if registry is not None else strat_lib.REGISTRY)
+    res = BatchResult()
+    df = with_features(df_feat, strat_lib.required_features(reg))
+    legacy: List[str] = []
+    for sid, mod in reg.items():
+        sid = str(sid)
+        fn = getattr(mod, "signal_mask", None)
+        if not callable(fn):
+            legacy.append(sid)
+            continue
+        try:
+            res.masks[sid] = pd.Series(fn(df), index=df.index).fillna(False).astype(bool)
+        except Exception as e:  # noqa: BLE001
+            res.errors[sid] = str(e)
+    try:
+        res.events.update(event_study_many(df, res.masks))
+    except Exception as e:  # noqa: BLE001
+        for sid in res.masks:
+            res.errors.setdefault(sid, str(e))
+    for sid, mask in res.masks.items():
+        mod = reg[sid]
+        try:
+            derive = getattr(mod, "setups_from_mask", None)
+            res.setups[sid] = list(derive(mask) if callable(derive) else mod.detect_setups(df))
+        except Exception as e:  # noqa: BLE001
+            res.errors.setdefault(sid, str(e))
+    for sid in legacy:
+        mod = reg[sid]
+        try:
+            detect = getattr(mod, "detect_setups", None)
+            res.setups[sid] = list(detect(df) or []) if callable(detect) else []
+            ev = getattr(mod, "event_study", None)
+            if callable(ev):
+                res.events[sid] = ev(df, res.setups[sid])
+        except Exception as e:  # noqa: BLE001
+            res.errors[sid] = str(e)
+    return res
@@ -1,11 +1,14 @@
 # 简介：筹码/成本带估算。提供 A/B 两种模型估算平均成本与 90% 带，
-# 并输出置信度等统计，供交易计划参考。
+# 并输出置信度等统计，供交易计划参考。分位数/获利比例/集中度直接由排序后的
+# (价格, 权重) 累积权重计算，不再展开重复数组；另提供逐 K 线的 as-of 模式，
+# 以及对全部滑动窗口一次性向量化求 90% 带下沿的滚动模式。
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Dict, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 import numpy as np
 import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
 
 
 @dataclass
@@ -21,101 +24,130 @@ class ChipResult:
     sample_n: int
 
 
+@dataclass(frozen=True)
+class WeightedPrices:
+    """Sorted (price, weight) pairs with cumulative weights.
+
+    Weights act as repeat counts: for integer weights every query equals the
+    same statistic on ``np.repeat(prices, weights)`` without materializing it.
+    """
+
+    prices: np.ndarray
+    weights: np.ndarray
+    cum: np.ndarray
+
+    @classmethod
+    def build(cls, prices: np.ndarray, weights: np.ndarray) -> "WeightedPrices":
+        p = np.asarray(prices, dtype="float64")
+        w = np.asarray(weights, dtype="float64")
+        order = np.argsort(p, kind="stable")
+        p, w = p[order], w[order]
+        return cls(prices=p, weights=w, cum=np.cumsum(w))
+
+    @property
+    def total(self) -> float:
+        return float(self.cum[-1]) if len(self.cum) else 0.0
+
+    def _at(self, k: np.ndarray) -> np.ndarray:
+        pos = np.searchsorted(self.cum, k, side="right")
+        return self.prices[np.minimum(pos, len(self.prices) - 1)]
+
+    def quantile(self, q: float | np.ndarray) -> np.ndarray | float:
+        """``np.quantile`` (method="linear") of the expanded sample."""
+        qa = np.asarray(q, dtype="float64")
+        virtual = (self.total - 1.0) * qa
+        lo = np.floor(virtual)
+        hi = np.minimum(lo + 1.0, self.total - 1.0)
+        gamma = virtual - lo
+        a, b = self._at(lo), self._at(hi)
+        diff = b - a
+        out = np.where(gamma >= 0.5, b - diff * (1 - gamma), a + diff * gamma)
+        return float(out) if out.ndim == 0 else out
+
+    def mean(self) -> float:
+        return float((self.prices * self.weights).sum() / self.total)
+
+    def share_below(self, x: float) -> float:
+        k = np.searchsorted(self.prices, x, side="left")
+        return float(self.cum[k - 1] / self.total) if k else 0.0
+
+    def share_between(self, lo: float, hi: float) -> float:
+        a = np.searchsorted(self.prices, lo, side="left")
+        b = np.searchsorted(self.prices, hi, side="right")
+        inside = (self.cum[b - 1] if b else 0.0) - (self.cum[a - 1] if a else 0.0)
+        return float(inside / self.total)
+
+
+def _result(dist: WeightedPrices, close: float, model: str, conf: str, avg_cost: Optional[float] = None) -> ChipResult:
+    low, high = (float(v) for v in dist.quantile(np.array([0.05, 0.95])))
+    dist_high_pct = (high - close) / high if high != 0 else 0.0
+    return ChipResult(
+        avg_cost=dist.mean() if avg_cost is None else float(avg_cost),
+        profit_ratio=dist.share_below(close),
+        band_90_low=low,
+        band_90_high=high,
+        concentration_90=dist.share_between(low, high),
+        dist_to_90_high_pct=float(dist_high_pct),
+        confidence=conf,
+        model_used=model,
+        sample_n=int(dist.total),
+    )
+
+
+def _turnover(df: pd.DataFrame, float_shares: float | None) -> Optional[np.ndarray]:
+    if "turnover" in df.columns:
+        return df["turnover"].to_numpy(dtype="float64") / 100.0
+    if float_shares and float_shares > 0:
+        return df["volume"].to_numpy(dtype="float64") / float_shares
+    return None
+
+
+def _model_a_arrays(vwap: np.ndarray, turn: np.ndarray, close: float) -> Optional[ChipResult]:
+    t = np.where(np.isnan(turn), 1.0, np.clip(turn, 0.0, 1.0))
+    if t.sum() <= 0:
+        return None
+    w = t / t.sum()
+    # integer weights keep the legacy 1/1000 repetition granularity for the band
+    # statistics; the average cost uses the continuous turnover weights
+    repeat = np.maximum(1, (w * 1000).astype(int))
+    dist = WeightedPrices.build(vwap, repeat)
+    n = dist.total
+    conf = "high" if n >= 200 else ("medium" if n >= 80 else "low")
+    return _result(dist, close, "A", conf, avg_cost=(vwap * w).sum())
+
+
+_BIN_Q = np.linspace(0.0, 1.0, 51)
+
+
+def _model_b_arrays(vwap: np.ndarray, volume: np.ndarray, close: float) -> ChipResult:
+    # price bins by percentile of vwap; volume accumulated per occupied bin
+    cuts = np.quantile(vwap, _BIN_Q)
+    idx = np.digitize(vwap, cuts, right=True)
+    occupied = np.flatnonzero(np.bincount(idx, minlength=len(cuts) + 1))
+    vol_bin = np.bincount(idx, weights=volume, minlength=len(cuts) + 1)[occupied]
+    prices = cuts[np.clip(occupied, 0, len(cuts) - 1)]
+    rep = np.maximum(1, (vol_bin / max(1.0, float(volume.mean()))).astype(int))
+    dist = WeightedPrices.build(prices, rep)
+    conf = "medium" if dist.total >= 100 else "low"
+    return _result(dist, close, "B", conf)
+
+
 def _model_a(df: pd.DataFrame, float_shares: float | None = None) -> Tuple[ChipResult | None, Dict[str, Any]]:
     meta: Dict[str, Any] = {"model": "A"}
-    x = df.copy()
-    # estimate turnover
-    turn = None
-    if "turnover" in x.columns:
-        turn = x["turnover"].astype(float) / 100.0
-    elif float_shares and float_shares > 0:
-        turn = x["volume"].astype(float) / float_shares
-    else:
+    turn = _turnover(df, float_shares)
+    if turn is None:
         return None, {**meta, "reason": "no_turnover"}
-    vwap = (x["high"] + x["low"] + x["close"]) / 3.0
-    weights = []
-    prices = []
-    w_remain = 0.0
-    for i in range(len(x)):
-        t = max(0.0, min(1.0, float(turn.iloc[i])))
-        persist = (1.0 - t)
-        w_remain = w_remain * persist + t
-        weights.append(t)
-        prices.append(float(vwap.iloc[i]))
-    if sum(weights) <= 0:
+    vwap = ((df["high"] + df["low"] + df["close"]) / 3.0).to_numpy(dtype="float64")
+    res = _model_a_arrays(vwap, turn, float(df["close"].iloc[-1]))
+    if res is None:
         return None, {**meta, "reason": "zero_weights"}
-    prices_arr = np.array(prices)
-    w = np.array(weights)
-    w = w / w.sum()
-    avg_cost = float((prices_arr * w).sum())
-    # 90% band using weighted quantiles (approximate via repetition scale)
-    repeat = np.maximum(1, (w * 1000).astype(int))
-    expanded = np.repeat(prices_arr, repeat)
-    low = float(np.quantile(expanded, 0.05))
-    high = float(np.quantile(expanded, 0.95))
-    close = float(x["close"].iloc[-1])
-    profit_ratio = float((expanded < close).mean())
-    conc = float(np.mean((expanded >= low) & (expanded <= high)))
-    dist_high_pct = (high - close) / high if high != 0 else 0.0
-    conf = "high" if len(expanded) >= 200 else ("medium" if len(expanded) >= 80 else "low")
-    return (
-        ChipResult(
-            avg_cost=avg_cost,
-            profit_ratio=profit_ratio,
-            band_90_low=low,
-            band_90_high=high,
-            concentration_90=conc,
-            dist_to_90_high_pct=float(dist_high_pct),
-            confidence=conf,
-            model_used="A",
-            sample_n=int(len(expanded)),
-        ),
-        meta,
-    )
+    return res, meta
 
 
 def _model_b(df: pd.DataFrame) -> Tuple[ChipResult, Dict[str, Any]]:
-    meta: Dict[str, Any] = {"model": "B"}
-    x = df.copy()
-    vwap = (x["high"] + x["low"] + x["close"]) / 3.0
-    volume = x["volume"].astype(float)
-    # price bins by percentile of vwap
-    q = np.linspace(0.0, 1.0, 51)
-    cuts = np.quantile(vwap, q)
-    idx = np.digitize(vwap, cuts, right=True)
-    # Accumulate volume per bin and expand by basic repetition
-    vol_bin = {}
-    for i, b in enumerate(idx):
-        vol_bin.setdefault(b, 0.0)
-        vol_bin[b] += float(volume.iloc[i])
-    arr = []
-    for b, vol in vol_bin.items():
-        price = float(cuts[min(max(b, 0), len(cuts) - 1)])
-        rep = max(1, int(vol / max(1.0, volume.mean())))
-        arr.extend([price] * rep)
-    expanded = np.array(arr)
-    avg_cost = float(np.mean(expanded)) if len(expanded) else float(vwap.iloc[-1])
-    low = float(np.quantile(expanded, 0.05)) if len(expanded) else float(vwap.min())
-    high = float(np.quantile(expanded, 0.95)) if len(expanded) else float(vwap.max())
-    close = float(x["close"].iloc[-1])
-    profit_ratio = float((expanded < close).mean()) if len(expanded) else 0.5
-    conc = float(np.mean((expanded >= low) & (expanded <= high))) if len(expanded) else 1.0
-    dist_high_pct = (high - close) / high if high != 0 else 0.0
-    conf = "medium" if len(expanded) >= 100 else "low"
-    return (
-        ChipResult(
-            avg_cost=avg_cost,
-            profit_ratio=profit_ratio,
-            band_90_low=low,
-            band_90_high=high,
-            concentration_90=conc,
-            dist_to_90_high_pct=float(dist_high_pct),
-            confidence=conf,
-            model_used="B",
-            sample_n=int(len(expanded)),
-        ),
-        meta,
-    )
+    vwap = ((df["high"] + df["low"] + df["close"]) / 3.0).to_numpy(dtype="float64")
+    volume = df["volume"].to_numpy(dtype="float64")
+    return _model_b_arrays(vwap, volume, float(df["close"].iloc[-1])), {"model": "B"}
 
 
 def compute_chip(df: pd.DataFrame, float_shares: float | None = None) -> Tuple[ChipResult, Dict[str, Any]]:
@@ -124,3 +156,146 @@ def compute_chip(df: pd.DataFrame, float_shares: float | None = None) -> Tuple[C
         return a, meta_a
     b, meta_b = _model_b(df)
     return b, meta_b
+
+
+def compute_chip_asof(df: pd.DataFrame, float_shares: float | None = None, positions: Optional[Iterable[int]] = None) -> pd.DataFrame:
+    """Chip distribution as of each bar: row t equals ``compute_chip(df.iloc[:t+1])``.
+
+    ``positions`` limits the output to those bar positions (default: all).
+    The price order of the prefix is maintained by insertion as bars are
+    added, so no per-bar sort is needed; model A weights are relative to the
+    prefix's total turnover and are rescaled in O(prefix) vectorized work
+    per reported bar (O(n²) overall for all bars, small constants).
+    """
+    vwap = ((df["high"] + df["low"] + df["close"]) / 3.0).to_numpy(dtype="float64")
+    volume = df["volume"].to_numpy(dtype="float64")
+    close = df["close"].to_numpy(dtype="float64")
+    turn = _turnover(df, float_shares)
+    t_all = np.where(np.isnan(turn), 1.0, np.clip(turn, 0.0, 1.0)) if turn is not None else None
+    pos = list(range(len(df))) if positions is None else [int(p) for p in positions]
+    wanted = set(pos)
+    # stable sort order of vwap[:t+1] (NaN last, ties by position), grown one bar at a time
+    order = np.empty(0, dtype=np.int64)
+    sorted_p = np.empty(0, dtype="float64")
+    out: Dict[int, Dict[str, Any]] = {}
+    for t in range(max(pos) + 1 if pos else 0):
+        if t_all is not None:
+            k = int(np.searchsorted(sorted_p, vwap[t], side="right"))
+            order = np.insert(order, k, t)
+            sorted_p = np.insert(sorted_p, k, vwap[t])
+        if t not in wanted:
+            continue
+        end = t + 1
+        res = None
+        if t_all is not None:
+            tt = t_all[:end]
+            total = tt.sum()
+            if total > 0:
+                wt = tt / total
+                repeat = np.maximum(1, (wt * 1000).astype(int))
+                w = repeat[order].astype("float64")
+                dist = WeightedPrices(prices=sorted_p, weights=w, cum=np.cumsum(w))
+                n = dist.total
+                conf = "high" if n >= 200 else ("medium" if n >= 80 else "low")
+                res = _result(dist, close[t], "A", conf, avg_cost=(vwap[:end] * wt).sum())
+        if res is None:
+            res = _model_b_arrays(vwap[:end], volume[:end], close[t])
+        out[t] = res.__dict__
+    rows: List[Dict[str, Any]] = [out[t] for t in pos]
+    return pd.DataFrame(rows, index=df.index[pos] if len(pos) else df.index[:0], columns=list(ChipResult.__dataclass_fields__))
+
+
+# ---- Rolling band (all windows at once) ------------------------------------------
+def _row_lerp(a: np.ndarray, b: np.ndarray, gamma: np.ndarray) -> np.ndarray:
+    diff = b - a
+    return np.where(gamma >= 0.5, b - diff * (1 - gamma), a + diff * gamma)
+
+
+def _row_weighted_quantile(prices: np.ndarray, weights: np.ndarray, q: float) -> np.ndarray:
+    """Row-wise ``WeightedPrices.quantile(q)`` for row-sorted prices."""
+    cum = np.cumsum(weights, axis=1)
+    total = cum[:, -1]
+    virtual = (total - 1.0) * q
+    lo = np.floor(virtual)
+    hi = np.minimum(lo + 1.0, total - 1.0)
+    last = prices.shape[1] - 1
+    pa = np.minimum((cum <= lo[:, None]).sum(axis=1), last)
+    pb = np.minimum((cum <= hi[:, None]).sum(axis=1), last)
+    return _row_lerp(_row_take(prices, pa), _row_take(prices, pb), virtual - lo)
+
+
+def _row_take(a: np.ndarray, idx: np.ndarray) -> np.ndarray:
+    """``a[i, idx[i, ...]]`` for each row i via flat indexing."""
+    base = np.arange(len(a)) * a.shape[1]
+    return a.ravel()[idx + (base if idx.ndim == 1 else base[:, None])]
+
+
+def _windows(x: np.ndarray, width: int, pad: float) -> np.ndarray:
+    return sliding_window_view(np.concatenate([np.full(width - 1, pad), x]), width)
+
+
+def rolling_band_90_low(df: pd.DataFrame, window: int, float_shares: float | None = None) -> np.ndarray:
+    """``band_90_low`` of ``compute_chip(df.iloc[max(0, t-window+1):t+1])`` for every bar t.
+
+    Every trailing window is sorted and queried at once (vectorized, no per-bar
+    Python work); short leading windows are padded and masked out.
+    """
+    n = len(df)
+    if n == 0:
+        return np.empty(0)
+    width = max(1, min(int(window), n))
+    vwap = ((df["high"] + df["low"] + df["close"]) / 3.0).to_numpy(dtype="float64")
+    m = np.minimum(np.arange(1, n + 1), width)
+    # tie order is irrelevant: equal prices give equal quantiles and share one bin
+    win = _windows(vwap, width, np.inf)
+    order = np.argsort(win, axis=1)
+    price = np.take_along_axis(win, order, axis=1)
+    out = np.full(n, np.nan)
+    fallback = np.ones(n, dtype=bool)
+    turn = _turnover(df, float_shares)
+    if turn is not None:
+        t = np.where(np.isnan(turn), 1.0, np.clip(turn, 0.0, 1.0))
+        tw = _windows(t, width, 0.0)
+        total = tw.sum(axis=1)
+        ok = total > 0
+        rep = np.maximum(1, (tw / np.where(ok, total, 1.0)[:, None] * 1000).astype(int))
+        rep[np.arange(width) < (width - m)[:, None]] = 0
+        out[ok] = _row_weighted_quantile(price, np.take_along_axis(rep, order, axis=1).astype("float64"), 0.05)[ok]
+        fallback = ~ok
+    if fallback.any():
+        rows = slice(None) if fallback.all() else np.flatnonzero(fallback)
+        vol = _windows(df["volume"].to_numpy(dtype="float64"), width, 0.0)[rows]
+        vol = np.take_along_axis(vol, order[rows], axis=1)
+        out[rows] = _rolling_model_b_low(price[rows], vol, m[rows])
+    return out
+
+
+def _rolling_model_b_low(price: np.ndarray, vol: np.ndarray, m: np.ndarray) -> np.ndarray:
+    """Model B band low per row from row-sorted prices (inf-padded) and their volumes."""
+    # bin cuts: np.quantile(method="linear") of each row's m valid prices
+    virtual = (m[:, None] - 1) * _BIN_Q[None, :]
+    prev = np.floor(virtual)
+    gamma = virtual - prev
+    prev = np.minimum(prev, (m - 1)[:, None]).astype(np.intp)
+    nxt = np.minimum(prev + 1, (m - 1)[:, None])
+    a, b = _row_take(price, prev), _row_take(price, nxt)
+    cuts = _row_lerp(a, b, gamma)
+    # prices <= each cut (digitize(right=True) bin edges); a <= cut <= b always
+    upto = np.where(cuts >= b, nxt, prev) + 1
+    tied = price[:, 1:] == price[:, :-1]
+    tied &= np.isfinite(price[:, 1:])
+    if tied.any():
+        # extend each edge over its run of equal prices
+        width = price.shape[1]
+        is_last = np.ones(price.shape, dtype=bool)
+        is_last[:, :-1] = ~tied
+        run_end = np.where(is_last, np.arange(width), width)
+        run_end = np.minimum.accumulate(run_end[:, ::-1], axis=1)[:, ::-1]
+        upto = _row_take(run_end, upto - 1) + 1
+    cv = np.cumsum(vol, axis=1)
+    vol_upto = _row_take(cv, upto - 1)
+    count = np.diff(upto, axis=1, prepend=0)
+    vol_bin = np.diff(vol_upto, axis=1, prepend=0.0)
+    mean = cv[:, -1] / m
+    rep = np.where(count > 0, np.maximum(1, (vol_bin / np.maximum(1.0, mean)[:, None]).astype(int)), 0)
+    return _row_weighted_quantile(cuts, rep.astype("float64"), 0.05)
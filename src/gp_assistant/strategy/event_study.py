@@ -1,9 +1,10 @@
 # 简介：事件研究。基于给定掩码统计事件前后窗口的收益/胜率/回撤等，
-# 为策略解释与打分提供统计参考。
+# 为策略解释与打分提供统计参考；前向收益引擎按数组运算，可一次处理多个掩码。
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, List
+from typing import Any, Dict, List, Mapping, Sequence, Tuple
+import numpy as np
 import pandas as pd
 
 
@@ -20,44 +21,123 @@ class EventStats:
     sample_warning: bool
 
 
-def _forward_metrics(df: pd.DataFrame, idxs: List[int]) -> EventStats:
-    f2, f5, f10 = [], [], []
-    mdds = []
-    for i in idxs:
-        if i + 1 >= len(df):
-            continue
-        entry = float(df.loc[i + 1, "close"])  # next-day close
-        # horizon limited by data length
-        t2 = i + 2
-        t5 = i + 5
-        t10 = i + 10
-        if t2 < len(df):
-            f2.append(float(df.loc[t2, "close"]) / entry - 1.0)
-        if t5 < len(df):
-            f5.append(float(df.loc[t5, "close"]) / entry - 1.0)
-        if t10 < len(df):
-            f10.append(float(df.loc[t10, "close"]) / entry - 1.0)
-        # MDD proxy within 10d
-        tN = min(len(df) - 1, i + 10)
-        window = df.loc[i + 1 : tN, "close"].astype(float)
-        mdd = float((window / entry).min() - 1.0)
-        mdds.append(mdd)
-    k = min(len(f2), len(f5), len(f10))
-    def wr(a: List[float]) -> float:
-        return float(sum(1 for x in a if x > 0) / len(a)) if a else 0.0
+@dataclass
+class ForwardStats:
+    """Per-mask forward statistics; arrays are (masks,) or (masks, horizons)."""
+
+    horizons: Tuple[int, ...]
+    events: np.ndarray
+    counts: np.ndarray
+    win_rate: np.ndarray
+    mean_return: np.ndarray
+    mdd_mean: np.ndarray
+
+    @property
+    def k(self) -> np.ndarray:
+        """Events with every horizon observable (0 when no horizons)."""
+        if not self.horizons:
+            return np.zeros(len(self.events), dtype=int)
+        return self.counts.min(axis=1)
+
+    def column(self, h: int) -> int:
+        return self.horizons.index(h)
+
+
+def forward_min(close: np.ndarray, bars: int) -> np.ndarray:
+    """``min(close[t : t+bars])`` per t, truncated at the end; NaN closes are skipped."""
+    n = len(close)
+    x = np.where(np.isnan(close), np.inf, close)
+    padded = np.concatenate([x, np.full(max(bars - 1, 0), np.inf)])
+    out = np.lib.stride_tricks.sliding_window_view(padded, bars).min(axis=-1)[:n]
+    return np.where(np.isinf(out), np.nan, out)
+
+
+def forward_stats(
+    close: np.ndarray,
+    masks: np.ndarray,
+    horizons: Sequence[int] = (2, 5, 10),
+    *,
+    anchor: str = "event",
+    mdd_bars: int = 10,
+    mdd_min_bars: int = 1,
+) -> ForwardStats:
+    """Forward returns from next-bar entry for a batch of event masks at once.
+
+    - entry is ``close[i+1]`` for an event at bar i
+    - horizon h exits at ``i+h`` (anchor="event") or ``i+1+h`` (anchor="entry")
+    - MDD proxy: min of ``close[i+1 : i+1+mdd_bars]`` over entry, minus 1;
+      events need at least ``mdd_min_bars`` bars from entry to the end
+    """
+    close = np.asarray(close, dtype="float64")
+    m = np.atleast_2d(np.asarray(masks, dtype=bool))
+    n = len(close)
+    hs = tuple(int(h) for h in horizons)
+    idx = np.arange(n)
+    entry_ok = idx + 1 < n
+    entry = np.full(n, np.nan)
+    entry[:-1] = close[1:]
+    ev = m & entry_ok
+    with np.errstate(invalid="ignore", divide="ignore"):
+        counts = np.zeros((m.shape[0], len(hs)), dtype=int)
+        wins = np.zeros((m.shape[0], len(hs)))
+        means = np.zeros((m.shape[0], len(hs)))
+        for j, h in enumerate(hs):
+            lag = h if anchor == "event" else h + 1
+            ret = np.full(n, np.nan)
+            if lag < n:
+                ret[: n - lag] = close[lag:] / entry[: n - lag] - 1.0
+            obs = ev & (idx + lag < n)
+            counts[:, j] = obs.sum(axis=1)
+            wins[:, j] = (obs & (ret > 0)).sum(axis=1)
+            finite = obs & ~np.isnan(ret)
+            nf = finite.sum(axis=1)
+            means[:, j] = np.where(nf > 0, np.where(finite, ret, 0.0).sum(axis=1) / np.maximum(nf, 1), 0.0)
+        win_rate = np.where(counts > 0, wins / np.maximum(counts, 1), 0.0)
+        mdd = np.full(n, np.nan)
+        mdd[:-1] = forward_min(close, mdd_bars)[1:] / entry[:-1] - 1.0
+        mdd_ev = ev & (n - (idx + 1) >= mdd_min_bars) & ~np.isnan(mdd)
+        nm = mdd_ev.sum(axis=1)
+        mdd_mean = np.where(nm > 0, np.where(mdd_ev, mdd, 0.0).sum(axis=1) / np.maximum(nm, 1), 0.0)
+    return ForwardStats(horizons=hs, events=ev.sum(axis=1), counts=counts, win_rate=win_rate, mean_return=means, mdd_mean=mdd_mean)
+
+
+def _to_event_stats(fs: ForwardStats, row: int = 0) -> EventStats:
+    k = int(fs.k[row])
     return EventStats(
         k=k,
-        win_rate_2=wr(f2),
-        win_rate_5=wr(f5),
-        win_rate_10=wr(f10),
-        mean_return_2=float(pd.Series(f2).mean() if f2 else 0.0),
-        mean_return_5=float(pd.Series(f5).mean() if f5 else 0.0),
-        mean_return_10=float(pd.Series(f10).mean() if f10 else 0.0),
-        mdd10_proxy=float(pd.Series(mdds).mean() if mdds else 0.0),
+        win_rate_2=float(fs.win_rate[row, 0]),
+        win_rate_5=float(fs.win_rate[row, 1]),
+        win_rate_10=float(fs.win_rate[row, 2]),
+        mean_return_2=float(fs.mean_return[row, 0]),
+        mean_return_5=float(fs.mean_return[row, 1]),
+        mean_return_10=float(fs.mean_return[row, 2]),
+        mdd10_proxy=float(fs.mdd_mean[row]),
         sample_warning=bool(k < 5),
     )
 
 
+def _mask_array(df: pd.DataFrame, mask: Any) -> np.ndarray:
+    if isinstance(mask, pd.Series):
+        mask = mask.reindex(df.index).fillna(False)
+    return np.asarray(mask, dtype=bool)
+
+
+def _forward_metrics(df: pd.DataFrame, idxs: List[int]) -> EventStats:
+    mask = np.zeros(len(df), dtype=bool)
+    pos = [i for i in idxs if 0 <= i < len(df)]
+    mask[pos] = True
+    return _to_event_stats(forward_stats(df["close"].to_numpy(dtype="float64"), mask))
+
+
 def event_study_from_mask(df_feat: pd.DataFrame, mask: pd.Series) -> EventStats:
-    idxs = list(df_feat.index[mask.fillna(False)])
-    return _forward_metrics(df_feat, idxs)
+    return _to_event_stats(forward_stats(df_feat["close"].to_numpy(dtype="float64"), _mask_array(df_feat, mask)))
+
+
+def event_study_many(df_feat: pd.DataFrame, masks: Mapping[str, Any]) -> Dict[str, EventStats]:
+    """One pass over the close array for many strategies' masks."""
+    if not masks:
+        return {}
+    keys = list(masks)
+    block = np.vstack([_mask_array(df_feat, masks[k]) for k in keys])
+    fs = forward_stats(df_feat["close"].to_numpy(dtype="float64"), block)
+    return {k: _to_event_stats(fs, r) for r, k in enumerate(keys)}
@@ -0,0 +1,255 @@
+# 简介：声明式特征注册表。每个特征声明输入列/依赖特征与窗口长度，按需只计算被请求的
+# 特征及其依赖，并按帧做记忆化；单标的、排名/选池与面板路径共用同一定义，数值逐位一致。
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+import re
+import threading
+import weakref
+
+import numpy as np
+import pandas as pd
+
+from . import kernels as K
+from . import avwap as AV
+
+
+RAW_COLUMNS = ("open", "high", "low", "close", "volume", "amount")
+
+
+@dataclass(frozen=True)
+class Feature:
+    """``fn(*inputs)`` maps (bar × symbol) arrays to one (bar × symbol) array.
+
+    ``inputs`` are raw columns or other feature names; ``window`` is the number
+    of bars this step looks back on top of its inputs.
+    """
+
+    name: str
+    inputs: Tuple[str, ...]
+    window: int
+    fn: Callable[..., np.ndarray]
+
+
+_REGISTRY: Dict[str, Feature] = {}
+_FAMILIES: List[Tuple["re.Pattern[str]", Callable[[int], Feature]]] = []
+
+
+def register(feature: Feature) -> Feature:
+    _REGISTRY[feature.name] = feature
+    return feature
+
+
+def family(pattern: str) -> Callable[[Callable[[int], Feature]], Callable[[int], Feature]]:
+    """Register a parametric feature, e.g. ``ma(\\d+)`` -> ``ma20``."""
+    rx = re.compile(pattern + r"$")
+
+    def deco(factory: Callable[[int], Feature]) -> Callable[[int], Feature]:
+        _FAMILIES.append((rx, factory))
+        return factory
+
+    return deco
+
+
+def resolve(name: str) -> Feature:
+    hit = _REGISTRY.get(name)
+    if hit is not None:
+        return hit
+    for rx, factory in _FAMILIES:
+        m = rx.match(name)
+        if m:
+            return register(factory(int(m.group(1))))
+    raise ValueError(f"未知特征: {name}")
+
+
+def lookback(names: Iterable[str]) -> int:
+    """Bars needed before the first fully-defined value of every named feature."""
+    memo: Dict[str, int] = {}
+
+    def need(n: str) -> int:
+        if n in RAW_COLUMNS:
+            return 1
+        if n not in memo:
+            f = resolve(n)
+            memo[n] = f.window + max([need(i) for i in f.inputs] + [1]) - 1
+        return memo[n]
+
+    return max([need(n) for n in names] + [0])
+
+
+# ---- Definitions -----------------------------------------------------------------
+def _ratio_change(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    return (a - b) / K.guard(b)
+
+
+@family(r"ma(\d+)")
+def _ma(n: int) -> Feature:
+    return Feature(f"ma{n}", ("close",), n, lambda c: K.rolling_mean(c, n))
+
+
+@family(r"bias(\d+)")
+def _bias(n: int) -> Feature:
+    return Feature(f"bias{n}", ("close", f"ma{n}"), 1, _ratio_change)
+
+
+@family(r"rsi(\d+)")
+def _rsi(n: int) -> Feature:
+    def fn(c: np.ndarray) -> np.ndarray:
+        delta = c - K.shift(c)
+        gain = np.where(np.isnan(delta), np.nan, np.maximum(delta, 0.0))
+        loss = np.where(np.isnan(delta), np.nan, -np.minimum(delta, 0.0))
+        g, lo = K.wilder_rma(gain, n), K.wilder_rma(loss, n)
+        rs = g / K.guard(lo)
+        # flat window (no gains, no losses): undefined, not oversold
+        return np.where((g == 0) & (lo == 0), np.nan, 100.0 - (100.0 / (1.0 + rs)))
+
+    return Feature(f"rsi{n}", ("close",), n + 1, fn)
+
+
+@family(r"atr(\d+)")
+def _atr(n: int) -> Feature:
+    return Feature(f"atr{n}", ("tr",), n, lambda tr: K.wilder_rma(tr, n))
+
+
+@family(r"atr_pct(\d+)")
+def _atr_pct(n: int) -> Feature:
+    return Feature(f"atr_pct{n}", (f"atr{n}", "close"), 1, lambda atr, c: atr / K.guard(c))
+
+
+@family(r"bbwidth(\d+)")
+def _bbwidth(n: int) -> Feature:
+    def fn(c: np.ndarray, mid: np.ndarray) -> np.ndarray:
+        std = K.rolling_std(c, n)
+        upper, lower = mid + 2 * std, mid - 2 * std
+        return (upper - lower) / K.guard(mid)
+
+    return Feature(f"bbwidth{n}", ("close", f"ma{n}"), n, fn)
+
+
+@family(r"volratio(\d+)")
+def _volratio(n: int) -> Feature:
+    return Feature(f"volratio{n}", ("volume",), n, lambda v: v / K.guard(K.rolling_mean(v, n)))
+
+
+@family(r"amount_(\d+)d_avg")
+def _amount_avg(n: int) -> Feature:
+    return Feature(f"amount_{n}d_avg", ("amount",), n, lambda a: K.rolling_mean(a, n))
+
+
+@family(r"low(\d+)")
+def _low_n(n: int) -> Feature:
+    return Feature(f"low{n}", ("low",), n, lambda x: K.rolling_min(x, n))
+
+
+@family(r"high(\d+)")
+def _high_n(n: int) -> Feature:
+    return Feature(f"high{n}", ("high",), n, lambda x: K.rolling_max(x, n))
+
+
+@family(r"avwap_low(\d+)")
+def _avwap_low(n: int) -> Feature:
+    return Feature(f"avwap_low{n}", ("high", "low", "close", "volume"), n,
+                   lambda h, lo, c, v: AV.vwap_since(AV.typical_price(h, lo, c), v, AV.rolling_arg_extreme(lo, n, 1.0)))
+
+
+@family(r"avwap_high(\d+)")
+def _avwap_high(n: int) -> Feature:
+    return Feature(f"avwap_high{n}", ("high", "low", "close", "volume"), n,
+                   lambda h, lo, c, v: AV.vwap_since(AV.typical_price(h, lo, c), v, AV.rolling_arg_extreme(h, n, -1.0)))
+
+
+register(Feature("tr", ("high", "low", "close"), 2, K.true_range))
+register(Feature("slope20", ("ma20",), 6, lambda ma: _ratio_change(ma, K.shift(ma, 5))))
+register(Feature("bias6_cross_up", ("bias6", "bias12"), 2,
+                 lambda b6, b12: (K.shift(b6) <= K.shift(b12)) & (b6 > b12)))
+register(Feature("bias6_cross_down", ("bias6", "bias12"), 2,
+                 lambda b6, b12: (K.shift(b6) >= K.shift(b12)) & (b6 < b12)))
+# simplified divergence proxy: bias diff widening
+register(Feature("divergence20", ("bias6", "bias12"), 20, lambda b6, b12: K.rolling_mean(b6 - b12, 20) > 0))
+register(Feature("nr7", ("tr",), 7, lambda tr: tr == K.rolling_min(tr, 7)))
+register(Feature("atr_pct", ("atr14", "close"), 1, lambda atr, c: atr / K.guard(c)))
+# point-in-time squeeze threshold: 20th percentile of bbwidth20 over the last 60 bars
+register(Feature("bbwidth20_q20", ("bbwidth20",), 60, lambda b: K.rolling_quantile(b, 60, 0.2)))
+register(Feature("gap_pct", ("open", "close"), 2, lambda o, c: _ratio_change(o, K.shift(c))))
+
+
+# ---- Evaluation --------------------------------------------------------------------
+def evaluate(source: Callable[[str], Optional[np.ndarray]], names: Sequence[str], memo: Optional[Dict[str, np.ndarray]] = None) -> Dict[str, np.ndarray]:
+    """Compute ``names`` (plus their dependencies only) from raw 2-D arrays.
+
+    ``source(col)`` returns a raw column or None; results and intermediate
+    features are stored in ``memo`` so later calls reuse them.
+    """
+    memo = {} if memo is None else memo
+
+    def get(n: str) -> np.ndarray:
+        hit = memo.get(n)
+        if hit is not None:
+            return hit
+        if n in RAW_COLUMNS:
+            raw = source(n)
+            if raw is None:
+                raise ValueError(f"缺少必要列: {n}")
+            memo[n] = raw
+            return raw
+        f = resolve(n)
+        out = f.fn(*[get(i) for i in f.inputs])
+        memo[n] = out
+        return out
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return {n: get(n) for n in names}
+
+
+_MEMO: Dict[int, Tuple[int, Dict[str, np.ndarray]]] = {}
+_MEMO_LOCK = threading.Lock()
+
+
+def feature_memo(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """Per-frame memo, dropped when the frame is garbage collected.
+
+    Frames are treated as immutable (pandas Copy-on-Write); a length change
+    resets the memo.
+    """
+    key = id(df)
+    with _MEMO_LOCK:
+        hit = _MEMO.get(key)
+        if hit is not None and hit[0] == len(df):
+            return hit[1]
+        fresh = hit is None
+        memo: Dict[str, np.ndarray] = {}
+        _MEMO[key] = (len(df), memo)
+    if fresh:
+        weakref.finalize(df, _MEMO.pop, key, None)
+    return memo
+
+
+def _frame_source(df: pd.DataFrame) -> Callable[[str], Optional[np.ndarray]]:
+    def source(col: str) -> Optional[np.ndarray]:
+        if col not in df.columns:
+            return None
+        return K.as_2d(pd.to_numeric(df[col], errors="coerce").to_numpy(dtype="float64"))
+
+    return source
+
+
+def compute_features(df: pd.DataFrame, names: Sequence[str]) -> Dict[str, np.ndarray]:
+    """1-D arrays for ``names`` over df's rows, memoized on df."""
+    got = evaluate(_frame_source(df), list(names), feature_memo(df))
+    return {n: a[:, 0] for n, a in got.items()}
+
+
+def with_features(df: pd.DataFrame, names: Sequence[str]) -> pd.DataFrame:
+    """df plus any of ``names`` it lacks as columns (df itself when none are missing)."""
+    missing = [n for n in dict.fromkeys(names) if n not in df.columns]
+    if not missing:
+        return df
+    cols = compute_features(df, missing)
+    return df.assign(**{n: cols[n] for n in missing})
+
+
+def assign_features(df: pd.DataFrame, columns: Mapping[str, str]) -> pd.DataFrame:
+    """df with ``{column: feature}`` assigned in order, overwriting existing columns."""
+    cols = compute_features(df, list(dict.fromkeys(columns.values())))
+    return df.assign(**{c: cols[f] for c, f in columns.items()})
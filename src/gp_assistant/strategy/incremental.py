@@ -0,0 +1,272 @@
+# 简介：增量指标状态。每个标的保存滚动和/环形缓冲、EWM 状态与前收盘，新增一根 K 线
+# 以 O(1) 更新全部指标列；状态可序列化为 JSON，在多次运行之间持久化。
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional
+import json
+import math
+import os
+
+import pandas as pd
+
+from ..core.paths import store_dir
+from .indicators import INDICATOR_COLUMNS, ensure_amount
+from .kernels import GUARD_EPS
+
+
+_NAN = float("nan")
+_MA_WINDOWS = (5, 6, 10, 12, 20, 24, 60)
+
+
+def _isnan(x: float) -> bool:
+    return x != x
+
+
+def _guard(x: float) -> float:
+    return GUARD_EPS if x == 0 else x
+
+
+def _ewm(y: float, x: float, n: int) -> float:
+    """One ``ewm(alpha=1/n, adjust=False)`` step; leading NaNs are skipped."""
+    if _isnan(x):
+        return y
+    if _isnan(y):
+        return x
+    alpha = 1.0 / float(n)
+    return (1.0 - alpha) * y + alpha * x
+
+
+class RollingWindow:
+    """Fixed-size ring buffer with a running sum.
+
+    Values are "defined" (pandas ``min_periods=w``) once w values were pushed
+    and none of the last w is NaN. The sum is re-derived from the buffer each
+    time the ring wraps, so float drift stays bounded on long streams.
+    """
+
+    __slots__ = ("w", "buf", "pos", "count", "total", "nans")
+
+    def __init__(self, w: int) -> None:
+        self.w = int(w)
+        self.buf: List[float] = [_NAN] * self.w
+        self.pos = 0
+        self.count = 0
+        self.total = 0.0
+        self.nans = 0
+
+    def push(self, x: float) -> None:
+        if self.count >= self.w:
+            old = self.buf[self.pos]
+            if _isnan(old):
+                self.nans -= 1
+            else:
+                self.total -= old
+        if _isnan(x):
+            self.nans += 1
+        else:
+            self.total += x
+        self.buf[self.pos] = x
+        self.pos = (self.pos + 1) % self.w
+        self.count += 1
+        if self.pos == 0:
+            self.total = sum(v for v in self.buf if not _isnan(v))
+
+    def ready(self) -> bool:
+        return self.count >= self.w and self.nans == 0
+
+    def mean(self) -> float:
+        return self.total / float(self.w) if self.ready() else _NAN
+
+    def min(self) -> float:
+        return min(self.buf) if self.ready() else _NAN
+
+    def ago(self, k: int) -> float:
+        """Value pushed k bars before the latest one (NaN if not held)."""
+        if k >= min(self.count, self.w):
+            return _NAN
+        return self.buf[(self.pos - 1 - k) % self.w]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"w": self.w, "buf": list(self.buf), "pos": self.pos, "count": self.count, "total": self.total, "nans": self.nans}
+
+    @classmethod
+    def from_dict(cls, d: Mapping[str, Any]) -> "RollingWindow":
+        win = cls(int(d["w"]))
+        win.buf = [float(v) for v in d["buf"]]
+        win.pos = int(d["pos"])
+        win.count = int(d["count"])
+        win.total = float(d["total"])
+        win.nans = int(d["nans"])
+        return win
+
+
+def _windows() -> Dict[str, RollingWindow]:
+    wins = {f"close{w}": RollingWindow(w) for w in _MA_WINDOWS}
+    wins.update({
+        "ma20": RollingWindow(6),  # slope20 needs ma20 five bars back
+        "dev": RollingWindow(20),  # close - ref, for bbwidth20
+        "dev2": RollingWindow(20),
+        "bias_diff": RollingWindow(20),
+        "tr": RollingWindow(7),
+        "volume": RollingWindow(10),
+        "amount": RollingWindow(5),
+    })
+    return wins
+
+
+@dataclass
+class IndicatorState:
+    """Streaming equivalent of ``compute_indicators`` for one symbol.
+
+    ``update`` consumes one bar and returns that bar's ``INDICATOR_COLUMNS``
+    row in O(1); numbers match the batch registry up to float rounding.
+    """
+
+    bars: int = 0
+    last_date: Optional[str] = None
+    prev_close: float = _NAN
+    ref: float = _NAN
+    rsi_gain: float = _NAN
+    rsi_loss: float = _NAN
+    atr: float = _NAN
+    prev_bias6: float = _NAN
+    prev_bias12: float = _NAN
+    windows: Dict[str, RollingWindow] = field(default_factory=_windows)
+    last: Dict[str, Any] = field(default_factory=dict)
+
+    def update(self, bar: Mapping[str, Any]) -> Dict[str, Any]:
+        """Append one bar (open/high/low/close/volume[/amount][/date]).
+
+        Bars whose date is not after ``last_date`` are ignored so a refresh
+        job can be re-run safely.
+        """
+        date = bar.get("date")
+        if date is not None and self.last_date is not None and str(pd.Timestamp(date).date()) <= self.last_date:
+            return self.last
+        o, h, l, c = (float(bar[k]) for k in ("open", "high", "low", "close"))
+        v = float(bar["volume"])
+        amt = bar.get("amount")
+        amt = _NAN if amt is None else float(amt)
+        if _isnan(amt):
+            amt = (h + l + c) / 3.0 * v
+        w = self.windows
+        prev = self.prev_close
+        if _isnan(self.ref):
+            self.ref = c
+        out: Dict[str, Any] = {}
+
+        for n in _MA_WINDOWS:
+            w[f"close{n}"].push(c)
+            out[f"ma{n}"] = w[f"close{n}"].mean()
+        ma20 = out["ma20"]
+        w["ma20"].push(ma20)
+        ma20_5 = w["ma20"].ago(5)
+        out["slope20"] = (ma20 - ma20_5) / _guard(ma20_5)
+        for n in (6, 12, 24):
+            ma = out[f"ma{n}"]
+            out[f"bias{n}"] = (c - ma) / _guard(ma)
+        b6, b12 = out["bias6"], out["bias12"]
+        out["bias6_cross_up"] = bool(self.prev_bias6 <= self.prev_bias12 and b6 > b12)
+        out["bias6_cross_down"] = bool(self.prev_bias6 >= self.prev_bias12 and b6 < b12)
+        w["bias_diff"].push(b6 - b12)
+        out["divergence20"] = bool(w["bias_diff"].mean() > 0)
+
+        delta = c - prev
+        self.rsi_gain = _ewm(self.rsi_gain, _NAN if _isnan(delta) else max(delta, 0.0), 2)
+        self.rsi_loss = _ewm(self.rsi_loss, _NAN if _isnan(delta) else -min(delta, 0.0), 2)
+        rs = self.rsi_gain / _guard(self.rsi_loss)
+        flat = self.rsi_gain == 0 and self.rsi_loss == 0
+        out["rsi2"] = _NAN if flat else 100.0 - (100.0 / (1.0 + rs))
+
+        d = c - self.ref
+        w["dev"].push(d)
+        w["dev2"].push(d * d)
+        m1, m2 = w["dev"].mean(), w["dev2"].mean()
+        std = math.sqrt(max(m2 - m1 * m1, 0.0)) if not (_isnan(m1) or _isnan(m2)) else _NAN
+        upper, lower = ma20 + 2 * std, ma20 - 2 * std
+        out["bbwidth20"] = (upper - lower) / _guard(ma20)
+
+        tr = abs(h - l) if _isnan(prev) else max(abs(h - l), abs(h - prev), abs(l - prev))
+        w["tr"].push(tr)
+        out["nr7"] = bool(tr == w["tr"].min())
+        w["volume"].push(v)
+        out["volratio10"] = v / _guard(w["volume"].mean())
+        self.atr = _ewm(self.atr, tr, 14)
+        out["atr14"] = self.atr
+        out["atr_pct"] = self.atr / _guard(c)
+        out["gap_pct"] = (o - prev) / _guard(prev)
+        w["amount"].push(amt)
+        out["amount_5d_avg"] = w["amount"].mean()
+
+        self.prev_close = c
+        self.prev_bias6, self.prev_bias12 = b6, b12
+        self.bars += 1
+        if date is not None:
+            self.last_date = str(pd.Timestamp(date).date())
+        self.last = {k: out[k] for k in INDICATOR_COLUMNS}
+        return self.last
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "IndicatorState":
+        """Warm a state by replaying a normalized daily frame once."""
+        state = cls()
+        x, _ = ensure_amount(df)
+        cols = [c for c in ("date", "open", "high", "low", "close", "volume", "amount") if c in x.columns]
+        for rec in x[cols].to_dict("records"):
+            state.update(rec)
+        return state
+
+    # ---- Serialization --------------------------------------------------------
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "bars": self.bars, "last_date": self.last_date, "prev_close": self.prev_close, "ref": self.ref,
+            "rsi_gain": self.rsi_gain, "rsi_loss": self.rsi_loss, "atr": self.atr,
+            "prev_bias6": self.prev_bias6, "prev_bias12": self.prev_bias12,
+            "windows": {k: w.to_dict() for k, w in self.windows.items()},
+            "last": dict(self.last),
+        }
+
+    @classmethod
+    def from_dict(cls, d: Mapping[str, Any]) -> "IndicatorState":
+        state = cls(
+            bars=int(d["bars"]), last_date=d.get("last_date"),
+            **{k: float(d[k]) for k in ("prev_close", "ref", "rsi_gain", "rsi_loss", "atr", "prev_bias6", "prev_bias12")},
+        )
+        state.windows = {k: RollingWindow.from_dict(w) for k, w in d["windows"].items()}
+        state.last = dict(d.get("last") or {})
+        return state
+
+
+def update_many(states: Dict[str, IndicatorState], bars: Mapping[str, Mapping[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Post-close refresh: one O(1) update per symbol with its new bar."""
+    out: Dict[str, Dict[str, Any]] = {}
+    for sym, bar in bars.items():
+        st = states.get(sym)
+        if st is None:
+            continue
+        out[sym] = st.update(bar)
+    return out
+
+
+def default_state_path() -> Path:
+    return store_dir() / "state" / "indicator_state.json"
+
+
+def save_states(states: Mapping[str, IndicatorState], path: Optional[Path] = None) -> Path:
+    fp = path or default_state_path()
+    fp.parent.mkdir(parents=True, exist_ok=True)
+    tmp = fp.parent / f".{fp.name}.tmp"
+    tmp.write_text(json.dumps({s: st.to_dict() for s, st in states.items()}), encoding="utf-8")
+    os.replace(tmp, fp)
+    return fp
+
+
+def load_states(path: Optional[Path] = None) -> Dict[str, IndicatorState]:
+    fp = path or default_state_path()
+    try:
+        raw = json.loads(fp.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return {s: IndicatorState.from_dict(d) for s, d in raw.items()}
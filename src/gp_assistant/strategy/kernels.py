@@ -0,0 +1,279 @@
+# 简介：指标数组内核。以 (bar × 列) 二维 float 数组为输入（axis 0 为时间，NaN 表示无数据），
+# 单标的与横截面面板共用同一实现，保证两条路径逐位一致。安装 numba 时 Wilder RMA 与
+# 滚动极值（单调队列）走 JIT 编译版本；否则滚动极值用分块前缀/后缀极值（van Herk/Gil-Werman，
+# 与窗口长度无关的 O(T)），滚动分位数用 bisect 维护的有序窗口列表，其余使用纯 NumPy 实现。
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+from typing import Callable
+
+import numpy as np
+
+try:  # optional accelerator
+    import numba as _numba
+except Exception:  # noqa: BLE001
+    _numba = None
+
+HAS_NUMBA = _numba is not None
+
+
+def _jit(fn: Callable) -> Callable:
+    return _numba.njit(cache=True, nogil=True)(fn) if _numba is not None else fn
+
+
+# division guard shared by every ratio feature (matches tools.signals historically)
+GUARD_EPS = 1e-12
+
+
+def as_2d(a: np.ndarray) -> np.ndarray:
+    a = np.asarray(a, dtype="float64")
+    return a.reshape(-1, 1) if a.ndim == 1 else a
+
+
+def guard(a: np.ndarray) -> np.ndarray:
+    """Mirror ``Series.replace(0, 1e-12)`` used as a division guard."""
+    return np.where(a == 0, GUARD_EPS, a)
+
+
+def shift(a: np.ndarray, n: int = 1) -> np.ndarray:
+    out = np.full(a.shape, np.nan)
+    if n < a.shape[0]:
+        out[n:] = a[:-n]
+    return out
+
+
+def rolling_sum(a: np.ndarray, w: int) -> np.ndarray:
+    """Sum over the last w rows; NaN unless all w values are present (pandas min_periods=w).
+
+    Leading NaN padding contributes exact zeros to the running sum, so a column
+    gives bit-identical results alone or inside a wider, top-padded panel.
+    """
+    valid = ~np.isnan(a)
+    zero = np.zeros((1,) + a.shape[1:])
+    cs = np.concatenate([zero, np.cumsum(np.where(valid, a, 0.0), axis=0)])
+    cnt = np.concatenate([zero, np.cumsum(valid, axis=0)])
+    out = np.full(a.shape, np.nan)
+    if a.shape[0] >= w:
+        s = cs[w:] - cs[:-w]
+        c = cnt[w:] - cnt[:-w]
+        out[w - 1:] = np.where(c == w, s, np.nan)
+    return out
+
+
+def rolling_mean(a: np.ndarray, w: int) -> np.ndarray:
+    return rolling_sum(a, w) / float(w)
+
+
+def first_valid(a: np.ndarray) -> np.ndarray:
+    """First non-NaN value per column (0.0 for all-NaN columns)."""
+    if not a.shape[0]:
+        return np.zeros(a.shape[1:])
+    idx = (~np.isnan(a)).argmax(axis=0)
+    ref = np.take_along_axis(a, idx.reshape((1,) + idx.shape), axis=0)[0]
+    return np.where(np.isnan(ref), 0.0, ref)
+
+
+def rolling_std(a: np.ndarray, w: int) -> np.ndarray:
+    """Population std (ddof=0); columns are re-centred on their first value to limit cancellation."""
+    d = a - first_valid(a)
+    m1 = rolling_mean(d, w)
+    m2 = rolling_mean(d * d, w)
+    return np.sqrt(np.maximum(m2 - m1 * m1, 0.0))
+
+
+def _rolling_extreme_loop(a: np.ndarray, w: int, sign: float) -> np.ndarray:
+    """Monotonic-deque rolling min (sign=1) / max (sign=-1); O(T) per column.
+
+    NaN anywhere in the window yields NaN, as with pandas ``min_periods=w``.
+    """
+    T, N = a.shape
+    out = np.full((T, N), np.nan)
+    dq = np.empty(T, dtype=np.int64)
+    for j in range(N):
+        head = 0
+        tail = 0
+        last_nan = -1
+        for t in range(T):
+            x = a[t, j]
+            if x != x:
+                last_nan = t
+                head = 0
+                tail = 0
+                continue
+            while tail > head and sign * a[dq[tail - 1], j] >= sign * x:
+                tail -= 1
+            dq[tail] = t
+            tail += 1
+            while dq[head] <= t - w:
+                head += 1
+            if t >= w - 1 and t - last_nan >= w:
+                out[t, j] = a[dq[head], j]
+    return out
+
+
+def _wilder_rma_loop(a: np.ndarray, alpha: float) -> np.ndarray:
+    T, N = a.shape
+    out = np.full((T, N), np.nan)
+    for j in range(N):
+        y = np.nan
+        for t in range(T):
+            x = a[t, j]
+            if x == x:
+                if y != y:
+                    y = x
+                else:
+                    y = (1.0 - alpha) * y + alpha * x
+            out[t, j] = y
+    return out
+
+
+def _rolling_quantile_loop(a: np.ndarray, w: int, q: float) -> np.ndarray:
+    """Sorted-window rolling quantile (linear interpolation); O(w) per bar via shifting.
+
+    NaN anywhere in the window yields NaN, as with pandas ``min_periods=w``.
+    """
+    T, N = a.shape
+    out = np.full((T, N), np.nan)
+    buf = np.empty(w)
+    pos = q * (w - 1)
+    lo = int(np.floor(pos))
+    hi = min(lo + 1, w - 1)
+    frac = pos - lo
+    for j in range(N):
+        cnt = 0
+        last_nan = -1
+        for t in range(T):
+            x = a[t, j]
+            if x != x:
+                last_nan = t
+                cnt = 0
+                continue
+            if t - w > last_nan:
+                old = a[t - w, j]
+                k = np.searchsorted(buf[:cnt], old)
+                buf[k:cnt - 1] = buf[k + 1:cnt].copy()
+                cnt -= 1
+            k = np.searchsorted(buf[:cnt], x)
+            buf[k + 1:cnt + 1] = buf[k:cnt].copy()
+            buf[k] = x
+            cnt += 1
+            if cnt == w:
+                out[t, j] = buf[lo] + (buf[hi] - buf[lo]) * frac
+    return out
+
+
+_rolling_extreme_jit = _jit(_rolling_extreme_loop) if HAS_NUMBA else None
+_rolling_quantile_jit = _jit(_rolling_quantile_loop) if HAS_NUMBA else None
+_wilder_rma_jit = _jit(_wilder_rma_loop) if HAS_NUMBA else None
+
+
+def _rolling_extreme_blocks(a: np.ndarray, w: int, op: np.ufunc) -> np.ndarray:
+    """van Herk/Gil-Werman rolling extreme; O(T) per column whatever w.
+
+    Rows are cut into blocks of w; the window ending at t is ``op`` of the
+    suffix extreme from its first row and the prefix extreme up to t. ``op``
+    propagates NaN, so NaN anywhere in the window yields NaN.
+    """
+    T = a.shape[0]
+    if T < w:
+        return np.full(a.shape, np.nan)
+    nb = -(-T // w)
+    pad = a
+    if nb * w != T:
+        pad = np.full((nb * w,) + a.shape[1:], np.nan)
+        pad[:T] = a
+    blocks = pad.reshape((nb, w) + a.shape[1:])
+    pre = blocks.copy()
+    suf = blocks.copy()
+    # step through block offsets, each op covering every block and column at once
+    # (ufunc.accumulate along a non-last axis is far slower)
+    for k in range(1, w):
+        op(pre[:, k - 1], blocks[:, k], out=pre[:, k])
+        op(suf[:, w - k], blocks[:, w - k - 1], out=suf[:, w - k - 1])
+    pre = pre.reshape(pad.shape)
+    suf = suf.reshape(pad.shape)
+    out = np.empty(a.shape)
+    out[: w - 1] = np.nan
+    op(suf[: T - w + 1], pre[w - 1: T], out=out[w - 1:])
+    return out
+
+
+def rolling_min(a: np.ndarray, w: int) -> np.ndarray:
+    if _rolling_extreme_jit is not None:
+        return _rolling_extreme_jit(np.ascontiguousarray(as_2d(a)), int(w), 1.0).reshape(a.shape)
+    return _rolling_extreme_blocks(a, int(w), np.minimum)
+
+
+def rolling_max(a: np.ndarray, w: int) -> np.ndarray:
+    if _rolling_extreme_jit is not None:
+        return _rolling_extreme_jit(np.ascontiguousarray(as_2d(a)), int(w), -1.0).reshape(a.shape)
+    return _rolling_extreme_blocks(a, int(w), np.maximum)
+
+
+def _rolling_quantile_lists(a: np.ndarray, w: int, q: float) -> np.ndarray:
+    """``_rolling_quantile_loop`` on Python lists: bisect/insort keep each sorted
+    window, so a bar costs one O(w) memmove and memory stays O(w) per column.
+    """
+    a2 = a.reshape(a.shape[0], -1)
+    T = a2.shape[0]
+    out = np.full((a2.shape[1], T), np.nan)
+    pos = q * (w - 1)
+    lo = int(np.floor(pos))
+    hi = min(lo + 1, w - 1)
+    frac = pos - lo
+    nan = float("nan")
+    for j in range(a2.shape[1]):
+        col = a2[:, j].tolist()
+        buf: list = []
+        last_nan = -1
+        res = [nan] * T
+        for t, x in enumerate(col):
+            if x != x:
+                last_nan = t
+                buf = []
+                continue
+            if t - w > last_nan:
+                del buf[bisect_left(buf, col[t - w])]
+            insort(buf, x)
+            if len(buf) == w:
+                res[t] = buf[lo] + (buf[hi] - buf[lo]) * frac
+        out[j] = res
+    return out.T.reshape(a.shape)
+
+
+def rolling_quantile(a: np.ndarray, w: int, q: float) -> np.ndarray:
+    """``rolling(w).quantile(q)`` (linear interpolation) from a sorted window per column."""
+    if _rolling_quantile_jit is not None:
+        return _rolling_quantile_jit(np.ascontiguousarray(as_2d(a)), int(w), float(q)).reshape(a.shape)
+    return _rolling_quantile_lists(np.asarray(a, dtype="float64"), int(w), float(q))
+
+
+def wilder_rma(a: np.ndarray, n: int) -> np.ndarray:
+    """``ewm(alpha=1/n, adjust=False).mean()`` for leading-NaN columns."""
+    alpha = 1.0 / float(n)
+    if _wilder_rma_jit is not None:
+        return _wilder_rma_jit(np.ascontiguousarray(as_2d(a)), alpha).reshape(a.shape)
+    out = np.full(a.shape, np.nan)
+    if a.ndim == 2 and a.shape[1] == 1:
+        # scalar loop: same IEEE operations as the vector branch, far less overhead
+        y = float("nan")
+        col = out[:, 0]
+        for t, x in enumerate(a[:, 0].tolist()):
+            if x == x:
+                y = x if y != y else (1.0 - alpha) * y + alpha * x
+            col[t] = y
+        return out
+    y = np.full(a.shape[1:], np.nan)
+    for t in range(a.shape[0]):
+        x = a[t]
+        ok = ~np.isnan(x)
+        y = np.where(ok & np.isnan(y), x, np.where(ok, (1.0 - alpha) * y + alpha * x, y))
+        out[t] = y
+    return out
+
+
+def true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    prev = shift(close)
+    tr = np.abs(high - low)
+    tr = np.fmax(tr, np.abs(high - prev))
+    return np.fmax(tr, np.abs(low - prev))
@@ -1,7 +1,7 @@
 # 简介：策略库元信息与统一接口封装，汇总各具体策略以便统一调用与编排。
 from __future__ import annotations
 
-from typing import Dict, Any, Callable
+from typing import Dict, Any, Callable, Iterable, List, Optional
 
 # Registry mapping id -> module
 REGISTRY: Dict[str, Any] = {}
@@ -15,6 +15,16 @@ def get(name: str) -> Any:
     return REGISTRY[name]
 
 
+def required_features(names: Optional[Iterable[str]] = None) -> List[str]:
+    """Union of the ``FEATURES`` declared by the given strategies (all when None)."""
+    out: Dict[str, None] = {}
+    for n in (names if names is not None else REGISTRY):
+        mod = REGISTRY.get(n)
+        for f in getattr(mod, "FEATURES", ()):
+            out[f] = None
+    return list(out)
+
+
 # Eager import strategies to ensure availability
 from .strategies import s01_bias6_crossup as S1  # noqa: E402,F401
 from .strategies import s02_rsi2 as S2  # noqa: E402,F401
@@ -0,0 +1,113 @@
+# 简介：横截面指标引擎。把多标的日线对齐成 (bar × symbol) 二维数组，用特征注册表一次
+# 向量化计算全部指标列；仍可按标的取出与单标的结果逐位一致的 DataFrame 视图。
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .features import evaluate
+from .indicators import INDICATOR_COLUMNS, ensure_amount
+
+
+_FIELDS = ("open", "high", "low", "close", "volume", "amount")
+
+
+# ---- Panel ---------------------------------------------------------------------
+@dataclass
+class Panel:
+    """(bar × symbol) block, right-aligned on each symbol's latest bar.
+
+    Aligning by bar position rather than calendar date keeps every rolling
+    window identical to the per-symbol computation (suspension days are not
+    padded in); shorter histories are NaN-padded at the top.
+    """
+
+    symbols: List[str]
+    fields: Dict[str, np.ndarray]
+    lengths: np.ndarray
+    frames: Dict[str, pd.DataFrame] = field(default_factory=dict)
+
+    @property
+    def shape(self):  # noqa: ANN201
+        return self.fields["close"].shape
+
+    def index_of(self, symbol: str) -> int:
+        pos = self.__dict__.get("_pos")
+        if pos is None:
+            pos = {s: j for j, s in enumerate(self.symbols)}
+            self.__dict__["_pos"] = pos
+        return pos[symbol]
+
+    @classmethod
+    def from_frames(cls, frames: Mapping[str, pd.DataFrame]) -> "Panel":
+        syms = list(frames)
+        prepared: Dict[str, pd.DataFrame] = {}
+        for s in syms:
+            x, _ = ensure_amount(frames[s])
+            prepared[s] = x.reset_index(drop=True)
+        lengths = np.array([len(prepared[s]) for s in syms], dtype=int)
+        T = int(lengths.max()) if len(syms) else 0
+        fields: Dict[str, np.ndarray] = {}
+        for f in _FIELDS:
+            arr = np.full((T, len(syms)), np.nan)
+            for j, s in enumerate(syms):
+                n = lengths[j]
+                if n:
+                    arr[T - n:, j] = pd.to_numeric(prepared[s][f], errors="coerce").to_numpy(dtype="float64")
+            fields[f] = arr
+        return cls(symbols=syms, fields=fields, lengths=lengths, frames=prepared)
+
+    @classmethod
+    def from_long(cls, df: pd.DataFrame, symbol_col: str = "ts_code", date_col: str = "date") -> "Panel":
+        """Long frame (one row per symbol/date) or MultiIndex (symbol, date) frame."""
+        if isinstance(df.index, pd.MultiIndex):
+            df = df.reset_index()
+        frames = {str(s): g.sort_values(date_col) for s, g in df.groupby(symbol_col, sort=False)}
+        return cls.from_frames(frames)
+
+
+@dataclass
+class PanelFeatures:
+    panel: Panel
+    columns: Dict[str, np.ndarray]
+    names: List[str] = field(default_factory=lambda: list(INDICATOR_COLUMNS))
+
+    def view(self, symbol: str) -> pd.DataFrame:
+        """Per-symbol frame equal to ``compute_indicators(frame, names)``."""
+        j = self.panel.index_of(symbol)
+        n = int(self.panel.lengths[j])
+        T = self.panel.shape[0]
+        base = self.panel.frames.get(symbol)
+        if base is None:
+            base = pd.DataFrame({f: self.panel.fields[f][T - n:, j] for f in _FIELDS})
+        ind = pd.DataFrame({c: self.columns[c][T - n:, j] for c in self.names}, index=base.index)
+        # one concat instead of one insert per column
+        out = pd.concat([base.drop(columns=[c for c in self.names if c in base.columns]), ind], axis=1)
+        out.attrs = dict(base.attrs)
+        return out
+
+    def views(self, symbols: Optional[Iterable[str]] = None) -> Dict[str, pd.DataFrame]:
+        return {s: self.view(s) for s in (symbols or self.panel.symbols)}
+
+    def last(self) -> pd.DataFrame:
+        """Cross-section of every symbol's latest bar (index = symbol)."""
+        data = {f: self.panel.fields[f][-1] for f in _FIELDS}
+        data.update({c: self.columns[c][-1] for c in self.names})
+        return pd.DataFrame(data, index=pd.Index(self.panel.symbols, name="symbol"))
+
+
+def compute_panel(panel: Panel, names: Optional[Sequence[str]] = None) -> PanelFeatures:
+    """Evaluate registry features on the whole block (same kernels as the per-symbol path)."""
+    names = list(names or INDICATOR_COLUMNS)
+    cols = evaluate(panel.fields.get, names)
+    return PanelFeatures(panel=panel, columns=cols, names=names)
+
+
+def compute_indicators_many(frames: Mapping[str, pd.DataFrame], names: Optional[Sequence[str]] = None) -> Dict[str, pd.DataFrame]:
+    """Batch equivalent of ``{s: compute_indicators(df, names) for s, df in frames.items()}``."""
+    if not frames:
+        return {}
+    return compute_panel(Panel.from_frames(frames), names).views()
@@ -5,6 +5,11 @@ from dataclasses import dataclass
 from typing import Dict, List
 import pandas as pd
 
+from ..features import with_features
+
+
+FEATURES = ("bias6_cross_up",)
+
 
 @dataclass
 class Setup:
@@ -12,12 +17,17 @@ class Setup:
     note: str
 
 
+def signal_mask(df: pd.DataFrame) -> pd.Series:
+    df = with_features(df, FEATURES)
+    return df["bias6_cross_up"].astype(bool)
+
+
+def setups_from_mask(mask: pd.Series) -> List[Setup]:
+    return [Setup(int(i), "bias6上穿bias12") for i in mask.index[mask]]
+
+
 def detect_setups(df: pd.DataFrame) -> List[Setup]:
-    if "bias6_cross_up" not in df.columns:
-        from ..indicators import compute_indicators
-        df = compute_indicators(df)
-    mask = df["bias6_cross_up"].astype(bool)
-    return [Setup(int(i), "bias6上穿bias12") for i in df.index[mask]]
+    return setups_from_mask(signal_mask(df))
 
 
 def key_bands(df: pd.DataFrame, setup: Setup) -> Dict[str, float]:
@@ -42,9 +52,4 @@ def invalidation(setup: Setup) -> List[str]:
 
 def event_study(df: pd.DataFrame, setups: List[Setup]):
     from ..event_study import event_study_from_mask
-
-    if "bias6_cross_up" not in df.columns:
-        from ..indicators import compute_indicators
-        df = compute_indicators(df)
-    mask = df["bias6_cross_up"].astype(bool)
-    return event_study_from_mask(df, mask)
+    return event_study_from_mask(df, signal_mask(df))
@@ -5,6 +5,11 @@ from dataclasses import dataclass
 from typing import Dict, List
 import pandas as pd
 
+from ..features import with_features
+
+
+FEATURES = ("low20",)
+
 
 @dataclass
 class Setup:
@@ -12,12 +17,20 @@ class Setup:
     note: str
 
 
-def detect_setups(df: pd.DataFrame) -> List[Setup]:
+def signal_mask(df: pd.DataFrame) -> pd.Series:
     # Turtle Soup: false breakdown below N-day low (use 20)
-    low20 = df["low"].rolling(20).min()
-    prev_low20 = low20.shift(1)
+    df = with_features(df, FEATURES)
+    prev_low20 = df["low20"].shift(1)
     mask = (df["low"] < prev_low20) & (df["close"] > prev_low20)
-    return [Setup(int(i), "TurtleSoup 20d 假破") for i in df.index[mask.fillna(False)]]
+    return mask.fillna(False).astype(bool)
+
+
+def setups_from_mask(mask: pd.Series) -> List[Setup]:
+    return [Setup(int(i), "TurtleSoup 20d 假破") for i in mask.index[mask]]
+
+
+def detect_setups(df: pd.DataFrame) -> List[Setup]:
+    return setups_from_mask(signal_mask(df))
 
 
 def key_bands(df: pd.DataFrame, setup: Setup) -> Dict[str, float]:
@@ -41,7 +54,4 @@ def invalidation(setup: Setup) -> List[str]:
 
 def event_study(df: pd.DataFrame, setups: List[Setup]):
     from ..event_study import event_study_from_mask
-    low20 = df["low"].rolling(20).min()
-    prev_low20 = low20.shift(1)
-    mask = (df["low"] < prev_low20) & (df["close"] > prev_low20)
-    return event_study_from_mask(df, mask)
+    return event_study_from_mask(df, signal_mask(df))
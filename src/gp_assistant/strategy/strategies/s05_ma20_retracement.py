@@ -5,6 +5,11 @@ from dataclasses import dataclass
 from typing import Dict, List
 import pandas as pd
 
+from ..features import with_features
+
+
+FEATURES = ("ma20",)
+
 
 @dataclass
 class Setup:
@@ -12,14 +17,23 @@ class Setup:
     note: str
 
 
-def detect_setups(df: pd.DataFrame) -> List[Setup]:
-    ma20 = df["close"].rolling(20).mean()
+def signal_mask(df: pd.DataFrame) -> pd.Series:
+    df = with_features(df, FEATURES)
+    ma20 = df["ma20"]
     cond = (ma20 > ma20.shift(5)) & (df["low"] <= ma20) & (df["close"] >= ma20)
-    return [Setup(int(i), "MA20回踩确认") for i in df.index[cond.fillna(False)]]
+    return cond.fillna(False).astype(bool)
+
+
+def setups_from_mask(mask: pd.Series) -> List[Setup]:
+    return [Setup(int(i), "MA20回踩确认") for i in mask.index[mask]]
+
+
+def detect_setups(df: pd.DataFrame) -> List[Setup]:
+    return setups_from_mask(signal_mask(df))
 
 
 def key_bands(df: pd.DataFrame, setup: Setup) -> Dict[str, float]:
-    ma20 = float(df["close"].rolling(20).mean().iloc[setup.idx])
+    ma20 = float(with_features(df, FEATURES)["ma20"].iloc[setup.idx])
     return {"S1": ma20 * 0.99, "S2": ma20, "R1": ma20 * 1.02, "R2": ma20 * 1.03, "anchors": ma20}
 
 
@@ -36,6 +50,4 @@ def invalidation(setup: Setup) -> List[str]:
 
 def event_study(df: pd.DataFrame, setups: List[Setup]):
     from ..event_study import event_study_from_mask
-    ma20 = df["close"].rolling(20).mean()
-    cond = (ma20 > ma20.shift(5)) & (df["low"] <= ma20) & (df["close"] >= ma20)
-    return event_study_from_mask(df, cond)
+    return event_study_from_mask(df, signal_mask(df))
@@ -3,8 +3,14 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from typing import Dict, List
+import numpy as np
 import pandas as pd
 
+from ..features import with_features
+
+
+FEATURES = ("high20",)
+
 
 @dataclass
 class Setup:
@@ -12,18 +18,28 @@ class Setup:
     note: str
 
 
+def signal_mask(df: pd.DataFrame) -> pd.Series:
+    """Event-study mask: the day after a 20d breakout (setups refine it to the pullback day)."""
+    df = with_features(df, FEATURES)
+    breakout = df["close"] > df["high20"].shift(1)
+    return breakout.shift(1, fill_value=False).astype(bool)
+
+
 def detect_setups(df: pd.DataFrame) -> List[Setup]:
     # recent breakout (close > 20d high), then 1-3 day pullback not losing structure
-    high20 = df["high"].rolling(20).max()
+    df = with_features(df, FEATURES)
+    high20 = df["high20"]
     breakout = df["close"] > high20.shift(1)
     pullback = (df["close"] < df["close"].shift(1))
+    b = breakout.to_numpy(dtype=bool)
+    pb = pullback.to_numpy(dtype=bool)
+    n = len(df)
     idxs = []
-    for i in range(len(df)):
-        if breakout.iloc[i]:
-            for j in range(1, 4):
-                if i + j < len(df) and pullback.iloc[i + j]:
-                    idxs.append(i + j)
-                    break
+    for i in np.flatnonzero(b):
+        for j in range(1, 4):
+            if i + j < n and pb[i + j]:
+                idxs.append(i + j)
+                break
     return [Setup(int(i), "突破后二买回踩") for i in idxs]
 
 
@@ -51,8 +67,4 @@ def invalidation(setup: Setup) -> List[str]:
 
 def event_study(df: pd.DataFrame, setups: List[Setup]):
     from ..event_study import event_study_from_mask
-    high20 = df["high"].rolling(20).max()
-    breakout = df["close"] > high20.shift(1)
-    # mark pullback days simply as next day of breakout
-    mask = breakout.shift(1).fillna(False)
-    return event_study_from_mask(df, mask)
+    return event_study_from_mask(df, signal_mask(df))
@@ -12,10 +12,18 @@ class Setup:
     note: str
 
 
-def detect_setups(df: pd.DataFrame) -> List[Setup]:
+def signal_mask(df: pd.DataFrame) -> pd.Series:
     tr = (df["high"] - df["low"]).abs()
     mask = tr == tr.rolling(7).min()
-    return [Setup(int(i), "NR7 收缩") for i in df.index[mask.fillna(False)]]
+    return mask.fillna(False).astype(bool)
+
+
+def setups_from_mask(mask: pd.Series) -> List[Setup]:
+    return [Setup(int(i), "NR7 收缩") for i in mask.index[mask]]
+
+
+def detect_setups(df: pd.DataFrame) -> List[Setup]:
+    return setups_from_mask(signal_mask(df))
 
 
 def key_bands(df: pd.DataFrame, setup: Setup) -> Dict[str, float]:
@@ -42,6 +50,4 @@ def invalidation(setup: Setup) -> List[str]:
 
 def event_study(df: pd.DataFrame, setups: List[Setup]):
     from ..event_study import event_study_from_mask
-    tr = (df["high"] - df["low"]).abs()
-    mask = tr == tr.rolling(7).min()
-    return event_study_from_mask(df, mask)
+    return event_study_from_mask(df, signal_mask(df))
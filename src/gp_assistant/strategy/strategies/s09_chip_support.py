@@ -5,7 +5,13 @@ from dataclasses import dataclass
 from typing import Dict, List
 import pandas as pd
 
-from ..chip_model import compute_chip
+from ..chip_model import compute_chip, rolling_band_90_low
+from ..features import feature_memo
+
+# per-frame memo key for the as-of support line (not a registered feature)
+_S1_KEY = "_chip_band90_low_asof"
+# trailing bars behind each bar's chip distribution (~one quarter)
+_SUPPORT_WINDOW = 60
 
 
 @dataclass
@@ -14,16 +20,32 @@ class Setup:
     note: str
 
 
-def detect_setups(df: pd.DataFrame) -> List[Setup]:
-    # Use chip 90% low as support proxy; detect days near that band
-    chip, _ = compute_chip(df)
-    s1 = chip.band_90_low
+def _support(df: pd.DataFrame) -> pd.Series:
+    """90% chip band low of the trailing window as of each bar (no look-ahead), memoized on the frame."""
+    memo = feature_memo(df)
+    s1 = memo.get(_S1_KEY)
+    if s1 is None:
+        s1 = memo[_S1_KEY] = rolling_band_90_low(df, _SUPPORT_WINDOW)
+    return pd.Series(s1, index=df.index)
+
+
+def signal_mask(df: pd.DataFrame) -> pd.Series:
+    # Use the trailing-window chip 90% low as support proxy; detect days near that band
+    s1 = _support(df)
     mask = (df["low"] <= s1) & (df["close"] >= s1)
-    return [Setup(int(i), "筹码带支撑回收") for i in df.index[mask.fillna(False)]]
+    return mask.fillna(False).astype(bool)
+
+
+def setups_from_mask(mask: pd.Series) -> List[Setup]:
+    return [Setup(int(i), "筹码带支撑回收") for i in mask.index[mask]]
+
+
+def detect_setups(df: pd.DataFrame) -> List[Setup]:
+    return setups_from_mask(signal_mask(df))
 
 
 def key_bands(df: pd.DataFrame, setup: Setup) -> Dict[str, float]:
-    chip, _ = compute_chip(df.iloc[: setup.idx + 1])
+    chip, _ = compute_chip(df.iloc[max(0, setup.idx - _SUPPORT_WINDOW + 1) : setup.idx + 1])
     return {"S1": chip.band_90_low, "S2": chip.avg_cost, "R1": chip.band_90_high, "R2": chip.band_90_high * 1.02, "anchors": chip.avg_cost}
 
 
@@ -40,7 +62,4 @@ def invalidation(setup: Setup) -> List[str]:
 
 def event_study(df: pd.DataFrame, setups: List[Setup]):
     from ..event_study import event_study_from_mask
-    chip, _ = compute_chip(df)
-    s1 = chip.band_90_low
-    mask = (df["low"] <= s1) & (df["close"] >= s1)
-    return event_study_from_mask(df, mask)
+    return event_study_from_mask(df, signal_mask(df))
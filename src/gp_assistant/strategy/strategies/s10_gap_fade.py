@@ -5,6 +5,11 @@ from dataclasses import dataclass
 from typing import Dict, List
 import pandas as pd
 
+from ..features import with_features
+
+
+FEATURES = ("gap_pct",)
+
 
 @dataclass
 class Setup:
@@ -12,12 +17,18 @@ class Setup:
     note: str
 
 
-def detect_setups(df: pd.DataFrame) -> List[Setup]:
-    prev_close = df["close"].shift(1)
-    gap_pct = (df["open"] - prev_close) / prev_close.replace(0, 1e-12)
-    mask = gap_pct > 0.02
+def signal_mask(df: pd.DataFrame) -> pd.Series:
+    gap_pct = with_features(df, FEATURES)["gap_pct"]
     # Strategy: gap up then fade; only for observation per rules
-    return [Setup(int(i), "高开>2%观察") for i in df.index[mask.fillna(False)]]
+    return (gap_pct > 0.02).fillna(False).astype(bool)
+
+
+def setups_from_mask(mask: pd.Series) -> List[Setup]:
+    return [Setup(int(i), "高开>2%观察") for i in mask.index[mask]]
+
+
+def detect_setups(df: pd.DataFrame) -> List[Setup]:
+    return setups_from_mask(signal_mask(df))
 
 
 def key_bands(df: pd.DataFrame, setup: Setup) -> Dict[str, float]:
@@ -41,7 +52,4 @@ def invalidation(setup: Setup) -> List[str]:
 
 def event_study(df: pd.DataFrame, setups: List[Setup]):
     from ..event_study import event_study_from_mask
-    prev_close = df["close"].shift(1)
-    gap_pct = (df["open"] - prev_close) / prev_close.replace(0, 1e-12)
-    mask = gap_pct > 0.02
-    return event_study_from_mask(df, mask)
+    return event_study_from_mask(df, signal_mask(df))
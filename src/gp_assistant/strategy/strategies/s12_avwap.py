@@ -5,6 +5,12 @@ from dataclasses import dataclass
 from typing import Dict, List
 import pandas as pd
 
+from ..features import with_features
+
+
+# AVWAP anchored at the bar of the 20-day low (see strategy.avwap for other anchors)
+FEATURES = ("avwap_low20",)
+
 
 @dataclass
 class Setup:
@@ -13,20 +19,21 @@ class Setup:
 
 
 def _avwap(df: pd.DataFrame) -> pd.Series:
-    # anchored vwap at 20d low as proxy
-    low20_idx = df["low"].rolling(20).apply(lambda x: x.argmin(), raw=True)
-    # compute simple cumulative vwap starting from low20 anchor each day (approximate)
-    price = (df["high"] + df["low"] + df["close"]) / 3.0
-    vol = df["volume"].astype(float)
-    cum_pv = (price * vol).cumsum()
-    cum_v = vol.cumsum().replace(0, 1e-12)
-    return cum_pv / cum_v
+    return with_features(df, FEATURES)["avwap_low20"]
 
 
-def detect_setups(df: pd.DataFrame) -> List[Setup]:
+def signal_mask(df: pd.DataFrame) -> pd.Series:
     avwap = _avwap(df)
     mask = (df["close"] > avwap) & (df["open"] < avwap)
-    return [Setup(int(i), "AVWAP回收") for i in df.index[mask.fillna(False)]]
+    return mask.fillna(False).astype(bool)
+
+
+def setups_from_mask(mask: pd.Series) -> List[Setup]:
+    return [Setup(int(i), "AVWAP回收") for i in mask.index[mask]]
+
+
+def detect_setups(df: pd.DataFrame) -> List[Setup]:
+    return setups_from_mask(signal_mask(df))
 
 
 def key_bands(df: pd.DataFrame, setup: Setup) -> Dict[str, float]:
@@ -44,6 +51,4 @@ def invalidation(setup: Setup) -> List[str]:
 
 def event_study(df: pd.DataFrame, setups: List[Setup]):
     from ..event_study import event_study_from_mask
-    avwap = _avwap(df)
-    mask = (df["close"] > avwap) & (df["open"] < avwap)
-    return event_study_from_mask(df, mask)
+    return event_study_from_mask(df, signal_mask(df))
@@ -5,6 +5,11 @@ from dataclasses import dataclass
 from typing import Dict, List
 import pandas as pd
 
+from ..features import with_features
+
+
+FEATURES = ("bbwidth20", "bbwidth20_q20", "ma5")
+
 
 @dataclass
 class Setup:
@@ -12,14 +17,20 @@ class Setup:
     note: str
 
 
-def detect_setups(df: pd.DataFrame) -> List[Setup]:
-    if "bbwidth20" not in df.columns:
-        from ..indicators import compute_indicators
-        df = compute_indicators(df)
+def signal_mask(df: pd.DataFrame) -> pd.Series:
+    df = with_features(df, FEATURES)
     bbw = df["bbwidth20"]
-    thr = bbw.rolling(60).quantile(0.2)
-    release = (bbw > thr) & (df["close"] > df["close"].rolling(5).mean())
-    return [Setup(int(i), "压缩后释放") for i in df.index[release.fillna(False)]]
+    thr = df["bbwidth20_q20"]
+    release = (bbw > thr) & (df["close"] > df["ma5"])
+    return release.fillna(False).astype(bool)
+
+
+def setups_from_mask(mask: pd.Series) -> List[Setup]:
+    return [Setup(int(i), "压缩后释放") for i in mask.index[mask]]
+
+
+def detect_setups(df: pd.DataFrame) -> List[Setup]:
+    return setups_from_mask(signal_mask(df))
 
 
 def key_bands(df: pd.DataFrame, setup: Setup) -> Dict[str, float]:
@@ -43,10 +54,4 @@ def invalidation(setup: Setup) -> List[str]:
 
 def event_study(df: pd.DataFrame, setups: List[Setup]):
     from ..event_study import event_study_from_mask
-    if "bbwidth20" not in df.columns:
-        from ..indicators import compute_indicators
-        df = compute_indicators(df)
-    bbw = df["bbwidth20"]
-    thr = bbw.rolling(60).quantile(0.2)
-    release = (bbw > thr) & (df["close"] > df["close"].rolling(5).mean())
-    return event_study_from_mask(df, release)
+    return event_study_from_mask(df, signal_mask(df))
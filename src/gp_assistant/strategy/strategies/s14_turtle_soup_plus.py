@@ -5,6 +5,11 @@ from dataclasses import dataclass
 from typing import Dict, List
 import pandas as pd
 
+from ..features import with_features
+
+
+FEATURES = ("high20",)
+
 
 @dataclass
 class Setup:
@@ -12,11 +17,20 @@ class Setup:
     note: str
 
 
-def detect_setups(df: pd.DataFrame) -> List[Setup]:
+def signal_mask(df: pd.DataFrame) -> pd.Series:
     # Turtle Soup+1: false breakout above N-day high then close back below
-    high20 = df["high"].rolling(20).max()
+    df = with_features(df, FEATURES)
+    high20 = df["high20"]
     mask = (df["high"] > high20.shift(1)) & (df["close"] < high20.shift(1))
-    return [Setup(int(i), "TurtleSoup+ 上方假破") for i in df.index[mask.fillna(False)]]
+    return mask.fillna(False).astype(bool)
+
+
+def setups_from_mask(mask: pd.Series) -> List[Setup]:
+    return [Setup(int(i), "TurtleSoup+ 上方假破") for i in mask.index[mask]]
+
+
+def detect_setups(df: pd.DataFrame) -> List[Setup]:
+    return setups_from_mask(signal_mask(df))
 
 
 def key_bands(df: pd.DataFrame, setup: Setup) -> Dict[str, float]:
@@ -37,6 +51,4 @@ def invalidation(setup: Setup) -> List[str]:
 
 def event_study(df: pd.DataFrame, setups: List[Setup]):
     from ..event_study import event_study_from_mask
-    high20 = df["high"].rolling(20).max()
-    mask = (df["high"] > high20.shift(1)) & (df["close"] < high20.shift(1))
-    return event_study_from_mask(df, mask)
+    return event_study_from_mask(df, signal_mask(df))
@@ -14,6 +14,7 @@ except Exception:  # noqa: BLE001
 
 from ..core.types import ToolResult
 from ..core.paths import store_dir, configs_dir
+from ..strategy.event_study import forward_stats
 
 
 @dataclass
@@ -103,46 +104,26 @@ def _data_hash(df_feat: pd.DataFrame) -> str:
 def run_event_backtest(df_feat: pd.DataFrame, strategy: StrategyDef, config=None) -> BacktestStats:  # noqa: ANN401
     as_of = pd.to_datetime(df_feat["date"].iloc[-1]).strftime("%Y-%m-%d") if len(df_feat) else ""
     mask = _event_mask(df_feat, strategy)
-    idxs = list(df_feat.index[mask])
-    fds = strategy.forward_days or [2, 5, 10]
-    returns: dict[int, list[float]] = {n: [] for n in fds}
-    mdds: list[float] = []
-    for i in idxs:
-        t1 = i + 1
-        if t1 >= len(df_feat):
-            continue
-        entry = float(df_feat.loc[t1, "close"])  # proxy: next close
-        horizon = min(10, len(df_feat) - t1 - 1)
-        if horizon <= 0:
-            continue
-        future = df_feat.loc[t1 : t1 + horizon, "close"].astype(float)
-        rel = future / entry
-        mdd = float(rel.min() - 1.0)
-        mdds.append(mdd)
-        for n in fds:
-            tN = t1 + n
-            if tN < len(df_feat):
-                r = float(df_feat.loc[tN, "close"]) / entry - 1.0
-                returns[n].append(r)
-    k = min((len(v) for v in returns.values()), default=0)
-
-    def win_rate(lst: list[float]) -> float:
-        if not lst:
-            return 0.0
-        return float(sum(1 for x in lst if x > 0) / len(lst))
+    fds = list(strategy.forward_days or [2, 5, 10])
+    # entry-anchored horizons; MDD over entry..entry+10 needs at least one later bar
+    fs = forward_stats(df_feat["close"].to_numpy(dtype="float64"), mask.to_numpy(dtype=bool), fds, anchor="entry", mdd_bars=11, mdd_min_bars=2)
+    k = int(fs.k[0])
+
+    def col(arr, n: int) -> float:  # noqa: ANN001
+        return float(arr[0, fs.column(n)]) if n in fs.horizons else 0.0
 
     stats = BacktestStats(
         symbol=str(df_feat.attrs.get("symbol", "UNKNOWN")),
         strategy_id=str(strategy.id),
         as_of_date=as_of,
         k=int(k),
-        win_rate_2=win_rate(returns.get(2, [])),
-        win_rate_5=win_rate(returns.get(5, [])),
-        win_rate_10=win_rate(returns.get(10, [])),
-        avg_return_2=float(pd.Series(returns.get(2, [])).mean() if returns.get(2) else 0.0),
-        avg_return_5=float(pd.Series(returns.get(5, [])).mean() if returns.get(5) else 0.0),
-        avg_return_10=float(pd.Series(returns.get(10, [])).mean() if returns.get(10) else 0.0),
-        mdd10_avg=float(pd.Series(mdds).mean() if mdds else 0.0),
+        win_rate_2=col(fs.win_rate, 2),
+        win_rate_5=col(fs.win_rate, 5),
+        win_rate_10=col(fs.win_rate, 10),
+        avg_return_2=col(fs.mean_return, 2),
+        avg_return_5=col(fs.mean_return, 5),
+        avg_return_10=col(fs.mean_return, 10),
+        mdd10_avg=float(fs.mdd_mean[0]),
         sample_warning=bool(int(k) < (strategy.min_samples or 5)),
         data_hash=_data_hash(df_feat),
     )
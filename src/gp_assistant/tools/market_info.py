@@ -4,19 +4,19 @@ from __future__ import annotations
 from typing import Any, List, Dict, Tuple
 
 import re
-import requests
 from bs4 import BeautifulSoup
 try:
     from readability import Document
 except Exception:  # noqa: BLE001
     Document = None  # type: ignore
 
+from ..core.http import get_client
 from ..core.types import ToolResult
 
 
 def _fetch_list(url: str, selectors: List[str], limit: int = 20) -> List[Dict[str, str]]:
     try:
-        r = requests.get(url, timeout=10)
+        r = get_client().get(url, timeout=10)
         r.raise_for_status()
         html = r.text
         soup = BeautifulSoup(html, "lxml")
@@ -51,7 +51,7 @@ def _summarize_urls(urls: List[str], limit: int = 3) -> Tuple[str, List[Dict[str
     picked: List[Dict[str, str]] = []
     for u in urls[:limit]:
         try:
-            rr = requests.get(u, timeout=10)
+            rr = get_client().get(u, timeout=10)
             rr.raise_for_status()
             if Document is not None:
                 doc = Document(rr.text)
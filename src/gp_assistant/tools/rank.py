@@ -41,15 +41,17 @@ def run_rank(args: dict, state: Any) -> ToolResult:  # noqa: ANN401
 
     strat = StrategyDef(id="S1", name="Bias6 CrossUp", enabled=True, event_rule={"name": "bias6_cross_up", "params": {}}, lookback_days=250, forward_days=[2, 5, 10], min_samples=5)
 
+    entries = list(uni.kept) + list(uni.watch_only)
+    raw_by_symbol = provider.get_daily_many([e.symbol for e in entries], None, as_of)
+
     def load_feat(sym: str):
-        df_raw = provider.get_daily(sym, start=None, end=as_of)
-        df_norm, _ = normalize_daily_ohlcv(df_raw)
+        df_norm, _ = normalize_daily_ohlcv(raw_by_symbol[sym])
         feat = compute_indicators(df_norm, None)
         feat = feat.copy()
         feat.attrs["symbol"] = sym
         return feat
 
-    for entry in list(uni.kept) + list(uni.watch_only):
+    for entry in entries:
         sym = entry.symbol
         try:
             feat = load_feat(sym)
@@ -5,6 +5,7 @@ from typing import Any, List, Dict
 import pandas as pd
 
 from ..core.types import ToolResult
+from ..strategy.features import assign_features
 
 
 def _ma(df: pd.DataFrame, n: int) -> pd.Series:
@@ -39,39 +40,6 @@ def run_signals(args: dict, state: Any) -> ToolResult:  # noqa: ANN401
 
 
 # ---------------- Deterministic indicator engine -----------------
-def _true_range(df: pd.DataFrame) -> pd.Series:
-    prev_close = df["close"].shift(1)
-    ranges = pd.concat(
-        [
-            (df["high"] - df["low"]).abs(),
-            (df["high"] - prev_close).abs(),
-            (df["low"] - prev_close).abs(),
-        ],
-        axis=1,
-    )
-    return ranges.max(axis=1)
-
-
-def _wilder_rma(x: pd.Series, n: int) -> pd.Series:
-    return x.ewm(alpha=1.0 / float(n), adjust=False).mean()
-
-
-def _atr_wilder(df: pd.DataFrame, n: int) -> pd.Series:
-    tr = _true_range(df)
-    return _wilder_rma(tr, n)
-
-
-def _rsi_wilder(close: pd.Series, n: int) -> pd.Series:
-    delta = close.diff()
-    gain = delta.clip(lower=0.0)
-    loss = -delta.clip(upper=0.0)
-    avg_gain = _wilder_rma(gain, n)
-    avg_loss = _wilder_rma(loss, n)
-    rs = avg_gain / avg_loss.replace(0, 1e-12)
-    rsi = 100.0 - (100.0 / (1.0 + rs))
-    return rsi
-
-
 def compute_indicators(df_norm: pd.DataFrame, config: Dict[str, Any] | None = None) -> pd.DataFrame:  # noqa: ANN401
     """Compute deterministic indicators on normalized OHLCV.
 
@@ -91,55 +59,27 @@ def compute_indicators(df_norm: pd.DataFrame, config: Dict[str, Any] | None = No
     if miss:
         raise ValueError(f"缺少必要列: {miss}")
 
-    # Rolling indicators
-    # amount_5d_avg
-    df["amount_5d_avg"] = df["amount"].rolling(5).mean()
-
-    # MA windows
+    # Every number comes from the shared feature registry; config windows pick
+    # the parametric feature behind each (fixed-name) output column.
+    cols: Dict[str, str] = {"amount_5d_avg": "amount_5d_avg"}
     for w in ma_wins:
-        df[f"ma{w}"] = df["close"].rolling(w).mean()
+        cols[f"ma{w}"] = f"ma{w}"
     # Ensure MA for bias windows exist
     for w in (6, 12, 24):
         if f"ma{w}" not in df.columns:
-            df[f"ma{w}"] = df["close"].rolling(w).mean()
-
-    # ATR and ATR percentage
-    df[f"atr{atr_n}"] = _atr_wilder(df, atr_n)
-    df["atr14"] = df[f"atr{atr_n}"] if atr_n == 14 else df[f"atr{atr_n}"] * 1.0  # alias
-    df["atr_pct"] = df["atr14"] / df["close"].replace(0, 1e-12)
-
-    # BIAS metrics
-    def bias_for(w: int) -> pd.Series:
-        ma = df[f"ma{w}"]
-        return (df["close"] - ma) / ma.replace(0, 1e-12)
-
-    df["bias6"] = bias_for(6)
-    df["bias12"] = bias_for(12)
-    df["bias24"] = bias_for(24)
-
-    b6 = df["bias6"]
-    b12 = df["bias12"]
-    df["bias6_cross_up"] = (b6.shift(1) <= b12.shift(1)) & (b6 > b12)
-    df["bias6_cross_down"] = (b6.shift(1) >= b12.shift(1)) & (b6 < b12)
-
-    # RSI2
-    df["rsi2"] = _rsi_wilder(df["close"], rsi_n)
-
-    # Bollinger band width on middle band
-    mid = df["close"].rolling(bb_n).mean()
-    std = df["close"].rolling(bb_n).std(ddof=0)
-    upper = mid + 2 * std
-    lower = mid - 2 * std
-    bbwidth = (upper - lower) / mid.replace(0, 1e-12)
-    df["bbwidth20"] = bbwidth
-
-    # NR7 event: 7-day true range minimal event
-    tr = _true_range(df)
-    rolling_min = tr.rolling(7).min()
-    df["nr7"] = tr == rolling_min
-
-    # Volume ratio
-    df["volratio10"] = df["volume"] / df["volume"].rolling(volratio_n).mean().replace(0, 1e-12)
+            cols[f"ma{w}"] = f"ma{w}"
+    cols[f"atr{atr_n}"] = f"atr{atr_n}"
+    cols["atr14"] = f"atr{atr_n}"  # alias
+    cols["atr_pct"] = f"atr_pct{atr_n}"
+    for w in (6, 12, 24):
+        cols[f"bias{w}"] = f"bias{w}"
+    cols["bias6_cross_up"] = "bias6_cross_up"
+    cols["bias6_cross_down"] = "bias6_cross_down"
+    cols["rsi2"] = f"rsi{rsi_n}"
+    cols["bbwidth20"] = f"bbwidth{bb_n}"
+    cols["nr7"] = "nr7"
+    cols["volratio10"] = f"volratio{volratio_n}"
+    df = assign_features(df, cols)
 
     # insufficient history flag
     need_len = max([60] + ma_wins + [atr_n, bb_n, volratio_n, 24])
@@ -4,6 +4,7 @@ from __future__ import annotations
 from typing import Any, List, Dict
 
 from ..core.types import ToolResult
+from ..core.errors import DataProviderError
 from ..providers.factory import get_provider
 from .market_data import normalize_daily_ohlcv
 from .signals import compute_indicators
@@ -31,10 +32,13 @@ def run_strategy_score(args: dict, state: Any) -> ToolResult:  # noqa: ANN401
     provider = get_provider()
     strat = StrategyDef(id="S1", name="Bias6 CrossUp", enabled=True, event_rule={"name": "bias6_cross_up", "params": {}}, lookback_days=250, forward_days=[2, 5, 10], min_samples=5)
 
+    raw_by_symbol = provider.get_daily_many(symbols, None, None)
     out: List[Dict[str, Any]] = []
     for sym in symbols:
         try:
-            df_raw = provider.get_daily(sym, start=None, end=None)
+            df_raw = raw_by_symbol.get(sym)
+            if df_raw is None:
+                raise DataProviderError("daily bars unavailable", symbol=sym)
             df_norm, _ = normalize_daily_ohlcv(df_raw)
             feat = compute_indicators(df_norm, None)
             feat.attrs["symbol"] = sym
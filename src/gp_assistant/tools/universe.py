@@ -7,6 +7,7 @@ import pandas as pd
 
 from ..core.types import ToolResult
 from ..core.config import load_config
+from ..core.errors import DataProviderError
 from ..providers.factory import get_provider
 from .market_data import normalize_daily_ohlcv
 from .signals import compute_indicators
@@ -66,10 +67,13 @@ def build_universe(provider=None, config=None, as_of_date: Optional[str] = None)
     liquid_min = 1e7
     near_res_pct = 0.005  # within 0.5% of 20d high (yesterday)
 
+    raw_by_symbol = p.get_daily_many(symbols, start, as_of)
     for sym in symbols:
         entry = UniverseEntry(symbol=sym, name=None, reason_codes=[], facts={})
         try:
-            raw = p.get_daily(sym, start=start, end=as_of)
+            raw = raw_by_symbol.get(sym)
+            if raw is None:
+                raise DataProviderError("daily bars unavailable", symbol=sym)
             # ST detection
             is_st = False
             st_method = None
@@ -1,6 +1,9 @@
 import sys
 from pathlib import Path
 
+import numpy as np
+import pandas as pd
+import pytest
 
 root = Path(__file__).resolve().parents[1]
 src = root / "src"
@@ -25,3 +28,28 @@ collect_ignore = [
     "test_imports_compile.py",
     "test_session_state.py",
 ]
+
+
+def make_ohlcv(n, seed, *, sigma=0.2, open_sigma=None, start="2023-01-02", amount=True, turnover=False):
+    """Seeded random-walk daily bars around 10 with optional amount/turnover (%) columns."""
+    rng = np.random.default_rng(seed)
+    close = 10 + np.cumsum(rng.normal(0, sigma, n))
+    df = pd.DataFrame({
+        "date": pd.bdate_range(start, periods=n),
+        "open": close + rng.normal(0, sigma / 4 if open_sigma is None else open_sigma, n),
+        "high": close + np.abs(rng.normal(0, sigma, n)),
+        "low": close - np.abs(rng.normal(0, sigma, n)),
+        "close": close,
+        "volume": rng.integers(1_000, 10_000, n).astype(float),
+    })
+    if amount:
+        df["amount"] = df["close"] * df["volume"] * 100
+    if turnover:
+        df["turnover"] = rng.uniform(0.5, 8.0, n)
+    return df
+
+
+@pytest.fixture
+def ohlcv_frame():
+    """Factory fixture: ``ohlcv_frame(n, seed, **options)`` (see ``make_ohlcv``)."""
+    return make_ohlcv
@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+
+from gp_assistant.strategy.avwap import anchor_index, anchored_vwap
+from gp_assistant.strategy.features import compute_features
+from gp_assistant.strategy.strategies import s12_avwap
+
+
+def brute_force(df, anchors):
+    tp = ((df["high"] + df["low"] + df["close"]) / 3.0).to_numpy()
+    vol = df["volume"].to_numpy()
+    return np.array([np.nan if a < 0 else (tp[a: t + 1] * vol[a: t + 1]).sum() / vol[a: t + 1].sum()
+                     for t, a in enumerate(anchors)])
+
+
+def test_extreme_anchors_match_rolling_argmin(ohlcv_frame):
+    df = ohlcv_frame(120, 1, sigma=0.25, open_sigma=0.2)
+    idx = anchor_index(df, "low20")
+    ref = df["low"].rolling(20).apply(lambda x: x.argmin(), raw=True).to_numpy()
+    assert (idx[:19] == -1).all()
+    assert (idx[19:] == ref[19:].astype(int) + np.arange(len(df) - 19)).all()
+    hi = anchor_index(df, "high10")
+    assert (df["high"].to_numpy()[hi[9:]] == df["high"].rolling(10).max().to_numpy()[9:]).all()
+    np.testing.assert_allclose(anchored_vwap(df, "low20").to_numpy(), brute_force(df, idx), rtol=1e-12, equal_nan=True)
+
+
+def test_gap_and_event_anchors(ohlcv_frame):
+    df = ohlcv_frame(80, 2, sigma=0.25, open_sigma=0.2)
+    gap = np.abs(df["open"] / df["close"].shift() - 1) >= 0.02
+    idx = anchor_index(df, "gap")
+    last = -1
+    for t in range(len(df)):
+        last = t if gap.iloc[t] else last
+        assert idx[t] == last
+    events = [df["date"].iloc[5], df["date"].iloc[40]]
+    ev = anchor_index(df, "event", events=events)
+    assert (ev[:5] == -1).all() and (ev[5:40] == 5).all() and (ev[40:] == 40).all()
+    np.testing.assert_allclose(anchored_vwap(df, "event", events=events).to_numpy(), brute_force(df, ev), rtol=1e-12, equal_nan=True)
+
+
+def test_s12_consumes_anchored_feature(ohlcv_frame):
+    df = ohlcv_frame(150, 3, sigma=0.25, open_sigma=0.2)
+    feat = compute_features(df, ["avwap_low20"])["avwap_low20"]
+    np.testing.assert_array_equal(feat, anchored_vwap(df, "low20").to_numpy())
+    avwap = pd.Series(feat)
+    expect = (df["close"] > avwap) & (df["open"] < avwap)
+    assert s12_avwap.signal_mask(df).tolist() == expect.tolist()
+    for s in s12_avwap.detect_setups(df):
+        assert s12_avwap.key_bands(df, s)["S2"] == feat[s.idx]
@@ -0,0 +1,57 @@
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from gp_assistant.recommend.bar_cache import BarCache, cache_key
+
+
+def make_norm(n=30):
+    close = np.linspace(10, 12, n)
+    return pd.DataFrame({
+        "date": pd.bdate_range("2024-01-01", periods=n),
+        "open": close, "high": close + 0.2, "low": close - 0.2, "close": close,
+        "volume": np.full(n, 1e5), "amount": close * 1e5,
+    })
+
+
+def test_roundtrip_keeps_frame_and_meta(tmp_path):
+    cache = BarCache(tmp_path)
+    df = make_norm()
+    cache.put("000001", "akshare", "none", "2024-02-09", df, {"source": "provider:akshare", "volume_unit": "share", "len": 30})
+    hit = cache.get("000001", "akshare", "none", "2024-02-09")
+    assert hit is not None
+    got, meta = hit
+    pd.testing.assert_frame_equal(got, df, check_dtype=False)
+    assert meta == {"source": "provider:akshare", "volume_unit": "share"}
+    assert cache.get("000001", "akshare", "qfq", "2024-02-09") is None
+    assert cache_key("000001", "a", "none", None) != cache_key("000001", "a", "none", "2024-02-09")
+
+
+def test_ttl_only_applies_to_latest(tmp_path):
+    cache = BarCache(tmp_path, ttl_sec=0.0)
+    df = make_norm()
+    cache.put("000001", "akshare", "none", None, df, {})
+    cache.put("000001", "akshare", "none", "2024-02-09", df, {})
+    time.sleep(0.01)
+    assert cache.get("000001", "akshare", "none", None) is None
+    # historical as_of is immutable
+    assert cache.get("000001", "akshare", "none", "2024-02-09") is not None
+
+
+def test_lru_eviction_keeps_recently_used(tmp_path):
+    df = make_norm()
+    probe = BarCache(tmp_path / "probe")
+    probe.put("X", "p", "none", "2024-01-01", df, {})
+    size = next((tmp_path / "probe").glob("*/*.parquet")).stat().st_size
+    cache = BarCache(tmp_path / "c", max_bytes=int(size * 3.5))
+    for i, sym in enumerate(["A", "B", "C"]):
+        cache.put(sym, "p", "none", "2024-01-01", df, {})
+        fp = cache._path(cache_key(sym, "p", "none", "2024-01-01"))
+        os.utime(fp, (1000 + i, 1000 + i))
+    assert cache.get("A", "p", "none", "2024-01-01") is not None  # A becomes most recent
+    cache.put("D", "p", "none", "2024-01-01", df, {})
+    assert cache.get("B", "p", "none", "2024-01-01") is None
+    assert cache.get("A", "p", "none", "2024-01-01") is not None
+    assert cache.get("D", "p", "none", "2024-01-01") is not None
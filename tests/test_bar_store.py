@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+
+from gp_assistant.providers.bar_store import BarStore
+from gp_assistant.providers.local_provider import LocalParquetProvider
+
+
+def make_bars(start="2023-12-01", n=60):
+    dates = pd.bdate_range(start, periods=n)
+    close = np.linspace(10, 16, n)
+    return pd.DataFrame({
+        "trade_date": dates.strftime("%Y%m%d"),
+        "ts_code": "000001.SZ",
+        "open": close - 0.1,
+        "high": close + 0.3,
+        "low": close - 0.3,
+        "close": close,
+        "vol": np.linspace(1e4, 2e4, n),
+        "amount": np.linspace(1e7, 2e7, n),
+    })
+
+
+def test_append_only_adds_new_days(tmp_path):
+    store = BarStore(tmp_path)
+    bars = make_bars()
+    assert store.append("000001", bars.iloc[:40]) == 40
+    # overlapping batch: only the 20 unseen days are written
+    assert store.append("000001", bars) == 20
+    assert store.append("000001", bars) == 0
+    assert store.last_date("000001") == pd.Timestamp(bars["trade_date"].iloc[-1])
+    # partitioned by year
+    years = sorted(p.parent.name for p in (tmp_path / "ts_code=000001.SZ").glob("year=*/part-0.parquet"))
+    assert years == ["year=2023", "year=2024"]
+
+
+def test_read_pushes_down_range_and_columns(tmp_path):
+    store = BarStore(tmp_path)
+    store.append("000001", make_bars())
+    out = store.read("000001", start="2024-01-03", end="2024-01-10", columns=["close"])
+    assert list(out.columns) == ["date", "close"]
+    assert out["date"].min() >= pd.Timestamp("2024-01-03")
+    assert out["date"].max() <= pd.Timestamp("2024-01-10")
+    assert out["date"].is_monotonic_increasing
+
+
+def test_local_provider_reads_store(tmp_path):
+    prov = LocalParquetProvider(root=tmp_path)
+    prov.append_daily("000001", make_bars())
+    df = prov.get_daily("000001", start="2024-01-01", end=None)
+    assert "volume" in df.columns
+    assert df.attrs["symbol"] == "000001.SZ"
+    assert df.attrs["volume_unit"] == "hand"
+    assert prov.healthcheck()["ok"]
+
+
+def test_get_daily_many_single_scan(tmp_path):
+    prov = LocalParquetProvider(root=tmp_path)
+    bars = make_bars()
+    prov.append_daily("000001", bars)
+    prov.append_daily("600519", bars.assign(ts_code="600519.SH"))
+    out = prov.get_daily_many(["000001", "600519", "000002"], "2024-01-01", None)
+    assert set(out) == {"000001", "600519"}
+    single = prov.get_daily("600519", "2024-01-01", None)
+    assert out["600519"]["close"].tolist() == single["close"].tolist()
+    assert out["600519"].attrs["symbol"] == "600519.SH"
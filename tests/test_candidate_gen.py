@@ -0,0 +1,100 @@
+import dataclasses
+
+import numpy as np
+import pandas as pd
+
+from gp_assistant.core.config import load_config
+from gp_assistant.recommend import candidate_gen
+from gp_assistant.recommend.candidate_gen import generate_candidates
+from gp_assistant.recommend.feature_context import FeatureContext
+from gp_assistant.strategy.indicators import compute_indicators
+
+
+class FakeHub:
+    def __init__(self):
+        self.many_calls = []
+
+    @staticmethod
+    def _bars(seed, n=120):
+        rng = np.random.default_rng(seed)
+        close = 10 + np.cumsum(rng.normal(0, 0.2, n))
+        scale = 1e9 if seed % 3 else 1e6  # every third symbol fails the liquidity floor
+        return pd.DataFrame({
+            "date": pd.bdate_range("2024-01-01", periods=n),
+            "open": close + rng.normal(0, 0.1, n), "high": close + 0.3, "low": close - 0.3, "close": close,
+            "volume": np.full(n, 1e5), "amount": np.full(n, scale),
+        })
+
+    def daily_ohlcv_many(self, symbols, as_of=None, min_len=250):
+        self.many_calls.append(list(symbols))
+        got = {s: (self._bars(int(s)), {"insufficient_history": True}) for s in symbols if s != "000007"}
+        return got, {s: "bars_missing" for s in symbols if s == "000007"}
+
+
+def run(monkeypatch, workers, hub=None, snapshot=None):
+    cfg = dataclasses.replace(load_config(), candidate_workers=workers)
+    monkeypatch.setattr("gp_assistant.recommend.candidate_gen.load_config", lambda: cfg)
+    monkeypatch.setattr("gp_assistant.recommend.candidate_gen._CHUNK", 4)
+    hub = hub or FakeHub()
+    syms = [f"{i:06d}" for i in range(1, 11)]
+    ctx = FeatureContext(hub=hub)
+    pool, veto, stats = generate_candidates(syms, "B", snapshot=snapshot, ctx=ctx)
+    return ctx, pool, veto, stats
+
+
+def test_pipelined_stages_keep_order_and_stats(monkeypatch):
+    ctx, pool, veto, stats = run(monkeypatch, 0)
+    assert [len(c) for c in ctx.hub.many_calls] == [4, 4, 2]
+    assert stats["bars_missing_count"] == 1 and stats["skipped_symbols_sample"] == ["000007"]
+    assert stats["bars_too_short_count"] == 9
+    assert [v["symbol"] for v in veto] == ["000003", "000006", "000009"]
+    assert all(v["reason"] == "LOW_LIQ_HARD" for v in veto)
+    assert stats["candidates_out_count"] == len(pool) == 6
+    try:
+        _hub, pool_mp, veto_mp, stats_mp = run(monkeypatch, 2)
+        workers = candidate_gen._CPU_POOL
+        assert workers is not None and workers._mp_context.get_start_method() != "fork"
+        run(monkeypatch, 2)
+        assert candidate_gen._CPU_POOL is workers  # one long-lived pool across runs
+    finally:
+        candidate_gen.shutdown_cpu_pool()
+    assert candidate_gen._CPU_POOL is None
+    assert stats_mp.pop("candidate_workers") == 2
+    stats.pop("candidate_workers")
+    assert (pool_mp, veto_mp, stats_mp) == (pool, veto, stats)
+
+
+def test_liquidity_gate_runs_before_features(monkeypatch):
+    ctx, pool, veto, stats = run(monkeypatch, 0)
+    assert stats["stage_survivors"] == {"universe": 10, "st": 10, "bars": 9, "price_band": 9, "gap": 9, "liquidity": 6, "features": 6, "candidates": 6}
+    vetoed = {v["symbol"] for v in veto}
+    assert not vetoed & set(ctx.features)
+    for v in veto:
+        feat = compute_indicators(ctx.bars[v["symbol"]][0])
+        assert v["amount_5d_avg"] == float(feat["amount_5d_avg"].iloc[-1])
+
+
+def test_cheap_gates_veto_before_fetch_and_features(monkeypatch):
+    class GapHub(FakeHub):
+        @staticmethod
+        def _bars(seed, n=120):
+            df = FakeHub._bars(seed, n)
+            if seed == 4:  # limit-up open on the last bar
+                df.loc[n - 1, "open"] = df.loc[n - 2, "close"] * 1.1
+            return df
+
+    syms = [f"{i:06d}" for i in range(1, 11)]
+    snapshot = pd.DataFrame({
+        "代码": syms,
+        "名称": ["*ST样本" if s == "000002" else f"样本{s}" for s in syms],
+        "最新价": [900.0 if s == "000005" else 10.0 for s in syms],
+        "成交额": np.full(len(syms), 1e9),
+    })
+    ctx, pool, veto, stats = run(monkeypatch, 0, hub=GapHub(), snapshot=snapshot)
+    assert stats["stage_survivors"] == {"universe": 10, "st": 9, "bars": 8, "price_band": 7, "gap": 6, "liquidity": 3, "features": 3, "candidates": 3}
+    reasons = {v["symbol"]: v["reason"] for v in veto}
+    assert reasons["000002"] == "ST_EXCLUDED" and reasons["000005"] == "PRICE_OUT_OF_BAND" and reasons["000004"] == "GAP_LIMIT_HARD"
+    assert not any("000002" in call for call in ctx.hub.many_calls)
+    assert not set(reasons) & set(ctx.features)
+    gap = next(v["gap_pct"] for v in veto if v["symbol"] == "000004")
+    assert gap == float(compute_indicators(ctx.bars["000004"][0])["gap_pct"].iloc[-1])
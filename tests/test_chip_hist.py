@@ -0,0 +1,58 @@
+import numpy as np
+
+from gp_assistant.strategy.chip_hist import ChipHistogram, load_or_build
+
+
+def test_mass_follows_decay_recurrence_and_queries_match_brute_force(ohlcv_frame):
+    df = ohlcv_frame(200, 1, turnover=True)
+    hist = ChipHistogram.from_frame(df)
+    remain = 0.0
+    for t in df["turnover"] / 100.0:
+        remain = remain * (1 - t) + t
+    assert abs(hist.total() - remain) < 1e-9
+    close = float(df["close"].iloc[-1])
+    res = hist.result(close)
+    mids, w = hist.mids, hist.w
+    cum = np.cumsum(w) / w.sum()
+    assert res.band_90_low == mids[np.argmax(cum >= 0.05)]
+    assert res.band_90_high == mids[np.argmax(cum >= 0.95)]
+    assert abs(res.avg_cost - np.average(mids, weights=w)) < 1e-9
+    assert abs(res.profit_ratio - w[mids < close].sum() / w.sum()) < 1e-12
+    assert 0.9 <= res.concentration_90 <= 1.0
+
+
+def test_single_day_deposit_spreads_uniformly():
+    hist = ChipHistogram(step=0.1)
+    hist.update(high=10.3, low=10.0, turnover=0.3)
+    hist.update(high=10.05, low=10.05, turnover=0.5)
+    assert abs(hist.total() - 0.65) < 1e-12
+    assert np.allclose(hist.w[:3], [0.05 + 0.5, 0.05, 0.05])
+
+
+def test_incremental_restore_equals_full_replay(tmp_path, monkeypatch, ohlcv_frame):
+    monkeypatch.setenv("GP_STORE_DIR", str(tmp_path))
+    df = ohlcv_frame(150, 2, turnover=True)
+    load_or_build("000001", df.iloc[:100])
+    hist = load_or_build("000001", df)
+    full = ChipHistogram.from_frame(df)
+    assert hist.days == full.days == 150 and hist.last_date == full.last_date
+    assert np.allclose(hist.mids[hist.w > 0], full.mids[full.w > 0])
+    assert np.allclose(hist.w[hist.w > 0], full.w[full.w > 0])
+    back = ChipHistogram.from_dict(hist.to_dict())
+    assert back.result(10.0) == hist.result(10.0)
+
+
+def test_tick_prices_with_cent_step_land_in_their_own_bucket():
+    for cents in range(100, 2001):
+        p = cents / 100.0
+        hist = ChipHistogram.for_price(1.5)
+        assert hist.step == 0.01
+        hist.update(high=p + 0.05, low=p, turnover=0.2)
+        hist.update(high=p, low=p - 0.03, turnover=0.1)
+        hist.update(high=p, low=p, turnover=0.5)
+        assert abs(hist.total() - (0.2 * 0.9 * 0.5 + 0.1 * 0.5 + 0.5)) < 1e-9, p
+        assert abs(hist.lo / hist.step - round(hist.lo / hist.step)) < 1e-9
+        mids = hist.mids
+        # the flat day's deposit sits in the bucket [p, p + 0.01)
+        assert hist.w[np.argmin(np.abs(mids - (p + 0.005)))] >= 0.5, p
+        assert hist.w[-1] < 0.5, p
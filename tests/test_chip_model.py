@@ -0,0 +1,81 @@
+import numpy as np
+
+from gp_assistant.strategy.chip_model import WeightedPrices, compute_chip, compute_chip_asof, rolling_band_90_low
+from gp_assistant.strategy.strategies import s09_chip_support as s09
+
+
+def expanded_reference(df):
+    # repeat-expansion the engine replaced (models A and B) and the legacy avg_cost
+    vwap = ((df["high"] + df["low"] + df["close"]) / 3.0).to_numpy()
+    if "turnover" in df.columns:
+        t = np.clip(df["turnover"].to_numpy() / 100.0, 0, 1)
+        w = t / t.sum()
+        return np.repeat(vwap, np.maximum(1, (w * 1000).astype(int))), float((vwap * w).sum())
+    vol = df["volume"].to_numpy()
+    cuts = np.quantile(vwap, np.linspace(0, 1, 51))
+    idx = np.digitize(vwap, cuts, right=True)
+    arr = []
+    for b in dict.fromkeys(idx):
+        rep = max(1, int(vol[idx == b].sum() / max(1.0, vol.mean())))
+        arr.extend([cuts[min(b, len(cuts) - 1)]] * rep)
+    return np.array(arr), float(np.mean(arr))
+
+
+def test_weighted_quantiles_equal_repeat_expansion():
+    rng = np.random.default_rng(0)
+    prices = rng.normal(10, 1, 40)
+    counts = rng.integers(1, 30, 40)
+    dist = WeightedPrices.build(prices, counts)
+    expanded = np.repeat(prices, counts)
+    qs = np.array([0.0, 0.05, 0.33, 0.5, 0.95, 1.0])
+    np.testing.assert_allclose(dist.quantile(qs), np.quantile(expanded, qs), rtol=0, atol=1e-12)
+    assert dist.share_below(10.0) == (expanded < 10.0).mean()
+    assert dist.share_between(9.5, 10.5) == ((expanded >= 9.5) & (expanded <= 10.5)).mean()
+
+
+def test_compute_chip_matches_legacy_models(ohlcv_frame):
+    for df in (ohlcv_frame(250, 1), ohlcv_frame(120, 2, turnover=True)):
+        chip, _ = compute_chip(df)
+        ref, avg_cost = expanded_reference(df)
+        close = df["close"].iloc[-1]
+        low, high = np.quantile(ref, [0.05, 0.95])
+        assert chip.sample_n == len(ref)
+        assert abs(chip.band_90_low - low) < 1e-9 and abs(chip.band_90_high - high) < 1e-9
+        assert abs(chip.avg_cost - avg_cost) < 1e-12
+        assert abs(chip.profit_ratio - (ref < close).mean()) < 1e-12
+        assert abs(chip.concentration_90 - ((ref >= low) & (ref <= high)).mean()) < 1e-12
+
+
+def test_asof_rows_equal_prefix_computation(ohlcv_frame):
+    df = ohlcv_frame(90, 3)
+    asof = compute_chip_asof(df)
+    assert len(asof) == len(df)
+    for t in (0, 10, 45, 89):
+        chip, _ = compute_chip(df.iloc[: t + 1])
+        assert asof.iloc[t].to_dict() == chip.__dict__
+    # model A: incrementally sorted prefix equals a fresh sort at every bar
+    dft = ohlcv_frame(120, 4, turnover=True)
+    dft.loc[30:33, "high"] = dft.loc[30:33, "low"] = dft.loc[30:33, "close"] = 9.5  # ties
+    asof_a = compute_chip_asof(dft)
+    for t in range(len(dft)):
+        chip, meta = compute_chip(dft.iloc[: t + 1])
+        assert meta["model"] == "A" and asof_a.iloc[t].to_dict() == chip.__dict__, t
+    one = compute_chip_asof(df, positions=[45])
+    assert one.index.tolist() == [45] and one.iloc[0].to_dict() == asof.iloc[45].to_dict()
+
+
+def test_rolling_band_equals_window_computation(ohlcv_frame):
+    for df in (ohlcv_frame(160, 6), ohlcv_frame(160, 7, turnover=True)):
+        df.loc[70:75, "high"] = df.loc[70:75, "low"] = df.loc[70:75, "close"] = 9.5  # ties
+        band = rolling_band_90_low(df, 40)
+        assert len(band) == len(df)
+        for t in range(len(df)):
+            chip, _ = compute_chip(df.iloc[max(0, t - 39) : t + 1])
+            assert band[t] == chip.band_90_low, t
+
+
+def test_s09_support_uses_only_past_bars(ohlcv_frame):
+    df = ohlcv_frame(120, 5)
+    full = s09.signal_mask(df)
+    head = s09.signal_mask(df.iloc[:80].copy())
+    assert full.iloc[:80].tolist() == head.tolist()
@@ -0,0 +1,69 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from gp_assistant.recommend import concept_index as ci
+from gp_assistant.recommend.agent import _diversify
+from gp_assistant.recommend.theme_pool import build_themes
+
+
+def fake_builders():
+    members = {"算力": ["000001", "000002"], "电池": ["000003", "000004"], "白酒": ["000005"]}
+    industries = {"通信设备": ["000001", "000002"], "电池": ["000003", "000004", "000005"]}
+    return dict(
+        fetch_names=lambda: pd.DataFrame({"板块名称": list(members), "涨跌幅": [1.0, 2.0, 3.0]}),
+        fetch_members=lambda b: pd.DataFrame({"代码": members[b]}),
+        fetch_industries=lambda: pd.DataFrame({"板块名称": list(industries)}),
+        fetch_industry_members=lambda b: pd.DataFrame({"代码": industries[b]}),
+        today="2024-06-03",
+    )
+
+
+def test_refresh_job_persists_and_lookups_need_no_network(monkeypatch, tmp_path):
+    monkeypatch.setenv("GP_STORE_DIR", str(tmp_path))
+    monkeypatch.setattr(ci, "_INDEX", None)
+    built = ci.refresh_index(**fake_builders())
+    assert (tmp_path / "index" / "concepts.json").exists()
+    monkeypatch.setattr(ci, "_INDEX", None)
+    idx = ci.get_concept_index()
+    assert idx == built and idx.industry_of("000004") == "电池" and idx.industry_of("999999") is None
+    assert idx.industries_for(["000002", "999999", "000005"]).tolist() == ["通信设备", None, "电池"]
+    strength = idx.concept_strength(["000001", "000002", "000003", "000005"], [5.0, 3.0, -1.0, np.nan])
+    assert strength.index.tolist() == ["算力", "电池"]
+    assert strength.loc["算力", "mean"] == 4.0 and strength.loc["电池", "count"] == 1
+
+
+def test_themes_use_local_index(monkeypatch):
+    idx = ci.build_index(**fake_builders())
+    snap = pd.DataFrame({"代码": ["000001", "000002", "000003", "000004", "000005"], "涨跌幅": [5.0, 3.0, -1.0, 0.0, 2.0]})
+    monkeypatch.setattr("gp_assistant.recommend.theme_pool.get_concept_index", lambda: idx)
+    themes = build_themes(None, snapshot=snap)
+    assert [t["name"] for t in themes] == ["通信设备", "电池"]
+    monkeypatch.setattr("gp_assistant.recommend.theme_pool.get_concept_index", lambda: ci.ConceptIndex("2024-06-03", idx.concepts, idx.ranks))
+    assert [t["name"] for t in build_themes(None, snapshot=snap)] == ["概念-算力", "概念-白酒"]
+
+
+def test_max_per_industry_is_enforced():
+    picks = [{"symbol": s, "industry": ind} for s, ind in
+             [("A", "银行"), ("B", "银行"), ("C", "银行"), ("D", None), ("E", "电力"), ("F", "银行")]]
+    kept, capped = _diversify(picks, 4, 2)
+    assert [p["symbol"] for p in kept] == ["A", "B", "D", "E"] and capped == ["C"]
+    assert [p["symbol"] for p in _diversify(picks, 3, 0)[0]] == ["A", "B", "C"]
+
+
+def test_server_process_picks_up_index_rewritten_elsewhere(monkeypatch, tmp_path):
+    monkeypatch.setenv("GP_STORE_DIR", str(tmp_path))
+    monkeypatch.setattr(ci, "_INDEX", None)
+    monkeypatch.setattr(ci, "_INDEX_STAMP", None)
+    assert ci.get_concept_index() is None
+    ci.save_index(ci.build_index(**fake_builders()))
+    first = ci.get_concept_index()
+    assert first.built_on == "2024-06-03" and ci.get_concept_index() is first
+    # the daily job in another process rewrites the file
+    newer = ci.build_index(**dict(fake_builders(), today="2024-06-04"))
+    ci.save_index(newer)
+    st = ci.index_path().stat()
+    os.utime(ci.index_path(), ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    got = ci.get_concept_index()
+    assert got.built_on == "2024-06-04" and got.fresh("2024-06-04") and not first.fresh("2024-06-04")
@@ -0,0 +1,42 @@
+import threading
+
+from gp_assistant.providers import akshare_provider as ap
+
+
+class FakeResp:
+    def __init__(self, payload):
+        self._payload = payload
+
+    def json(self):
+        return self._payload
+
+
+class FakeSession:
+    """Serves 250 rows in pages capped at 100 regardless of the requested pz."""
+
+    def __init__(self):
+        self.pages = []
+        self.lock = threading.Lock()
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        pn = int(params["pn"])
+        with self.lock:
+            self.pages.append(pn)
+        rows = [
+            {"f12": f"{i:06d}", "f14": f"S{i}", "f2": 10.0 + i, "f3": 1.0, "f6": 1e8, "f8": 2.5, "f10": "-"}
+            for i in range((pn - 1) * 100, min(pn * 100, 250))
+        ]
+        return FakeResp({"data": {"total": 250, "diff": rows}})
+
+
+def test_em_direct_sizes_pages_from_first_response(monkeypatch):
+    sess = FakeSession()
+    monkeypatch.setattr(ap, "_pooled_session", lambda: sess)
+    df = ap.AkShareProvider()._em_spot_direct()
+    assert sorted(sess.pages) == [1, 2, 3]
+    assert sess.pages[0] == 1
+    assert list(df.columns[:5]) == ["代码", "名称", "最新价", "涨跌幅", "成交额"]
+    assert df["代码"].tolist() == [f"{i:06d}" for i in range(250)]
+    assert df["换手率"].dtype == "float64"
+    assert df["量比"].isna().all()
+    assert df["最新价"].iloc[-1] == 259.0
@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+
+from gp_assistant.strategy.event_study import event_study_from_mask, event_study_many, forward_min, forward_stats
+
+
+def loop_reference(close, idxs):
+    # per-event loop the vectorized engine replaced
+    n = len(close)
+    f = {2: [], 5: [], 10: []}
+    mdds = []
+    for i in idxs:
+        if i + 1 >= n:
+            continue
+        entry = close[i + 1]
+        for h in f:
+            if i + h < n:
+                f[h].append(close[i + h] / entry - 1.0)
+        mdds.append(close[i + 1: min(n - 1, i + 10) + 1].min() / entry - 1.0)
+    wr = {h: (sum(x > 0 for x in v) / len(v) if v else 0.0) for h, v in f.items()}
+    mean = {h: (float(np.mean(v)) if v else 0.0) for h, v in f.items()}
+    return min(len(v) for v in f.values()), wr, mean, (float(np.mean(mdds)) if mdds else 0.0)
+
+
+def test_engine_matches_loop_reference_for_many_masks():
+    rng = np.random.default_rng(3)
+    n = 120
+    close = 10 + np.cumsum(rng.normal(0, 0.3, n))
+    df = pd.DataFrame({"close": close})
+    masks = {f"m{j}": pd.Series(rng.random(n) < p, index=df.index) for j, p in enumerate((0.05, 0.2, 0.0))}
+    masks["tail"] = pd.Series(np.arange(n) >= n - 4, index=df.index)
+    batch = event_study_many(df, masks)
+    for key, mask in masks.items():
+        k, wr, mean, mdd = loop_reference(close, list(np.flatnonzero(mask.to_numpy())))
+        for st in (batch[key], event_study_from_mask(df, mask)):
+            assert st.k == k
+            assert st.sample_warning == (k < 5)
+            assert abs(st.win_rate_2 - wr[2]) < 1e-12 and abs(st.win_rate_10 - wr[10]) < 1e-12
+            assert abs(st.mean_return_5 - mean[5]) < 1e-12 and abs(st.mean_return_10 - mean[10]) < 1e-12
+            assert abs(st.mdd10_proxy - mdd) < 1e-12
+
+
+def test_forward_min_and_arbitrary_horizons():
+    close = np.array([5.0, 4.0, np.nan, 6.0, 3.0, 7.0])
+    np.testing.assert_array_equal(forward_min(close, 3), [4.0, 4.0, 3.0, 3.0, 3.0, 7.0])
+    mask = np.zeros(6, dtype=bool)
+    mask[0] = True
+    fs = forward_stats(np.arange(1.0, 9.0), np.vstack([np.r_[mask, False, False], np.zeros(8, dtype=bool)]), (1, 3, 7))
+    assert fs.horizons == (1, 3, 7)
+    assert fs.counts.tolist() == [[1, 1, 1], [0, 0, 0]]
+    assert abs(fs.mean_return[0, fs.column(3)] - (4.0 / 2.0 - 1.0)) < 1e-12
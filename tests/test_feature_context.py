@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+
+from gp_assistant.recommend.feature_context import FeatureContext
+
+
+class CountingHub:
+    def __init__(self):
+        self.many_calls = []
+        self.single_calls = []
+
+    @staticmethod
+    def _bars(n=80):
+        close = np.linspace(10, 14, n)
+        return pd.DataFrame({
+            "date": pd.bdate_range("2024-01-01", periods=n),
+            "open": close, "high": close + 0.2, "low": close - 0.2, "close": close,
+            "volume": np.full(n, 1e5), "amount": close * 1e5,
+        })
+
+    def daily_ohlcv_many(self, symbols, as_of=None, min_len=250):
+        self.many_calls.append(list(symbols))
+        return {s: (self._bars(), {"source": "test"}) for s in symbols if s != "BAD"}, {"BAD": "bars_missing"}
+
+    def daily_ohlcv(self, symbol, as_of=None, min_len=250):
+        self.single_calls.append(symbol)
+        return self._bars(), {"source": "test"}
+
+
+def test_bars_and_indicators_computed_once():
+    hub = CountingHub()
+    ctx = FeatureContext(hub=hub)
+    assert set(ctx.load_bars(["A", "B", "BAD"])) == {"A", "B"}
+    ctx.load_bars(["A", "B", "BAD"])
+    assert hub.many_calls == [["A", "B", "BAD"]]
+    f1 = ctx.features_for("A")
+    assert ctx.features_for("A") is f1
+    assert hub.single_calls == []
+    calls = []
+    ctx.setups_for("s01", "A", lambda df: calls.append(1) or [len(df)])
+    assert ctx.setups_for("s01", "A", lambda df: calls.append(1) or [len(df)]) == [80]
+    assert len(calls) == 1
+    s = ctx.summary()
+    assert s["indicators_computed"] == 1 and s["indicators_reused"] == 2
+    assert s["bar_errors"] == 1
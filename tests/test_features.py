@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from gp_assistant.strategy import library
+from gp_assistant.strategy.features import compute_features, feature_memo, lookback, resolve, with_features
+from gp_assistant.strategy.indicators import compute_indicators
+from gp_assistant.strategy.panel import compute_indicators_many
+from gp_assistant.tools.signals import compute_indicators as signals_indicators
+
+
+def test_recommend_rank_and_panel_paths_agree_exactly(ohlcv_frame):
+    a, b = ohlcv_frame(200, 1), ohlcv_frame(80, 2)
+    rec = compute_indicators(a)
+    rank = signals_indicators(a, None)
+    panel = compute_indicators_many({"A": a, "B": b})["A"]
+    shared = [c for c in rank.columns if c in rec.columns and c not in a.columns]
+    assert {"ma20", "bias6", "rsi2", "bbwidth20", "nr7", "volratio10", "atr14", "atr_pct"} <= set(shared)
+    for c in shared:
+        np.testing.assert_array_equal(rec[c].to_numpy(), rank[c].to_numpy(), err_msg=c)
+        np.testing.assert_array_equal(rec[c].to_numpy(), panel[c].to_numpy(), err_msg=c)
+
+
+def test_memo_computes_only_requested_features(ohlcv_frame):
+    df = ohlcv_frame(60, 3)
+    first = compute_features(df, ["rsi2"])
+    memo = feature_memo(df)
+    assert "rsi2" in memo and "ma20" not in memo and "tr" not in memo
+    again = compute_features(df, ["rsi2"])
+    assert again["rsi2"] is first["rsi2"] or np.shares_memory(again["rsi2"], first["rsi2"])
+    assert with_features(df, []) is df
+
+
+def test_strategy_features_resolve_and_window():
+    for name in library.required_features():
+        assert resolve(name).name == name
+    assert lookback(["ma20"]) == 20
+    assert lookback(["slope20"]) == 25
+    with pytest.raises(ValueError):
+        resolve("no_such_feature")
+
+
+def test_rsi2_is_nan_on_flat_window(ohlcv_frame):
+    # e.g. a suspended or limit-locked name: no gains and no losses at all
+    df = ohlcv_frame(40, 6)
+    df[["open", "high", "low", "close"]] = 10.0
+    assert np.isnan(compute_features(df, ["rsi2"])["rsi2"]).all()
+    feat = compute_indicators(df)
+    for sid in ("S2", "S11"):
+        assert not library.get(sid).signal_mask(feat).any(), sid
@@ -0,0 +1,62 @@
+import dataclasses
+
+import pandas as pd
+
+from gp_assistant.core.config import load_config
+from gp_assistant.providers.akshare_provider import AkShareProvider
+from gp_assistant.providers.fetch_pool import FetchPool, TokenBucket
+
+
+def make_hist(n=5):
+    return pd.DataFrame({
+        "日期": pd.date_range("2024-01-01", periods=n).strftime("%Y-%m-%d"),
+        "开盘": [10.0] * n, "收盘": [10.5] * n, "最高": [11.0] * n, "最低": [9.5] * n, "成交量": [1000] * n,
+    })
+
+
+def test_pool_isolates_failures_and_reports_latency():
+    def fetch(key):
+        if key == "bad":
+            raise RuntimeError("boom")
+        return key.upper()
+
+    res = FetchPool(max_workers=4, rate_per_sec=1000).run(["a", "bad", "b"], fetch, route="r", host="test-host-1")
+    assert res.results == {"a": "A", "b": "B"}
+    assert set(res.errors) == {"bad"}
+    assert res.latency["r"]["count"] == 3
+    assert res.latency["r"]["failed"] == 1
+
+
+def test_token_bucket_limits_rate():
+    b = TokenBucket(rate=50, burst=1)
+    b.acquire()
+    assert b.acquire() > 0.0
+
+
+def test_throttled_upstream_trips_circuit(monkeypatch):
+    AkShareProvider._circuit = {}
+    prov = AkShareProvider()
+    calls = []
+
+    def fake_fetch(ak, sym, start, end):
+        calls.append(sym)
+        if sym.startswith("9"):
+            raise ConnectionError("429 Too Many Requests")
+        return make_hist()
+
+    monkeypatch.setattr(prov, "_import", lambda: None)
+    monkeypatch.setattr(prov, "_fetch_hist", fake_fetch)
+    monkeypatch.setattr(prov, "_call_with_retry", lambda fn, retries=1: fn())
+    # serial pool so the trip point is deterministic
+    cfg = dataclasses.replace(load_config(), fetch_concurrency=1)
+    monkeypatch.setattr("gp_assistant.providers.akshare_provider.load_config", lambda: cfg)
+
+    syms = ["000001"] + [f"9000{i:02d}" for i in range(10)]
+    out = prov.get_daily_many(syms, None, None)
+    assert list(out) == ["000001"]
+    assert "date" in out["000001"].columns
+    # after THRESHOLD upstream failures the remaining symbols fail fast
+    assert len(calls) == 1 + AkShareProvider._CB_THRESHOLD
+    errs = prov.last_fetch_stats()["errors"]
+    assert sum(1 for e in errs.values() if e.startswith("circuit_open")) == 10 - AkShareProvider._CB_THRESHOLD
+    AkShareProvider._circuit = {}
@@ -0,0 +1,36 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from gp_assistant.core.http import HttpClient
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_keep_alive_reuses_connection():
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    t = threading.Thread(target=srv.serve_forever, daemon=True)
+    t.start()
+    try:
+        client = HttpClient(pool_connections=2, pool_maxsize=2)
+        url = f"http://127.0.0.1:{srv.server_port}/x"
+        for _ in range(3):
+            assert client.get(url, timeout=5).json() == {"ok": True}
+        st = client.stats()["hosts"]["127.0.0.1"]
+        assert st == {"requests": 3, "connections": 1, "reused": 2}
+        client.close()
+    finally:
+        srv.shutdown()
+        srv.server_close()
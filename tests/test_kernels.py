@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+
+from gp_assistant.strategy import kernels as K
+from gp_assistant.strategy.features import compute_features
+from gp_assistant.strategy.indicators import true_range, wilder_rma
+
+
+def test_wilder_rma_and_true_range_match_pandas_reference(ohlcv_frame):
+    df = ohlcv_frame(300, 1)
+    tr = K.true_range(*(K.as_2d(df[c].to_numpy()) for c in ("high", "low", "close")))[:, 0]
+    np.testing.assert_allclose(tr, true_range(df).to_numpy(), rtol=0, atol=0)
+    ref = wilder_rma(pd.Series(tr), 14).to_numpy()
+    np.testing.assert_allclose(K.wilder_rma(K.as_2d(tr), 14)[:, 0], ref, rtol=1e-12)
+    np.testing.assert_allclose(K._wilder_rma_loop(K.as_2d(tr), 1 / 14)[:, 0], ref, rtol=1e-12)
+    # leading NaNs (panel padding) are skipped, wide blocks equal per-column results
+    block = np.column_stack([np.r_[np.full(5, np.nan), tr[:-5]], tr])
+    got = K.wilder_rma(block, 14)
+    np.testing.assert_array_equal(got[:, 1], K.wilder_rma(K.as_2d(tr), 14)[:, 0])
+    np.testing.assert_array_equal(got, K._wilder_rma_loop(block, 1 / 14))
+
+
+def test_rolling_extrema_match_pandas_with_gaps():
+    rng = np.random.default_rng(2)
+    x = rng.normal(size=(200, 3))
+    x[:7, 1] = np.nan
+    x[50, 2] = np.nan
+    frame = pd.DataFrame(x)
+    for w in (1, 7, 20, 64, 201):
+        ref_min = frame.rolling(w).min().to_numpy()
+        ref_max = frame.rolling(w).max().to_numpy()
+        np.testing.assert_array_equal(K.rolling_min(x, w), ref_min)
+        np.testing.assert_array_equal(K.rolling_max(x, w), ref_max)
+        np.testing.assert_array_equal(K._rolling_extreme_blocks(x, w, np.minimum), ref_min)
+        np.testing.assert_array_equal(K._rolling_extreme_blocks(x, w, np.maximum), ref_max)
+        # deque kernel body (the JIT target) run uncompiled
+        np.testing.assert_array_equal(K._rolling_extreme_loop(x, w, 1.0), ref_min)
+        np.testing.assert_array_equal(K._rolling_extreme_loop(x, w, -1.0), ref_max)
+
+
+def test_rolling_quantile_matches_pandas_and_feeds_squeeze_threshold(ohlcv_frame):
+    rng = np.random.default_rng(3)
+    x = rng.normal(size=(250, 3))
+    x[:7, 1] = np.nan
+    x[50, 2] = np.nan
+    for w, q in ((1, 0.5), (20, 0.0), (60, 0.2), (60, 1.0)):
+        ref = pd.DataFrame(x).rolling(w).quantile(q).to_numpy()
+        np.testing.assert_array_equal(K.rolling_quantile(x, w, q), ref)
+        np.testing.assert_array_equal(K._rolling_quantile_loop(x, w, q), ref)
+        np.testing.assert_array_equal(K._rolling_quantile_lists(x, w, q), ref)
+        np.testing.assert_array_equal(K._rolling_quantile_lists(x[:, 2], w, q), ref[:, 2])
+    df = ohlcv_frame(200, 4)
+    got = compute_features(df, ["bbwidth20", "bbwidth20_q20"])
+    ref = pd.Series(got["bbwidth20"]).rolling(60).quantile(0.2).to_numpy()
+    np.testing.assert_array_equal(got["bbwidth20_q20"], ref)
@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+
+from gp_assistant.strategy.indicators import compute_indicators
+from gp_assistant.strategy.panel import INDICATOR_COLUMNS, Panel, compute_indicators_many, compute_panel
+
+
+def test_panel_matches_per_symbol_indicators(ohlcv_frame):
+    frames = {"A": ohlcv_frame(260, 1), "B": ohlcv_frame(90, 2), "C": ohlcv_frame(15, 3, amount=False)}
+    frames["A"].attrs["symbol"] = "A"
+    views = compute_indicators_many(frames)
+    for sym, df in frames.items():
+        ref = compute_indicators(df)
+        got = views[sym]
+        assert list(got.columns) == list(ref.columns)
+        assert got.attrs == ref.attrs
+        for c in INDICATOR_COLUMNS:
+            if ref[c].dtype == bool:
+                assert got[c].tolist() == ref[c].tolist(), (sym, c)
+            else:
+                np.testing.assert_allclose(got[c].to_numpy(dtype=float), ref[c].to_numpy(dtype=float), rtol=1e-8, atol=1e-10, equal_nan=True, err_msg=f"{sym}:{c}")
+
+
+def test_long_frame_and_cross_section(ohlcv_frame):
+    a, b = ohlcv_frame(70, 4), ohlcv_frame(70, 5)
+    long = pd.concat([a.assign(ts_code="A"), b.assign(ts_code="B")], ignore_index=True)
+    feats = compute_panel(Panel.from_long(long))
+    last = feats.last()
+    assert list(last.index) == ["A", "B"]
+    assert abs(last.loc["B", "ma20"] - compute_indicators(b)["ma20"].iloc[-1]) < 1e-9
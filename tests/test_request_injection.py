@@ -0,0 +1,70 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import BaseAdapter
+
+from gp_assistant.providers import akshare_provider as ap
+
+
+class RecordingAdapter(BaseAdapter):
+    def __init__(self):
+        super().__init__()
+        self.seen = []
+        self.closed = 0
+
+    def send(self, request, **kwargs):
+        self.seen.append((request.url, kwargs.get("timeout"), request.headers.get("User-Agent")))
+        resp = requests.Response()
+        resp.status_code = 200
+        resp._content = b"{}"
+        resp.url = request.url
+        resp.request = request
+        return resp
+
+    def close(self):
+        self.closed += 1
+
+
+def test_concurrent_timeouts_do_not_clobber(monkeypatch):
+    pooled = RecordingAdapter()
+    monkeypatch.setattr(ap, "_pooled_adapter", lambda: pooled)
+    provs = [ap.AkShareProvider(timeout_sec=float(t)) for t in range(1, 9)]
+
+    def call(prov):
+        # throwaway-session call (as akshare does) goes through the pooled transport
+        return prov._with_requests_timeout(lambda: requests.get(f"http://host.invalid/{prov.timeout_sec}"))
+
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        list(ex.map(call, provs * 4))
+    assert len(pooled.seen) == 32
+    for url, timeout, ua in pooled.seen:
+        assert float(url.rsplit("/", 1)[1]) == timeout
+        assert ua == ap.DEFAULT_UA
+    assert pooled.closed == 0  # throwaway sessions closing do not tear down the pool
+    # the hook is installed once and stays a pass-through outside the context
+    hook = requests.sessions.Session.request
+    call(provs[0])
+    assert requests.sessions.Session.request is hook
+    assert getattr(ap._REQ_LOCAL, "ctx", None) is None
+
+
+def test_configured_sessions_keep_their_transport(monkeypatch):
+    pooled, own = RecordingAdapter(), RecordingAdapter()
+    monkeypatch.setattr(ap, "_pooled_adapter", lambda: pooled)
+    sess = requests.Session()
+    sess.mount("http://", own)
+    ap.AkShareProvider(timeout_sec=7)._with_requests_timeout(lambda: sess.get("http://host.invalid/x"))
+    assert pooled.seen == [] and own.seen[0][1] == 7
+    for attr, val in (("proxies", {"http": "http://proxy:3128"}), ("verify", "/etc/ca.pem"), ("cert", "/tmp/c.pem"), ("auth", ("u", "p"))):
+        s = requests.Session()
+        setattr(s, attr, val)
+        assert not ap._default_transport(s), attr
+    assert ap._default_transport(requests.Session())
+
+
+def test_pooled_session_is_per_thread():
+    main = ap._pooled_session()
+    with ThreadPoolExecutor(max_workers=1) as ex:
+        other = ex.submit(ap._pooled_session).result()
+    assert main is ap._pooled_session() and other is not main
+    assert main.get_adapter("https://x") is other.get_adapter("https://x") is ap._pooled_adapter()
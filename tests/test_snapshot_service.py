@@ -0,0 +1,98 @@
+from datetime import datetime
+import zoneinfo
+
+import pandas as pd
+
+from gp_assistant.recommend import snapshot_service as ss
+from gp_assistant.recommend.calendar import seconds_to_session_open, trading_window_now
+
+
+class FakeProvider:
+    name = "fake"
+
+    def __init__(self):
+        self.calls = []
+
+    def get_spot_snapshot(self, *, max_cache_age_sec=120.0):
+        self.calls.append(max_cache_age_sec)
+        return pd.DataFrame({"代码": ["000001"], "最新价": [10.0 + len(self.calls)]})
+
+    def last_snapshot_meta(self):
+        return {"source": "em:direct", "cache": None, "stale": False, "missing": False, "skipped_routes": []}
+
+
+def test_refresh_publishes_versions_and_notifies(monkeypatch):
+    prov = FakeProvider()
+    monkeypatch.setattr(ss, "get_provider", lambda: prov)
+    svc = ss.SnapshotService(interval_sec=5)
+    seen = []
+    unsub = svc.subscribe(lambda pub: seen.append(pub.version))
+    p1 = svc.refresh_once()
+    p2 = svc.refresh_once()
+    unsub()
+    svc.refresh_once()
+    assert prov.calls == [0.0, 0.0, 0.0]  # provider memory cache bypassed
+    assert (p1.version, p2.version) == (1, 2)
+    assert seen == [1, 2]
+    assert p1.df["最新价"].iloc[0] == 11.0  # earlier version untouched
+    df, meta = svc.snapshot()
+    assert meta["source"] == "em:direct" and meta["service_version"] == 3
+    assert "published_age_sec" in meta
+
+
+def test_failed_refresh_keeps_last_version(monkeypatch):
+    def boom():
+        raise RuntimeError("down")
+
+    svc = ss.SnapshotService(interval_sec=5)
+    assert svc.meta()["missing"] is True
+    monkeypatch.setattr(ss, "get_provider", boom)
+    assert svc.refresh_once() is None
+    assert svc.meta()["error"] == "down"
+
+
+def test_in_session_flag():
+    z = zoneinfo.ZoneInfo("Asia/Shanghai")
+    assert trading_window_now(datetime(2024, 3, 5, 10, 0, tzinfo=z)).in_session
+    assert not trading_window_now(datetime(2024, 3, 5, 12, 0, tzinfo=z)).in_session
+    assert not trading_window_now(datetime(2024, 3, 9, 10, 0, tzinfo=z)).in_session  # Saturday
+
+
+def test_idle_wait_is_cut_at_session_open():
+    z = zoneinfo.ZoneInfo("Asia/Shanghai")
+    svc = ss.SnapshotService(interval_sec=30, idle_interval_sec=1800)
+    svc.publish(pd.DataFrame(), {})
+    assert svc._next_wait(datetime(2024, 3, 5, 9, 20, tzinfo=z)) == 600.0  # pre-open
+    assert svc._next_wait(datetime(2024, 3, 5, 12, 55, tzinfo=z)) == 300.0  # lunch break
+    assert svc._next_wait(datetime(2024, 3, 5, 10, 0, tzinfo=z)) == 30.0  # in session
+    assert svc._next_wait(datetime(2024, 3, 5, 20, 0, tzinfo=z)) == 1800.0  # evening
+    assert svc._next_wait(datetime(2024, 3, 9, 20, 0, tzinfo=z)) == 1800.0  # weekend
+
+
+def test_loop_refreshes_every_tick_across_the_open(monkeypatch):
+    z = zoneinfo.ZoneInfo("Asia/Shanghai")
+    clock = iter([datetime(2024, 3, 5, 9, 0, tzinfo=z), datetime(2024, 3, 5, 9, 29, tzinfo=z), datetime(2024, 3, 5, 9, 30, tzinfo=z)])
+    state = {"now": None}
+    prov = FakeProvider()
+    monkeypatch.setattr(ss, "get_provider", lambda: prov)
+    monkeypatch.setattr(ss, "trading_window_now", lambda now=None: trading_window_now(now or state["now"]))
+    monkeypatch.setattr(ss, "seconds_to_session_open", lambda now=None: seconds_to_session_open(now or state["now"]))
+
+    svc = ss.SnapshotService(interval_sec=30, idle_interval_sec=1800)
+    waits = []
+
+    class Stop:
+        def is_set(self):
+            try:
+                state["now"] = next(clock)
+                return False
+            except StopIteration:
+                return True
+
+        def wait(self, sec):
+            waits.append(sec)
+
+    svc._stop = Stop()
+    svc._loop()
+    assert len(prov.calls) == 3  # idle ticks refresh too, not only the first
+    assert waits == [1800.0, 60.0, 30.0]
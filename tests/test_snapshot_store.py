@@ -0,0 +1,75 @@
+import threading
+import time
+
+import pandas as pd
+
+from gp_assistant.providers.snapshot_store import SnapshotTable
+
+
+def make_spot():
+    return pd.DataFrame({
+        "代码": ["000001", "600519", "300750"],
+        "名称": ["平安银行", "贵州茅台", "宁德时代"],
+        "最新价": ["10.5", "1700", "-"],
+        "涨跌幅": [1.2, -0.5, 0.0],
+        "成交额": [1e9, 5e9, 3e9],
+    })
+
+
+def test_apply_merges_per_code_deltas():
+    t = SnapshotTable()
+    v1 = t.apply(make_spot(), source="em:direct")
+    assert v1.version == 1
+    assert v1.df["最新价"].dtype == "float64"
+    assert pd.isna(v1.df.loc[2, "最新价"])
+    upd = make_spot().iloc[:2].copy()
+    upd.loc[0, "最新价"] = "10.8"
+    upd = pd.concat([upd, pd.DataFrame({"代码": ["688981"], "名称": ["中芯国际"], "最新价": ["50"], "涨跌幅": [2.0], "成交额": [4e9]})])
+    v2 = t.apply(upd, source="em:direct")
+    assert (v2.version, v2.changed, v2.added, v2.removed) == (2, 1, 1, 1)
+    by_code = v2.df.set_index("代码")
+    assert by_code.loc["000001", "最新价"] == 10.8
+    assert "300750" not in by_code.index  # absent from the refresh (suspended): dropped
+    assert by_code.index.tolist() == ["000001", "600519", "688981"]
+    # published versions are not mutated
+    assert v1.df.set_index("代码").loc["000001", "最新价"] == 10.5
+
+
+def test_refresh_is_single_flight():
+    t = SnapshotTable()
+    calls = []
+    gate = threading.Event()
+
+    def fetch():
+        calls.append(1)
+        gate.wait(2)
+        return "df"
+
+    out = []
+    ths = [threading.Thread(target=lambda: out.append(t.refresh(fetch))) for _ in range(5)]
+    for th in ths:
+        th.start()
+    time.sleep(0.1)
+    gate.set()
+    for th in ths:
+        th.join()
+    assert len(calls) == 1
+    assert sorted(c for _, c in out) == [False, True, True, True, True]
+
+
+def test_disk_roundtrip_is_typed(tmp_path):
+    t = SnapshotTable()
+    t.apply(make_spot(), source="em:direct")
+    fp = tmp_path / "spot_latest.parquet"
+    t.save_disk(fp)
+    df, age = SnapshotTable.load_disk(3600, fp)
+    assert age < 60
+    assert df["代码"].tolist() == ["000001", "600519", "300750"]
+    assert df["成交额"].dtype == "float64"
+    assert SnapshotTable.load_disk(-1, fp) is None
+
+
+def test_apply_keeps_given_fetch_time():
+    t = SnapshotTable()
+    snap = t.apply(make_spot(), source="disk_cache", ts=time.time() - 3600)
+    assert snap.age_sec() >= 3599
@@ -0,0 +1,51 @@
+import time
+
+from gp_assistant.strategy import library
+from gp_assistant.strategy.batch import evaluate_strategies
+from gp_assistant.strategy.features import with_features
+from gp_assistant.strategy.indicators import compute_indicators
+
+
+def test_batch_matches_per_strategy_calls(ohlcv_frame):
+    feat = compute_indicators(ohlcv_frame(300, 11, sigma=0.25))
+    res = evaluate_strategies(feat)
+    assert not res.errors
+    assert set(res.masks) == set(library.REGISTRY)
+    for sid, mod in library.REGISTRY.items():
+        setups = mod.detect_setups(feat)
+        assert [(s.idx, s.note) for s in res.setups[sid]] == [(s.idx, s.note) for s in setups], sid
+        assert res.events[sid].__dict__ == mod.event_study(feat, setups).__dict__, sid
+
+
+def test_strategy_without_mask_uses_legacy_hooks(ohlcv_frame):
+    class Legacy:
+        @staticmethod
+        def detect_setups(df):
+            return [len(df) - 1]
+
+        @staticmethod
+        def event_study(df, setups):
+            return {"n": len(setups)}
+
+    res = evaluate_strategies(compute_indicators(ohlcv_frame(80, 12, sigma=0.25)), {"S1": library.get("S1"), "X": Legacy})
+    assert res.setups["X"] == [79] and res.events["X"] == {"n": 1}
+    assert "S1" in res.masks
+
+
+
+def test_no_strategy_mask_dominates_batch_cost(ohlcv_frame):
+    # a per-bar rebuild of history (e.g. an O(n^2) as-of series) costs tens of times
+    # all other masks together at this length; vectorized masks stay within a few
+    feat = with_features(compute_indicators(ohlcv_frame(3000, 13, sigma=0.25)), library.required_features(library.REGISTRY))
+    cost = {}
+    for sid, mod in library.REGISTRY.items():
+        runs = []
+        for _ in range(3):
+            df = feat.copy()  # fresh per-frame memo
+            t0 = time.perf_counter()
+            mod.signal_mask(df)
+            runs.append(time.perf_counter() - t0)
+        cost[sid] = min(runs)
+    total = sum(cost.values())
+    for sid, c in cost.items():
+        assert c < 10 * (total - c), (sid, cost)
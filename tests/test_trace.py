@@ -0,0 +1,59 @@
+import dataclasses
+from pathlib import Path
+
+import pytest
+
+from gp_assistant.core.config import load_config
+from gp_assistant.observe.trace import Tracer, start_profile
+from gp_assistant.recommend import agent
+
+
+def test_spans_nest_and_accumulate():
+    tr = Tracer()
+    with tr.span("candidates"):
+        for _ in range(3):
+            with tr.span("fetch_bars"):
+                pass
+    with tr.span("champion"):
+        pass
+    st = tr.summary()["stages"]
+    assert st["candidates/fetch_bars"]["count"] == 3
+    assert st["candidates"]["count"] == 1 and st["champion"]["count"] == 1
+    assert st["candidates"]["ms"] >= st["candidates/fetch_bars"]["ms"]
+
+
+def test_symbol_histogram_and_slowest():
+    tr = Tracer()
+    for i, ms in enumerate([0.5, 3.0, 7.0, 20.0, 2000.0]):
+        tr.record_symbol("symbol_facts", f"{i:06d}", ms)
+    s = tr.summary(top_n=2)["symbols"]["symbol_facts"]
+    assert s["count"] == 5 and s["max_ms"] == 2000.0
+    assert sum(s["histogram"].values()) == 5
+    assert s["histogram"]["<1ms"] == 1 and s["histogram"][">=1000ms"] == 1
+    assert [x["symbol"] for x in s["slowest"]] == ["000004", "000003"]
+
+
+def test_profile_off_and_cprofile_dump(tmp_path):
+    assert start_profile("") is None and start_profile("0") is None
+    prof = start_profile("1")
+    sum(range(1000))
+    files = prof.dump(tmp_path / "recommend" / "2024-01-02_profile")
+    assert prof.mode == "cprofile"
+    assert [Path(f).suffix for f in files] == [".prof", ".txt"]
+    assert all(Path(f).stat().st_size > 0 for f in files)
+
+
+def test_failed_run_still_stops_and_dumps_profile(monkeypatch, tmp_path):
+    monkeypatch.setenv("GP_STORE_DIR", str(tmp_path))
+    monkeypatch.setattr(agent, "load_config", lambda: dataclasses.replace(load_config(), profile="cprofile"))
+    started = []
+    monkeypatch.setattr(agent, "start_profile", lambda s: started.append(start_profile(s)) or started[-1])
+
+    def boom(*a, **k):
+        raise RuntimeError("snapshot missing required columns: code/price/amount")
+
+    monkeypatch.setattr(agent, "_run", boom)
+    with pytest.raises(RuntimeError):
+        agent.run(date="2024-01-02")
+    assert not started[0].active
+    assert (tmp_path / "recommend" / "2024-01-02_profile_failed.prof").exists()
@@ -0,0 +1,74 @@
+import dataclasses
+
+import numpy as np
+import pandas as pd
+
+from gp_assistant.core.config import load_config
+from gp_assistant.recommend import candidate_gen
+from gp_assistant.recommend.concept_index import ConceptIndex, build_index, load_index, save_index
+from gp_assistant.recommend.universe_engine import universe_frame
+
+
+def make_snapshot(n, seed):
+    rng = np.random.default_rng(seed)
+    names = np.array([f"股票{i}" for i in range(n)], dtype=object)
+    names[rng.choice(n, 15, replace=False)] = "*ST某某"
+    names[rng.choice(n, 5, replace=False)] = "某某退"
+    amount = rng.integers(1, 400, n).astype(float) * 1e7  # plenty of ties
+    amount[rng.choice(n, 5, replace=False)] = np.nan
+    listed = pd.Timestamp.today().normalize() - pd.to_timedelta(rng.integers(1, 3000, n), unit="D")
+    return pd.DataFrame({
+        "代码": [f"{i:06d}" for i in range(n)],
+        "名称": names,
+        "最新价": rng.uniform(1, 600, n),
+        "成交额": amount,
+        "上市时间": pd.Series(listed).where(rng.random(n) > 0.05),
+        "行业": pd.Series(rng.choice(["银行", "半导体", "医药", "电力"], n)).where(rng.random(n) > 0.1),
+    })
+
+
+def reference(snap, cfg):
+    # pandas pipeline the engine replaced (industry route), stable tie order
+    df = snap.rename(columns={"代码": "code", "名称": "name", "最新价": "price", "成交额": "amount", "上市时间": "list_date"})
+    df = df[~df["name"].astype(str).str.upper().str.contains("ST|退")]
+    df = df[(df["price"] >= cfg.price_min) & (df["price"] <= cfg.price_max)]
+    days = (pd.Timestamp.today().normalize() - pd.to_datetime(df["list_date"])).dt.days
+    df = df[days >= cfg.new_stock_days]
+    df = df.sort_values("amount", ascending=False, kind="stable").head(cfg.dynamic_pool_size)
+    if cfg.restrict_to_mainline:
+        g = df.groupby("行业")["amount"].sum().sort_values(ascending=False, kind="stable").head(max(1, cfg.mainline_top_n))
+        df = df[df["行业"].astype(str).isin(set(g.index))]
+    return [str(c) for c in df["code"]]
+
+
+def with_cfg(monkeypatch, **kw):
+    cfg = dataclasses.replace(load_config(), **kw)
+    monkeypatch.setattr(candidate_gen, "load_config", lambda: cfg)
+    return cfg
+
+
+def test_dynamic_universe_matches_pandas_pipeline(monkeypatch):
+    snap = make_snapshot(600, 1)
+    monkeypatch.setattr(candidate_gen, "get_concept_index", lambda: None)
+    for restrict in (False, True):
+        cfg = with_cfg(monkeypatch, restrict_to_mainline=restrict, dynamic_pool_size=120, mainline_top_n=2)
+        out = candidate_gen._build_dynamic_universe_symbols(snap)
+        assert [e["code"] for e in out] == reference(snap, cfg)
+        assert all(e["industry"] is None or isinstance(e["industry"], str) for e in out)
+    assert universe_frame(snap) is universe_frame(snap)
+
+
+def test_concept_route_uses_local_index(monkeypatch, tmp_path):
+    snap = make_snapshot(300, 2).drop(columns=["行业"])
+    names = pd.DataFrame({"板块名称": ["算力", "电池", "白酒"], "涨跌幅": ["1.5%", "3.2%", "-0.4%"]})
+    members = {"算力": ["000001", "000002"], "电池": ["000003", "000004", "000005"], "白酒": ["000006"]}
+    idx = build_index(lambda: names, lambda b: pd.DataFrame({"代码": members[b]}), today="2024-06-03", fetch_industries=None)
+    assert idx.top_concepts(2) == ["电池", "算力"] and idx.concepts_of("000003") == ["电池"]
+    save_index(idx, tmp_path / "c.json")
+    assert load_index(tmp_path / "c.json") == idx
+    with_cfg(monkeypatch, restrict_to_mainline=True, dynamic_pool_size=300, mainline_top_n=1)
+    monkeypatch.setattr(candidate_gen, "get_concept_index", lambda: idx)
+    out = candidate_gen._build_dynamic_universe_symbols(snap)
+    assert {e["code"] for e in out} <= set(members["电池"])
+    monkeypatch.setattr(candidate_gen, "get_concept_index", lambda: ConceptIndex(built_on="2024-06-03"))
+    assert len(candidate_gen._build_dynamic_universe_symbols(snap)) > 3